@@ -1,3 +1,4 @@
 from .data import FJSData, SpreadsheetData
 from .solution import SolutionFactory
-from .solver import Solver
+from .solver import Solver, SearchImprovement
+from .util import EarlyStopping
@@ -236,7 +236,7 @@ def _make_ts_traces(ts_agent_list):
     tl_sizes_traces = []
 
     for i, ts_agent in enumerate(ts_agent_list):
-        x_axis = list(range(ts_agent.benchmark_iterations))
+        x_axis = ts_agent.benchmark_trace.iterations  # the trace may only hold a sample of the iterations
         makespans_traces.append(
             go.Scatter(x=x_axis, y=ts_agent.seed_solution_makespan_v_iter, name=f'TS trace {i}'))
         nh_sizes_traces.append(
@@ -272,9 +272,9 @@ def _make_ga_traces(ga_agent):
         go.Scatter(x=[ga_agent.min_makespan_coordinates[0]], y=[ga_agent.min_makespan_coordinates[1]],
                    mode='markers',
                    name='best makespan'),
-        go.Scatter(x=list(range(ga_agent.benchmark_iterations)), y=ga_agent.best_solution_makespan_v_iter,
+        go.Scatter(x=ga_agent.benchmark_trace.iterations, y=ga_agent.best_solution_makespan_v_iter,
                    name='Best makespan trace'),
-        go.Scatter(x=list(range(ga_agent.benchmark_iterations)), y=ga_agent.avg_population_makespan_v_iter,
+        go.Scatter(x=ga_agent.benchmark_trace.iterations, y=ga_agent.avg_population_makespan_v_iter,
                    name='Avg population makespan')
     ]
 
@@ -0,0 +1,328 @@
+import glob
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# file in a checkpoint directory that holds the algorithm, stopping condition and parameters of the run
+MANIFEST_FILE = 'checkpoint.json'
+
+# file in a checkpoint directory that holds the initial solutions of the run
+INITIAL_SOLUTIONS_FILE = 'initial_solutions.npz'
+
+# entries of a checkpoint file written by CheckpointWriter that map the nparrays to the segments they are in
+_SEGMENT_NAMES = '_segment_names'
+_SEGMENT_NUMBERS = '_segment_numbers'
+
+
+class CheckpointWriter:
+    """
+    Writes checkpoints of an optimization agent's state to a file.
+
+    The agent takes a snapshot of its state when a checkpoint is due and hands it to write,
+    which returns immediately while a background thread writes the snapshot to the file.
+    The thread runs until there are no snapshots left to write.
+    If the agent hands over a new snapshot before the previous one is written, only the newest one is written.
+
+    Checkpoints are written incrementally:
+    only the nparrays of a snapshot that changed since the previous checkpoint are written, to a new segment file
+    next to the checkpoint file, and the checkpoint file itself is an index of the segments that hold each nparray.
+    The index replaces the previous one atomically and segments that are no longer in it are removed afterwards,
+    so an interrupted write leaves the previous checkpoint intact.
+    Use load_state to load the checkpoint.
+
+    :type path: Path | str
+    :param path: path of the checkpoint file
+
+    :type interval: float
+    :param interval: number of seconds between checkpoints
+    """
+
+    def __init__(self, path, interval):
+        """
+        Initializes an instance of CheckpointWriter.
+
+        See help(CheckpointWriter)
+        """
+        self.path = Path(path)
+        self.interval = interval
+        self._next_checkpoint_time = time.time() + interval
+        self._lock = threading.Lock()
+        self._pending_state = None
+        self._thread = None
+        # nparrays in the checkpoint and the segments they are in, only used by the background thread
+        self._written_state = {}
+        self._segments = {}
+        self._next_segment = max(_get_segment_numbers(self.path), default=-1) + 1
+
+    def is_due(self):
+        """
+        Checks if interval seconds have passed since the last checkpoint.
+
+        :rtype: bool
+        :returns: true if a checkpoint is due
+        """
+        return time.time() >= self._next_checkpoint_time
+
+    def write(self, state):
+        """
+        Writes a snapshot of an agent's state to the checkpoint file in the background.
+
+        :type state: dict
+        :param state: snapshot of the agent's state as a dict of nparrays, which must not be modified afterwards
+
+        :returns: None
+        """
+        self._next_checkpoint_time = time.time() + self.interval
+        with self._lock:
+            self._pending_state = state
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def flush(self):
+        """
+        Waits until the snapshots handed to write are written.
+
+        :returns: None
+        """
+        while True:
+            with self._lock:
+                thread = self._thread
+            if thread is None:
+                return
+            thread.join()
+
+    def _run(self):
+        """
+        Writes the snapshots handed to write until there are none left.
+
+        :returns: None
+        """
+        while True:
+            with self._lock:
+                state, self._pending_state = self._pending_state, None
+                if state is None:
+                    self._thread = None
+                    return
+            self._write_segment(state)
+
+    def _write_segment(self, state):
+        """
+        Writes the nparrays of a snapshot that changed since the previous checkpoint to a new segment,
+        then replaces the index and removes the segments that are no longer in it.
+
+        :type state: dict
+        :param state: snapshot of the agent's state as a dict of nparrays
+
+        :returns: None
+        """
+        changed_state = {name: array for name, array in state.items()
+                         if name not in self._written_state or not _array_equal(self._written_state[name], array)}
+        if len(changed_state) == 0 and state.keys() == self._written_state.keys():
+            return
+
+        if len(changed_state) > 0:
+            save_state(_get_segment_path(self.path, self._next_segment), changed_state)
+            self._segments.update(dict.fromkeys(changed_state, self._next_segment))
+            self._next_segment += 1
+
+        self._written_state = dict(state)
+        self._segments = {name: self._segments[name] for name in state}
+        names = sorted(self._segments)
+        save_state(self.path, {_SEGMENT_NAMES: np.array(names, dtype=str),
+                               _SEGMENT_NUMBERS: np.array([self._segments[name] for name in names], dtype=np.int64)})
+
+        used_segments = set(self._segments.values())
+        for segment in _get_segment_numbers(self.path):
+            if segment not in used_segments:
+                _get_segment_path(self.path, segment).unlink(missing_ok=True)
+
+
+def _array_equal(array_1, array_2):
+    """
+    Checks if two nparrays have the same dtype, shape and values.
+
+    :type array_1: nparray
+    :param array_1: first nparray
+
+    :type array_2: nparray
+    :param array_2: second nparray
+
+    :rtype: bool
+    :returns: true if the nparrays are equal
+    """
+    return array_1.dtype == array_2.dtype and array_1.shape == array_2.shape \
+        and np.array_equal(array_1, array_2, equal_nan=array_1.dtype.kind in 'fc')
+
+
+def _get_segment_path(path, segment):
+    """
+    Gets the path of a segment of a checkpoint file written by CheckpointWriter.
+
+    :type path: Path
+    :param path: path of the checkpoint file
+
+    :type segment: int
+    :param segment: number of the segment
+
+    :rtype: Path
+    :returns: path of the segment
+    """
+    return path.with_name(f'{path.stem}.{segment}{path.suffix}')
+
+
+def _get_segment_numbers(path):
+    """
+    Gets the numbers of the segments of a checkpoint file that exist on disk.
+
+    :type path: Path
+    :param path: path of the checkpoint file
+
+    :rtype: [int]
+    :returns: numbers of the segments
+    """
+    segments = []
+    for segment_path in path.parent.glob(f'{glob.escape(path.stem)}.*{glob.escape(path.suffix)}'):
+        segment = segment_path.name[len(path.stem) + 1:len(segment_path.name) - len(path.suffix)]
+        if segment.isdigit():
+            segments.append(int(segment))
+    return segments
+
+
+def save_state(path, state):
+    """
+    Saves a dict of nparrays to a compressed .npz file, replacing the file atomically.
+
+    :type path: Path | str
+    :param path: path of the file
+
+    :type state: dict
+    :param state: dict of nparrays to save
+
+    :returns: None
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as fout:
+        np.savez_compressed(fout, **state)
+        fout.flush()
+        os.fsync(fout.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_state(path):
+    """
+    Loads a dict of nparrays saved with save_state or a checkpoint written by CheckpointWriter.
+
+    :type path: Path | str
+    :param path: path of the file
+
+    Checkpoint files written by CheckpointWriter are loaded together with their segments.
+
+    :rtype: dict
+    :returns: dict of nparrays
+    """
+    with np.load(path) as npz_file:
+        state = {name: npz_file[name] for name in npz_file.files}
+
+    if _SEGMENT_NAMES in state:
+        path = Path(path)
+        names, segments = state.pop(_SEGMENT_NAMES), state.pop(_SEGMENT_NUMBERS)
+        for segment in np.unique(segments):
+            with np.load(_get_segment_path(path, int(segment))) as npz_file:
+                for name in names[segments == segment]:
+                    state[str(name)] = npz_file[name]
+
+    return state
+
+
+def remove_checkpoint(path):
+    """
+    Removes a checkpoint file written by CheckpointWriter and its segments, if they exist.
+
+    :type path: Path | str
+    :param path: path of the checkpoint file
+
+    :returns: None
+    """
+    path = Path(path)
+    path.unlink(missing_ok=True)
+    for segment in _get_segment_numbers(path):
+        _get_segment_path(path, segment).unlink(missing_ok=True)
+
+
+def write_manifest(checkpoint_dir, manifest):
+    """
+    Writes the manifest of a run to a checkpoint directory, creating the directory if it does not exist.
+
+    :type checkpoint_dir: Path | str
+    :param checkpoint_dir: checkpoint directory
+
+    :type manifest: dict
+    :param manifest: JSON serializable description of the run
+
+    :returns: None
+    """
+    checkpoint_dir = Path(checkpoint_dir)
+    checkpoint_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = checkpoint_dir / (MANIFEST_FILE + '.tmp')
+    with open(tmp_path, 'w') as fout:
+        json.dump(manifest, fout, indent=2)
+    os.replace(tmp_path, checkpoint_dir / MANIFEST_FILE)
+
+
+def read_manifest(checkpoint_dir):
+    """
+    Reads the manifest of a run from a checkpoint directory.
+
+    :type checkpoint_dir: Path | str
+    :param checkpoint_dir: checkpoint directory
+
+    :rtype: dict
+    :returns: description of the run
+
+    :raise: UserWarning if the directory has no manifest
+    """
+    manifest_path = Path(checkpoint_dir) / MANIFEST_FILE
+    if not manifest_path.exists():
+        raise UserWarning(f"{checkpoint_dir} is not a checkpoint directory.")
+
+    with open(manifest_path) as fin:
+        return json.load(fin)
+
+
+def get_random_states():
+    """
+    Gets the states of the random and numpy.random modules of this process as a dict of nparrays.
+
+    :rtype: dict
+    :returns: states of the random number generators
+    """
+    _, random_state, gauss_next = random.getstate()
+    _, np_random_keys, np_random_position, np_random_has_gauss, np_random_gauss = np.random.get_state()
+    return {'random_state': np.array(random_state, dtype=np.uint64),
+            'random_gauss': np.array(np.nan if gauss_next is None else gauss_next),
+            'np_random_keys': np_random_keys,
+            'np_random_position': np.array([np_random_position, np_random_has_gauss]),
+            'np_random_gauss': np.array(np_random_gauss)}
+
+
+def set_random_states(state):
+    """
+    Sets the states of the random and numpy.random modules of this process from a checkpoint.
+
+    :type state: dict
+    :param state: dict of nparrays that contains the states returned by get_random_states
+
+    :returns: None
+    """
+    gauss_next = float(state['random_gauss'])
+    random.setstate((3, tuple(int(x) for x in state['random_state']), None if np.isnan(gauss_next) else gauss_next))
+    np_random_position, np_random_has_gauss = state['np_random_position']
+    np.random.set_state(('MT19937', state['np_random_keys'], int(np_random_position), int(np_random_has_gauss),
+                         float(state['np_random_gauss'])))
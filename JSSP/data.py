@@ -1,5 +1,10 @@
+import hashlib
+import io
+import pickle
 import re
+import weakref
 from abc import ABC
+from multiprocessing import shared_memory
 from pathlib import Path
 
 import numpy as np
@@ -107,6 +112,141 @@ class Job:
                and self._tasks == other.get_tasks()
 
 
+# matrices of Data that can be moved into shared memory
+_SHAREABLE_MATRICES = ('sequence_dependency_matrix', 'job_task_index_matrix', 'usable_machines_matrix',
+                       'task_processing_times_matrix')
+
+# released shared memory blocks that are still used by arrays of this process
+_open_shared_memory_blocks = []
+
+# Data instances of this process, which objects pickled with dumps_without_data are bound to (see find_data)
+_data_instances = weakref.WeakSet()
+
+
+def find_data(fingerprint):
+    """
+    Finds a Data instance of this process by its fingerprint.
+
+    :type fingerprint: str
+    :param fingerprint: fingerprint of the instance data (see Data.get_fingerprint)
+
+    :rtype: Data
+    :returns: Data instance with the fingerprint, or None if there is none
+    """
+    for data in list(_data_instances):
+        if data.get_fingerprint() == fingerprint:
+            return data
+    return None
+
+
+class _DataReferencePickler(pickle.Pickler):
+    """
+    Pickler that pickles Data instances as their fingerprints.
+    """
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Data):
+            return obj.get_fingerprint()
+        return None
+
+
+class _DataReferenceUnpickler(pickle.Unpickler):
+    """
+    Unpickler that replaces the fingerprints pickled by _DataReferencePickler with the Data instances of this process.
+    """
+
+    def persistent_load(self, fingerprint):
+        data = find_data(fingerprint)
+        if data is None:
+            raise UserWarning(f"No instance data with fingerprint {fingerprint} is loaded in this process. "
+                              f"Load the data before unpickling its solutions.")
+        return data
+
+
+def dumps_without_data(obj):
+    """
+    Pickles an object without the instance data it refers to, which is pickled as its fingerprint instead.
+
+    This is meant for sending results (e.g. a TabuSearchAgent and its solutions) back to a process
+    that already has the instance data, see loads_without_data.
+
+    :type obj: object
+    :param obj: object to pickle
+
+    :rtype: bytes
+    :returns: pickled object
+    """
+    buffer = io.BytesIO()
+    _DataReferencePickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    return buffer.getvalue()
+
+
+def loads_without_data(pickled_obj):
+    """
+    Unpickles an object pickled with dumps_without_data, and binds it to the Data instances of this process
+    with the same fingerprints as the instance data it referred to.
+
+    :type pickled_obj: bytes
+    :param pickled_obj: object pickled with dumps_without_data
+
+    :rtype: object
+    :returns: unpickled object
+
+    :raise: UserWarning if the instance data is not loaded in this process
+    """
+    return _DataReferenceUnpickler(io.BytesIO(pickled_obj)).load()
+
+
+class _SharedDataReference:
+    """
+    Reference to a Data whose matrices are in shared memory (see Data.get_shared_reference).
+
+    It is pickled with the names of the shared memory blocks instead of the matrices,
+    and unpickled to a copy of the Data that is attached to the blocks.
+
+    :type data: Data
+    :param data: JSSP instance data in shared memory
+    """
+
+    def __init__(self, data):
+        self.data = data
+
+    def __reduce__(self):
+        state = self.data.__getstate__()
+        shared_matrices = {}
+        for name, block in self.data._shared_memory.items():
+            matrix = getattr(self.data, name)
+            shared_matrices[name] = (block.name, matrix.shape, matrix.dtype.str)
+            state[name] = None
+        return _attach_shared_data, (type(self.data), state, shared_matrices)
+
+
+def _attach_shared_data(data_class, state, shared_matrices):
+    """
+    Unpickles a Data pickled by _SharedDataReference, whose matrices are attached to the shared memory blocks.
+
+    :type data_class: type
+    :param data_class: subclass of Data
+
+    :type state: dict
+    :param state: pickled state of the Data without the shared matrices
+
+    :type shared_matrices: dict
+    :param shared_matrices: name, shape and dtype of the shared memory block of each shared matrix
+
+    :rtype: Data
+    :returns: Data attached to the shared memory
+    """
+    data = data_class.__new__(data_class)
+    data.__setstate__(state)
+    data._shared_memory = {}
+    for name, (block_name, shape, dtype) in shared_matrices.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        setattr(data, name, np.ndarray(shape, dtype=dtype, buffer=block.buf))
+        data._shared_memory[name] = block
+    return data
+
+
 class Data(ABC):
     """
     Base class for JSSP instance data.
@@ -137,6 +277,131 @@ class Data(ABC):
         self.total_number_of_machines = 0
         self.max_tasks_for_a_job = 0
 
+        # shared memory blocks of the matrices (see share_memory)
+        self._shared_memory = None
+        self._owns_shared_memory = False
+        self._shared_reference = None
+
+        # computed on the first call of get_fingerprint
+        self._fingerprint = None
+        _data_instances.add(self)
+
+    def __getstate__(self):
+        # pickled copies always hold their own matrices, only child processes attach to the shared memory
+        # (see get_shared_reference)
+        state = self.__dict__.copy()
+        state['_shared_memory'] = None
+        state['_owns_shared_memory'] = False
+        state['_shared_reference'] = None
+        return state
+
+    def __setstate__(self, state):
+        # Data pickled before the shared memory and fingerprints were added have none of their attributes
+        self._shared_memory = None
+        self._owns_shared_memory = False
+        self._shared_reference = None
+        self._fingerprint = None
+        self.__dict__.update(state)
+        _data_instances.add(self)
+
+    def get_fingerprint(self):
+        """
+        Gets the fingerprint of this Data, a hash of its matrices and the sequences of its tasks.
+
+        Objects pickled with dumps_without_data refer to their instance data by its fingerprint,
+        and are bound to the Data with the same fingerprint in the process that unpickles them.
+
+        :rtype: str
+        :returns: hex digest of the instance data
+        """
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for name in _SHAREABLE_MATRICES:
+                matrix = np.ascontiguousarray(getattr(self, name))
+                digest.update(f"{name}{matrix.shape}{matrix.dtype.str}".encode())
+                digest.update(matrix.tobytes())
+            digest.update(str([(task.get_job_id(), task.get_task_id(), task.get_sequence())
+                               for job in self.jobs for task in job.get_tasks()]).encode())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def share_memory(self):
+        """
+        Moves the matrices of this Data into shared memory,
+        so that child processes it is sent to with get_shared_reference attach to the same memory
+        instead of copying the matrices.
+
+        The shared memory has to be released with release_shared_memory by the process that called this function.
+
+        :returns: None
+        """
+        if self._shared_memory is not None:
+            return
+
+        self._shared_memory = {}
+        self._owns_shared_memory = True
+        for name in _SHAREABLE_MATRICES:
+            matrix = getattr(self, name)
+            block = shared_memory.SharedMemory(create=True, size=max(1, matrix.nbytes))
+            shared_matrix = np.ndarray(matrix.shape, dtype=matrix.dtype, buffer=block.buf)
+            shared_matrix[...] = matrix
+            setattr(self, name, shared_matrix)
+            self._shared_memory[name] = block
+
+    def release_shared_memory(self):
+        """
+        Copies the matrices of this Data back into the memory of this process and releases the shared memory.
+
+        The shared memory blocks are removed if this Data created them with share_memory.
+
+        :returns: None
+        """
+        if self._shared_memory is None:
+            return
+
+        for name, block in self._shared_memory.items():
+            setattr(self, name, np.array(getattr(self, name)))
+            if self._owns_shared_memory:
+                block.unlink()
+            try:
+                block.close()
+            except BufferError:
+                # views of the block are still used (e.g. by makespan workspaces), it is closed when the process exits
+                _open_shared_memory_blocks.append(block)
+
+        self._shared_memory = None
+        self._owns_shared_memory = False
+        self._shared_reference = None
+
+    def get_shared_reference(self):
+        """
+        Gets the object to send this Data to child processes with while its matrices are in shared memory.
+
+        The reference is pickled with the names of the shared memory blocks instead of the matrices,
+        and unpickled to a copy of this Data that is attached to the blocks,
+        so it can only be unpickled until the shared memory is released.
+        Ordinary pickles of this Data hold the matrices, and can be unpickled at any time.
+
+        :rtype: object
+        :returns: reference that is unpickled to a Data, or this Data if its matrices are not in shared memory
+        """
+        if self._shared_memory is None:
+            return self
+
+        # the same reference is returned until the memory is released, so it is pickled once per message
+        if self._shared_reference is None:
+            self._shared_reference = _SharedDataReference(self)
+        return self._shared_reference
+
+    def is_shared(self):
+        """
+        Checks if the matrices of this Data are in shared memory.
+
+        :rtype: bool
+        :returns: true if the matrices are in shared memory
+        """
+        return self._shared_memory is not None
+
     def get_setup_time(self, job1_id, job1_task_id, job2_id, job2_task_id):
         """
         Gets the setup time for scheduling (job2_id, job2_task_id) after (job1_id, job1_task_id).
@@ -182,6 +447,31 @@ class Data(ABC):
         """
         return self.task_processing_times_matrix[self.job_task_index_matrix[job_id, task_id], machine]
 
+    def get_makespan_lower_bound(self):
+        """
+        Gets a lower bound of the makespan of every feasible solution.
+
+        The bound is the greater of the longest job, where every task runs on its fastest machine
+        and the tasks with the same sequence number run at the same time,
+        and the total runtime of the tasks on their fastest machines divided evenly among the machines.
+        Setup and wait times are not included since they can only increase the makespan.
+
+        :rtype: float
+        :returns: makespan lower bound
+        """
+        min_runtimes = np.min(np.where(self.task_processing_times_matrix >= 0, self.task_processing_times_matrix, np.inf),
+                              axis=1)
+
+        max_job_runtime = 0
+        for job in self.jobs:
+            sequence_runtimes = {}
+            for task in job.get_tasks():
+                runtime = min_runtimes[self.job_task_index_matrix[job.get_job_id(), task.get_task_id()]]
+                sequence_runtimes[task.get_sequence()] = max(runtime, sequence_runtimes.get(task.get_sequence(), 0))
+            max_job_runtime = max(max_job_runtime, sum(sequence_runtimes.values()))
+
+        return float(max(max_job_runtime, np.sum(min_runtimes) / self.total_number_of_machines))
+
     def get_job(self, job_id):
         """
         Gets the Job with job id = job_id.
@@ -1,11 +1,15 @@
 import random
-import statistics
+import time
 from enum import Enum
+from operator import attrgetter
+
+import numpy as np
 
 from ._ga_helpers import crossover
+from ..checkpoint import CheckpointWriter, get_random_states, set_random_states
 from ..exception import InfeasibleSolutionException
 from ..solution import Solution, SolutionFactory
-from ..util import get_stop_condition
+from ..util import get_stop_condition, TraceRecorder
 
 """
 GA selection functions
@@ -115,11 +119,27 @@ class GeneticAlgorithmAgent:
 
     :type benchmark: bool
     :param benchmark: if true benchmark data is gathered
+
+    :type benchmark_stride: int
+    :param benchmark_stride: number of generations between the samples of the benchmark trace (see JSSP.util.TraceRecorder)
+
+    :type benchmark_max_samples: int
+    :param benchmark_max_samples: maximum number of samples the benchmark trace keeps, longer runs are downsampled
+
+    :type checkpoint_file: Path | str
+    :param checkpoint_file: if not None, the agent's state is written to this file every checkpoint_interval seconds and when the GA is done
+
+    :type checkpoint_interval: float
+    :param checkpoint_interval: number of seconds between checkpoints
+
+    :type resume_state: dict
+    :param resume_state: if not None, the GA continues from this state loaded from a checkpoint file (see JSSP.checkpoint.load_state) instead of starting from population
     """
 
     def __init__(self, stopping_condition, population, time_condition=False,
                  selection_method_enum=GASelectionEnum.TOURNAMENT, mutation_probability=0.8,
-                 selection_size=2, benchmark=False):
+                 selection_size=2, benchmark=False, checkpoint_file=None, checkpoint_interval=60, resume_state=None,
+                 benchmark_stride=1, benchmark_max_samples=10000):
         """
         Initializes an instance of GeneticAlgorithmAgent.
 
@@ -142,27 +162,87 @@ class GeneticAlgorithmAgent:
         self.mutation_probability = mutation_probability
         self.selection_size = selection_size
         self.benchmark = benchmark
+        self.benchmark_stride = benchmark_stride
+        self.benchmark_max_samples = benchmark_max_samples
+        self.checkpoint_file = checkpoint_file
+        self.checkpoint_interval = checkpoint_interval
+        self.resume_state = resume_state
 
         # results
         self.result_population = []
         self.best_solution = None
+        self.search_state = None  # state of the GA when it is done, which another agent can resume from
 
         if benchmark:
             self.benchmark_iterations = 0
-            self.best_solution_makespan_v_iter = []
-            self.avg_population_makespan_v_iter = []
+            self.benchmark_trace = self._get_trace_recorder()
             self.min_makespan_coordinates = []
 
-    def start(self):
+    def _get_trace_recorder(self):
+        """
+        Gets an empty benchmark trace of this GeneticAlgorithmAgent.
+
+        :rtype: TraceRecorder
+        :returns: trace of the best solution makespan and average population makespan of the generations
+        """
+        return TraceRecorder(('best_solution_makespan', 'avg_population_makespan'), self.benchmark_stride,
+                             self.benchmark_max_samples)
+
+    @property
+    def best_solution_makespan_v_iter(self):
+        """
+        :rtype: nparray
+        :returns: best solution makespans at the end of the generations in benchmark_trace
+        """
+        return self.benchmark_trace.get('best_solution_makespan')
+
+    @property
+    def avg_population_makespan_v_iter(self):
+        """
+        :rtype: nparray
+        :returns: average makespans of the populations at the start of the generations in benchmark_trace
+        """
+        return self.benchmark_trace.get('avg_population_makespan')
+
+    def start(self, early_stopping=None):
         """
         Starts the genetic algorithm for this GeneticAlgorithmAgent.
 
+        :type early_stopping: EarlyStopping
+        :param early_stopping: criteria for stopping the genetic algorithm early, or None
+
         :rtype: Solution
         :returns: best Solution found
         """
+        for _ in self.iter_start(early_stopping):
+            pass
+
+        return self.best_solution
+
+    def iter_start(self, early_stopping=None):
+        """
+        Starts the genetic algorithm for this GeneticAlgorithmAgent and generates the best solutions as they are found.
+
+        The best solution of the initial population is generated first.
+        If the generator is closed before the stopping condition is met, only best_solution is set.
+
+        If checkpoint_file is not None, a snapshot of the population is taken at the end of a generation
+        every checkpoint_interval seconds and written to the file by a background thread.
+
+        :type early_stopping: EarlyStopping
+        :param early_stopping: criteria for stopping the genetic algorithm early, or None
+
+        :rtype: generator
+        :returns: generator of (generation, Solution) tuples, one for each new best Solution
+        """
         population = self.initial_population[:]
-        best_solution = min(population)
+        best_solution = min(population, key=attrgetter('comparison_key'))
         iterations = 0
+        elapsed_time = 0
+        if self.resume_state is not None:
+            population, best_solution, iterations, elapsed_time = self._restore_checkpoint_state(self.resume_state)
+            self.resume_state = None
+        self.best_solution = best_solution
 
         # get static data
         data = self.initial_population[0].data
@@ -172,19 +252,32 @@ class GeneticAlgorithmAgent:
         factory = SolutionFactory(data)
 
         # variables used for benchmarks
-        best_solution_makespan_v_iter = []
-        avg_population_makespan_v_iter = []
-        best_solution_iteration = 0
+        trace = self._get_trace_recorder() if self.benchmark else None
+        best_solution_iteration = iterations
+
+        # create stopping condition function, a resumed GA only runs for the rest of its runtime
+        start_time = time.time() - elapsed_time
+        stop_condition = get_stop_condition(self.time_condition,
+                                            self.runtime - elapsed_time if self.time_condition else None,
+                                            self.iterations, early_stopping)
+        if early_stopping is not None:
+            early_stopping.update(best_solution.makespan)
+
+        checkpoint_writer = None
+        if self.checkpoint_file is not None:
+            checkpoint_writer = CheckpointWriter(self.checkpoint_file, self.checkpoint_interval)
 
-        # create stopping condition function
-        stop_condition = get_stop_condition(self.time_condition, self.runtime, self.iterations)
+        yield iterations, best_solution
 
         not_done = True
+        next_population = population
         while not stop_condition(iterations):
-            if self.benchmark:
-                avg_population_makespan_v_iter.append(statistics.mean([sol.makespan for sol in population]))
+            sampled = self.benchmark and trace.is_sampled(iterations)
+            if sampled:
+                avg_population_makespan = np.mean([sol.makespan for sol in population])
 
             next_population = []
+            next_population_set = set()  # for hash lookups of the solutions in next_population
             while len(population) > self.selection_size and not_done:
 
                 parent1 = self.selection_method(population, self.selection_size)
@@ -223,45 +316,102 @@ class GeneticAlgorithmAgent:
 
                 # add best 2 individuals to next generation if they are not already in the next generation (elitist strategy)
                 if not_done:
-                    sorted_individuals = sorted([parent1, parent2, child1, child2])
+                    sorted_individuals = sorted([parent1, parent2, child1, child2], key=attrgetter('comparison_key'))
                     added = 0
                     index = 0
                     while added < 2 and index < len(sorted_individuals):
-                        if sorted_individuals[index] not in next_population:
+                        if sorted_individuals[index] not in next_population_set:
                             next_population.append(sorted_individuals[index])
+                            next_population_set.add(sorted_individuals[index])
                             added += 1
                         index += 1
 
                     # if parent1, parent2, child1, and child2 are all in next_population, add random solutions
                     while added < 2:
-                        next_population.append(factory.get_solution())
+                        random_solution = factory.get_solution()
+                        next_population.append(random_solution)
+                        next_population_set.add(random_solution)
                         added += 1
                 else:
                     next_population.append(parent1)
                     next_population.append(parent2)
+                    next_population_set.update((parent1, parent2))
 
                 # check for better solution than best_solution
                 if min(child1, child2) < best_solution:
                     best_solution = min(child1, child2)
+                    self.best_solution = best_solution
                     if self.benchmark:
                         best_solution_iteration = iterations
+                    if early_stopping is not None:
+                        early_stopping.update(best_solution.makespan)
+                        not_done = not early_stopping.is_stopped()  # finish the generation early
+                    yield iterations, best_solution
 
-            if self.benchmark:
-                best_solution_makespan_v_iter.append(best_solution.makespan)
-                iterations += 1
-            elif not self.time_condition:
-                iterations += 1
+            if sampled:
+                trace.record(iterations, best_solution.makespan, avg_population_makespan)
+            iterations += 1
 
             next_population += population
             population = next_population
 
+            if checkpoint_writer is not None and checkpoint_writer.is_due():
+                checkpoint_writer.write(self._get_checkpoint_state(iterations, time.time() - start_time, population,
+                                                                   best_solution))
+
+        self.search_state = self._get_checkpoint_state(iterations, time.time() - start_time, population, best_solution)
+        if checkpoint_writer is not None:
+            checkpoint_writer.write(self.search_state)
+            checkpoint_writer.flush()
+
         self.best_solution = best_solution
         self.result_population = next_population
 
         if self.benchmark:
             self.benchmark_iterations = iterations
-            self.best_solution_makespan_v_iter = best_solution_makespan_v_iter
-            self.avg_population_makespan_v_iter = avg_population_makespan_v_iter
+            self.benchmark_trace = trace
             self.min_makespan_coordinates = (best_solution_iteration, best_solution.makespan)
 
-        return self.best_solution
+    def _get_checkpoint_state(self, iterations, elapsed_time, population, best_solution):
+        """
+        Takes a snapshot of the state of the genetic algorithm between two generations for a checkpoint.
+
+        The solutions are stored as their operation_2d_arrays, and the random number generators' states are included.
+
+        :type iterations: int
+        :param iterations: number of generations done
+
+        :type elapsed_time: float
+        :param elapsed_time: number of seconds the GA has run for
+
+        :type population: [Solution]
+        :param population: population of the next generation
+
+        :type best_solution: Solution
+        :param best_solution: best solution found
+
+        :rtype: dict
+        :returns: state of the GA as a dict of nparrays
+        """
+        state = {'iterations': np.array(iterations),
+                 'elapsed_time': np.array(elapsed_time),
+                 'population': np.stack([solution.operation_2d_array for solution in population]),
+                 'best_solution': best_solution.operation_2d_array}
+        state.update(get_random_states())
+        return state
+
+    def _restore_checkpoint_state(self, state):
+        """
+        Restores the state of the genetic algorithm from a checkpoint taken with _get_checkpoint_state.
+
+        :type state: dict
+        :param state: state of the GA as a dict of nparrays
+
+        :rtype: tuple
+        :returns: (population, best solution, iterations, elapsed time)
+        """
+        data = self.initial_population[0].data
+        population = [Solution(data, operation_2d_array) for operation_2d_array in state['population']]
+        set_random_states(state)
+        return population, Solution(data, state['best_solution']), int(state['iterations']), \
+            float(state['elapsed_time'])
@@ -2,7 +2,188 @@ from ..exception import InfeasibleSolutionException
 cimport cython
 import numpy as np
 cimport numpy as np
+from cython.parallel cimport parallel, prange
+from libc.math cimport ceil, floor, sqrt, INFINITY
+from libc.stdint cimport uint64_t
 from libc.stdlib cimport abort, malloc, free
+from libc.string cimport memcpy
+
+# return codes of _replay_operations
+cdef enum:
+    _FEASIBLE = 0
+    _INFEASIBLE = -1
+    _DOMINATED = 1
+
+# makespans returned by MakespanWorkspace.compute_makespan for infeasible operation 2d arrays
+# and for operation 2d arrays with a makespan greater than the cutoff
+cdef double _INFEASIBLE_MAKESPAN = -1.0
+cdef double _DOMINATED_MAKESPAN = INFINITY
+INFEASIBLE_MAKESPAN = _INFEASIBLE_MAKESPAN
+DOMINATED_MAKESPAN = _DOMINATED_MAKESPAN
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+cdef inline void _reset_memory(Py_ssize_t num_machines, Py_ssize_t num_jobs,
+                               double * machine_makespan_memory, int * machine_jobs_memory,
+                               int * machine_tasks_memory, int * job_seq_memory,
+                               double * prev_job_end_memory, double * job_end_memory) nogil:
+    """
+    Resets the memory modules used by _replay_operations to the state before any operation is processed.
+    """
+    cdef Py_ssize_t i
+    for i in range(num_machines):
+        machine_makespan_memory[i] = 0.0
+        machine_jobs_memory[i] = -1
+        machine_tasks_memory[i] = -1
+
+    for i in range(num_jobs):
+        job_seq_memory[i] = 0
+        job_end_memory[i] = 0.0
+        prev_job_end_memory[i] = 0.0
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+@cython.cdivision(True)
+cdef inline int _process_operation(int job_id, int task_id, int sequence, int machine,
+                                   double * machine_makespan_memory, int * machine_jobs_memory,
+                                   int * machine_tasks_memory, int * job_seq_memory,
+                                   double * prev_job_end_memory, double * job_end_memory,
+                                   const double[:, ::1] task_processing_times_matrix,
+                                   const int[:, ::1] sequence_dependency_matrix,
+                                   const int[:, ::1] job_task_index_matrix,
+                                   double cutoff) nogil:
+    """
+    Processes one operation and updates the memory modules.
+
+    :returns: _FEASIBLE, _INFEASIBLE if the operation is infeasible,
+    or _DOMINATED if the machine's makespan exceeded cutoff
+    """
+    cdef int setup, cur_task_index, prev_task_index
+    cdef double wait, runtime, added_time
+
+    cur_task_index = job_task_index_matrix[job_id, task_id]
+
+    if machine_jobs_memory[machine] != -1:
+        prev_task_index = job_task_index_matrix[machine_jobs_memory[machine], machine_tasks_memory[machine]]
+        setup = sequence_dependency_matrix[cur_task_index, prev_task_index]
+    else:
+        setup = 0
+
+    if setup < 0 or sequence < job_seq_memory[job_id]:
+        return _INFEASIBLE
+
+    if job_seq_memory[job_id] < sequence:
+        prev_job_end_memory[job_id] = job_end_memory[job_id]
+
+    if prev_job_end_memory[job_id] <= machine_makespan_memory[machine]:
+        wait = 0
+    else:
+        wait = prev_job_end_memory[job_id] - machine_makespan_memory[machine]
+
+    runtime = task_processing_times_matrix[cur_task_index, machine]
+
+    # compute total added time and update memory modules
+    added_time = runtime + wait + setup
+    machine_makespan_memory[machine] += added_time
+    job_end_memory[job_id] = max(machine_makespan_memory[machine], job_end_memory[job_id])
+    job_seq_memory[job_id] = sequence
+    machine_jobs_memory[machine] = job_id
+    machine_tasks_memory[machine] = task_id
+
+    if machine_makespan_memory[machine] > cutoff:
+        return _DOMINATED
+
+    return _FEASIBLE
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+@cython.cdivision(True)
+cdef inline int _replay_operations(const int[:, ::1] operation_2d_array, Py_ssize_t start_row, Py_ssize_t end_row,
+                                   double * machine_makespan_memory, int * machine_jobs_memory,
+                                   int * machine_tasks_memory, int * job_seq_memory,
+                                   double * prev_job_end_memory, double * job_end_memory,
+                                   const double[:, ::1] task_processing_times_matrix,
+                                   const int[:, ::1] sequence_dependency_matrix,
+                                   const int[:, ::1] job_task_index_matrix,
+                                   double cutoff) nogil:
+    """
+    Processes the operations in rows [start_row, end_row) of operation_2d_array and updates the memory modules.
+
+    Machine makespans never decrease, so processing stops as soon as a machine's makespan exceeds cutoff.
+
+    :returns: _FEASIBLE, _INFEASIBLE if the operations are infeasible,
+    or _DOMINATED if a machine makespan exceeded cutoff
+    """
+    cdef Py_ssize_t row
+    cdef int status
+
+    for row in range(start_row, end_row):
+        status = _process_operation(operation_2d_array[row, 0], operation_2d_array[row, 1],
+                                    operation_2d_array[row, 2], operation_2d_array[row, 3],
+                                    machine_makespan_memory, machine_jobs_memory, machine_tasks_memory,
+                                    job_seq_memory, prev_job_end_memory, job_end_memory,
+                                    task_processing_times_matrix, sequence_dependency_matrix,
+                                    job_task_index_matrix, cutoff)
+        if status != _FEASIBLE:
+            return status
+
+    return _FEASIBLE
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+@cython.cdivision(True)
+cdef inline int _replay_move(const int[:, ::1] operation_2d_array, Py_ssize_t from_index, Py_ssize_t to_index,
+                             int machine, Py_ssize_t start_row,
+                             double * machine_makespan_memory, int * machine_jobs_memory,
+                             int * machine_tasks_memory, int * job_seq_memory,
+                             double * prev_job_end_memory, double * job_end_memory,
+                             const double[:, ::1] task_processing_times_matrix,
+                             const int[:, ::1] sequence_dependency_matrix,
+                             const int[:, ::1] job_task_index_matrix,
+                             double cutoff) nogil:
+    """
+    Processes the operations from start_row on of the operation 2d array that results from moving
+    the operation at from_index of operation_2d_array to to_index on the given machine,
+    without building that operation 2d array, and updates the memory modules.
+
+    :returns: _FEASIBLE, _INFEASIBLE if the operations are infeasible,
+    or _DOMINATED if a machine makespan exceeded cutoff
+    """
+    cdef Py_ssize_t row, source_row
+    cdef int status
+
+    for row in range(start_row, operation_2d_array.shape[0]):
+        if row == to_index:
+            status = _process_operation(operation_2d_array[from_index, 0], operation_2d_array[from_index, 1],
+                                        operation_2d_array[from_index, 2], machine,
+                                        machine_makespan_memory, machine_jobs_memory, machine_tasks_memory,
+                                        job_seq_memory, prev_job_end_memory, job_end_memory,
+                                        task_processing_times_matrix, sequence_dependency_matrix,
+                                        job_task_index_matrix, cutoff)
+        else:
+            # index of the row in operation_2d_array without the moved operation, then in operation_2d_array
+            source_row = row if row < to_index else row - 1
+            if source_row >= from_index:
+                source_row += 1
+
+            status = _process_operation(operation_2d_array[source_row, 0], operation_2d_array[source_row, 1],
+                                        operation_2d_array[source_row, 2], operation_2d_array[source_row, 3],
+                                        machine_makespan_memory, machine_jobs_memory, machine_tasks_memory,
+                                        job_seq_memory, prev_job_end_memory, job_end_memory,
+                                        task_processing_times_matrix, sequence_dependency_matrix,
+                                        job_task_index_matrix, cutoff)
+        if status != _FEASIBLE:
+            return status
+
+    return _FEASIBLE
 
 
 @cython.boundscheck(False)
@@ -19,21 +200,21 @@ cpdef double[::1] compute_machine_makespans(int[:, ::1] operation_2d_array,
 
     :type operation_2d_array: nparray
     :param operation_2d_array: nparray of operations to compute the machine makespans for
-    
+
     :type task_processing_times_matrix: nparray
     :param task_processing_times_matrix: task processing times matrix from static Data
-    
+
     :type sequence_dependency_matrix: nparray
     :param sequence_dependency_matrix: sequence dependency matrix from static Data
-    
+
     :type job_task_index_matrix: nparray
     :param job_task_index_matrix: job task index matrix from static Data
-    
+
     :rtype: nparray
     :returns: memory view of a 1d nparray of machine make span times, where makespan[i] = makespan of machine i
     :raise: InfeasibleSolutionException if the solution is infeasible
     """
-    cdef int num_jobs = sequence_dependency_matrix.shape[0]
+    cdef int num_jobs = job_task_index_matrix.shape[0]
     cdef int num_machines = task_processing_times_matrix.shape[1]
 
     # memory for keeping track of all machine's make span time
@@ -48,46 +229,240 @@ cpdef double[::1] compute_machine_makespans(int[:, ::1] operation_2d_array,
     # memory for keeping track of all job's latest task's sequence that was processed
     cdef int * job_seq_memory = <int *> malloc(sizeof(int) * num_jobs)
 
-    # memory for keeping track of all job's latest end time that was processed
+    # memory for keeping track of all job's previous sequence end time that was processed
     cdef double * prev_job_end_memory = <double *> malloc(sizeof(double) * num_jobs)
 
     # memory for keeping track of all job's latest end time that was processed
     cdef double * job_end_memory = <double *> malloc(sizeof(double) * num_jobs)
 
-    if machine_jobs_memory == NULL or machine_tasks_memory == NULL or job_seq_memory == NULL or job_end_memory == NULL:
+    if machine_jobs_memory == NULL or machine_tasks_memory == NULL or job_seq_memory == NULL \
+            or prev_job_end_memory == NULL or job_end_memory == NULL:
         abort()
 
-    cdef Py_ssize_t row, i
-    cdef int job_id, task_id, sequence, machine, setup, cur_task_index, prev_task_index
-    cdef double wait
+    _reset_memory(num_machines, num_jobs, &machine_makespan_memory[0], machine_jobs_memory, machine_tasks_memory,
+                  job_seq_memory, prev_job_end_memory, job_end_memory)
 
-    for i in range(num_machines):
-        machine_jobs_memory[i] = -1
-        machine_tasks_memory[i] = -1
+    cdef int status = _replay_operations(operation_2d_array, 0, operation_2d_array.shape[0],
+                                         &machine_makespan_memory[0], machine_jobs_memory, machine_tasks_memory,
+                                         job_seq_memory, prev_job_end_memory, job_end_memory,
+                                         task_processing_times_matrix, sequence_dependency_matrix,
+                                         job_task_index_matrix, INFINITY)
 
-    i = 0
-    for i in range(num_jobs):
-        job_seq_memory[i] = 0
-        job_end_memory[i] = 0.0
-        prev_job_end_memory[i] = 0.0
+    # free the memory modules
+    free(machine_jobs_memory)
+    free(machine_tasks_memory)
+    free(job_seq_memory)
+    free(job_end_memory)
+    free(prev_job_end_memory)
+
+    if status != _FEASIBLE:
+        raise InfeasibleSolutionException()
+
+    return machine_makespan_memory
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+@cython.cdivision(True)
+cpdef tuple compute_machine_makespans_batch(const int[:, :, ::1] operation_3d_array,
+                                            const double[:, ::1] task_processing_times_matrix,
+                                            const int[:, ::1] sequence_dependency_matrix,
+                                            const int[:, ::1] job_task_index_matrix,
+                                            int num_threads=1, double cutoff=INFINITY):
+    """
+    Computes the machine makespans of a stack of candidate operation 2d arrays without holding the GIL.
+
+    If the extension was compiled with OpenMP the candidates are divided among num_threads threads,
+    otherwise they are computed serially.
+    The computation of a candidate stops as soon as one of its machine makespans exceeds cutoff.
+
+    :type operation_3d_array: nparray
+    :param operation_3d_array: 3d nparray of shape (n_candidates, n_tasks, 4) of candidate operation 2d arrays
+
+    :type task_processing_times_matrix: nparray
+    :param task_processing_times_matrix: task processing times matrix from static Data
+
+    :type sequence_dependency_matrix: nparray
+    :param sequence_dependency_matrix: sequence dependency matrix from static Data
+
+    :type job_task_index_matrix: nparray
+    :param job_task_index_matrix: job task index matrix from static Data
+
+    :type num_threads: int
+    :param num_threads: number of threads to compute the candidates with
+
+    :type cutoff: float
+    :param cutoff: candidates with a makespan greater than cutoff are dominated
+
+    :rtype: (nparray, nparray)
+    :returns: 2d nparray of shape (n_candidates, n_machines) of machine makespans
+    and a 1d boolean nparray that is true for the feasible candidates that are not dominated.
+    The machine makespans of the other candidates are not meaningful.
+    """
+    cdef Py_ssize_t num_candidates = operation_3d_array.shape[0]
+    cdef Py_ssize_t num_operations = operation_3d_array.shape[1]
+    cdef Py_ssize_t num_jobs = job_task_index_matrix.shape[0]
+    cdef Py_ssize_t num_machines = task_processing_times_matrix.shape[1]
+
+    machine_makespans = np.zeros((num_candidates, num_machines), dtype=np.float64)
+    feasible = np.zeros(num_candidates, dtype=np.uint8)
+    cdef double[:, ::1] machine_makespans_view = machine_makespans
+    cdef unsigned char[::1] feasible_view = feasible
+
+    cdef int * machine_jobs_memory
+    cdef int * machine_tasks_memory
+    cdef int * job_seq_memory
+    cdef double * prev_job_end_memory
+    cdef double * job_end_memory
+    cdef Py_ssize_t c
+
+    if num_candidates == 0:
+        return machine_makespans, feasible.view(np.bool_)
+
+    num_threads = max(1, num_threads)
+    with nogil, parallel(num_threads=num_threads):
+        # per thread scratch memory
+        machine_jobs_memory = <int *> malloc(sizeof(int) * num_machines)
+        machine_tasks_memory = <int *> malloc(sizeof(int) * num_machines)
+        job_seq_memory = <int *> malloc(sizeof(int) * num_jobs)
+        prev_job_end_memory = <double *> malloc(sizeof(double) * num_jobs)
+        job_end_memory = <double *> malloc(sizeof(double) * num_jobs)
+
+        if machine_jobs_memory == NULL or machine_tasks_memory == NULL or job_seq_memory == NULL \
+                or prev_job_end_memory == NULL or job_end_memory == NULL:
+            abort()
+
+        for c in prange(num_candidates, schedule='dynamic'):
+            _reset_memory(num_machines, num_jobs, &machine_makespans_view[c, 0], machine_jobs_memory,
+                          machine_tasks_memory, job_seq_memory, prev_job_end_memory, job_end_memory)
+
+            feasible_view[c] = _replay_operations(operation_3d_array[c], 0, num_operations,
+                                                  &machine_makespans_view[c, 0], machine_jobs_memory,
+                                                  machine_tasks_memory, job_seq_memory, prev_job_end_memory,
+                                                  job_end_memory, task_processing_times_matrix,
+                                                  sequence_dependency_matrix, job_task_index_matrix,
+                                                  cutoff) == _FEASIBLE
+
+        free(machine_jobs_memory)
+        free(machine_tasks_memory)
+        free(job_seq_memory)
+        free(prev_job_end_memory)
+        free(job_end_memory)
+
+    return machine_makespans, feasible.view(np.bool_)
+
+
+# layout of the structured nparrays returned by compute_operation_times
+cdef packed struct _OperationTimes:
+    int job_id
+    int task_id
+    int machine
+    double wait
+    double setup
+    double runtime
+    double start
+    double setup_end
+    double end
+
+OPERATION_TIMES_DTYPE = np.dtype([('job_id', np.intc), ('task_id', np.intc), ('machine', np.intc),
+                                  ('wait', np.float64), ('setup', np.float64), ('runtime', np.float64),
+                                  ('start', np.float64), ('setup_end', np.float64), ('end', np.float64)])
+
+
+@cython.cdivision(True)
+cdef inline bint _outside_work_day(double clock, double time, double day_start, double day_end) nogil:
+    """
+    Returns true if time is later than day_end in its day or is not on the same day as clock,
+    where all of the times are in minutes and clock and time are relative to day_start minutes after midnight.
+    """
+    cdef double day = floor((day_start + time) / 1440.0)
+    return (day_start + time) - 1440.0 * day > day_end or day != floor((day_start + clock) / 1440.0)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+@cython.cdivision(True)
+cpdef np.ndarray compute_operation_times(const int[:, ::1] operation_2d_array,
+                                         const double[:, ::1] task_processing_times_matrix,
+                                         const int[:, ::1] sequence_dependency_matrix,
+                                         const int[:, ::1] job_task_index_matrix,
+                                         double day_start=0.0, double day_end=1440.0, bint continuous=True):
+    """
+    Computes the wait, setup, and run times and the start and end times of every operation
+    in a 2d nparray of operations in one pass.
+
+    All times are in minutes and the start and end times are relative to the start of the schedule.
+    If continuous is false, each machine only works between day_start and day_end minutes after midnight,
+    where the schedule starts at day_start on the first day.
+    An operation that would wait past the end of the work day is moved one day later,
+    and an operation that would finish after the end of the work day is moved one day later without its setup.
+
+    :type operation_2d_array: nparray
+    :param operation_2d_array: nparray of operations to compute the times for
 
-    for row in range(operation_2d_array.shape[0]):
+    :type task_processing_times_matrix: nparray
+    :param task_processing_times_matrix: task processing times matrix from static Data
+
+    :type sequence_dependency_matrix: nparray
+    :param sequence_dependency_matrix: sequence dependency matrix from static Data
+
+    :type job_task_index_matrix: nparray
+    :param job_task_index_matrix: job task index matrix from static Data
+
+    :type day_start: float
+    :param day_start: start of the work day in minutes after midnight
+
+    :type day_end: float
+    :param day_end: end of the work day in minutes after midnight
+
+    :type continuous: bool
+    :param continuous: if true a continuous schedule is computed (i.e. day_end is not used)
+
+    :rtype: nparray
+    :returns: structured 1d nparray with dtype OPERATION_TIMES_DTYPE with one element per operation
+    """
+    cdef Py_ssize_t num_operations = operation_2d_array.shape[0]
+    cdef Py_ssize_t num_jobs = job_task_index_matrix.shape[0]
+    cdef Py_ssize_t num_machines = task_processing_times_matrix.shape[1]
+
+    result = np.empty(num_operations, dtype=OPERATION_TIMES_DTYPE)
+    cdef _OperationTimes[::1] operation_times = result
+
+    cdef MakespanWorkspace workspace = MakespanWorkspace(task_processing_times_matrix, sequence_dependency_matrix,
+                                                         job_task_index_matrix)
+    cdef double[::1] machine_makespan_memory = np.empty(num_machines, dtype=np.float64)
+
+    # memory for keeping track of all machine's clock (i.e. the time the machine is available again)
+    cdef double[::1] machine_clock_memory = np.zeros(num_machines, dtype=np.float64)
+
+    cdef Py_ssize_t row
+    cdef int job_id, task_id, sequence, machine, cur_task_index, prev_task_index
+    cdef double wait, setup, runtime, added_time
+    cdef int * machine_jobs_memory = workspace.machine_jobs_memory
+    cdef int * machine_tasks_memory = workspace.machine_tasks_memory
+    cdef int * job_seq_memory = workspace.job_seq_memory
+    cdef double * prev_job_end_memory = workspace.prev_job_end_memory
+    cdef double * job_end_memory = workspace.job_end_memory
+
+    _reset_memory(num_machines, num_jobs, &machine_makespan_memory[0], machine_jobs_memory, machine_tasks_memory,
+                  job_seq_memory, prev_job_end_memory, job_end_memory)
+
+    for row in range(num_operations):
 
         job_id = operation_2d_array[row, 0]
         task_id = operation_2d_array[row, 1]
         sequence = operation_2d_array[row, 2]
         machine = operation_2d_array[row, 3]
+        cur_task_index = job_task_index_matrix[job_id, task_id]
 
         if machine_jobs_memory[machine] != -1:
-            cur_task_index = job_task_index_matrix[job_id, task_id]
             prev_task_index = job_task_index_matrix[machine_jobs_memory[machine], machine_tasks_memory[machine]]
             setup = sequence_dependency_matrix[cur_task_index, prev_task_index]
         else:
             setup = 0
 
-        if setup < 0 or sequence < job_seq_memory[job_id]:
-            raise InfeasibleSolutionException()
-
         if job_seq_memory[job_id] < sequence:
             prev_job_end_memory[job_id] = job_end_memory[job_id]
 
@@ -96,20 +471,737 @@ cpdef double[::1] compute_machine_makespans(int[:, ::1] operation_2d_array,
         else:
             wait = prev_job_end_memory[job_id] - machine_makespan_memory[machine]
 
-        runtime = task_processing_times_matrix[job_task_index_matrix[job_id, task_id], machine]
+        runtime = task_processing_times_matrix[cur_task_index, machine]
+
+        if not continuous and _outside_work_day(machine_clock_memory[machine],
+                                                machine_clock_memory[machine] + wait, day_start, day_end):
+            machine_clock_memory[machine] += 1440.0
+        else:
+            machine_clock_memory[machine] += wait
+
+        if not continuous and _outside_work_day(machine_clock_memory[machine],
+                                                machine_clock_memory[machine] + setup + runtime, day_start, day_end):
+            machine_clock_memory[machine] += 1440.0
+            setup = 0
+
+        operation_times[row].job_id = job_id
+        operation_times[row].task_id = task_id
+        operation_times[row].machine = machine
+        operation_times[row].wait = wait
+        operation_times[row].setup = setup
+        operation_times[row].runtime = runtime
+        operation_times[row].start = machine_clock_memory[machine]
+        operation_times[row].setup_end = machine_clock_memory[machine] + setup
+        operation_times[row].end = operation_times[row].setup_end + runtime
+
+        machine_clock_memory[machine] += setup + runtime
 
         # compute total added time and update memory modules
-        machine_makespan_memory[machine] += runtime + wait + setup
+        added_time = runtime + wait + setup
+        machine_makespan_memory[machine] += added_time
         job_end_memory[job_id] = max(machine_makespan_memory[machine], job_end_memory[job_id])
         job_seq_memory[job_id] = sequence
         machine_jobs_memory[machine] = job_id
         machine_tasks_memory[machine] = task_id
 
-    # free the memory modules
-    free(machine_jobs_memory)
-    free(machine_tasks_memory)
-    free(job_seq_memory)
-    free(job_end_memory)
-    free(prev_job_end_memory)
+    return result
 
-    return machine_makespan_memory
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+@cython.cdivision(True)
+cpdef np.ndarray compute_critical_path(const int[:, ::1] operation_2d_array,
+                                       const double[:, ::1] task_processing_times_matrix,
+                                       const int[:, ::1] sequence_dependency_matrix,
+                                       const int[:, ::1] job_task_index_matrix):
+    """
+    Computes a critical path of a 2d nparray of operations,
+    i.e. a chain of operations without idle time in between that ends with the makespan.
+
+    Each operation on the path either starts as soon as the previous operation on its machine ends,
+    or as soon as the previous sequence of its job ends (in which case it had to wait).
+
+    :type operation_2d_array: nparray
+    :param operation_2d_array: nparray of operations to compute the critical path of
+
+    :type task_processing_times_matrix: nparray
+    :param task_processing_times_matrix: task processing times matrix from static Data
+
+    :type sequence_dependency_matrix: nparray
+    :param sequence_dependency_matrix: sequence dependency matrix from static Data
+
+    :type job_task_index_matrix: nparray
+    :param job_task_index_matrix: job task index matrix from static Data
+
+    :rtype: nparray
+    :returns: 1d nparray of the row indices of the operations on the critical path in increasing order
+    :raise: InfeasibleSolutionException if the solution is infeasible
+    """
+    cdef Py_ssize_t num_operations = operation_2d_array.shape[0]
+    cdef Py_ssize_t num_jobs = job_task_index_matrix.shape[0]
+    cdef Py_ssize_t num_machines = task_processing_times_matrix.shape[1]
+
+    cdef MakespanWorkspace workspace = MakespanWorkspace(task_processing_times_matrix, sequence_dependency_matrix,
+                                                         job_task_index_matrix)
+    cdef double[::1] machine_makespan_memory = np.empty(num_machines, dtype=np.float64)
+
+    # row of the operation each operation waited for (i.e. its predecessor on the critical path), or -1
+    cdef Py_ssize_t[::1] predecessor_rows = np.full(num_operations, -1, dtype=np.intp)
+
+    # rows of the operations that last updated the machine, job end, and previous job end memory modules
+    cdef Py_ssize_t[::1] machine_last_rows = np.full(num_machines, -1, dtype=np.intp)
+    cdef Py_ssize_t[::1] job_end_rows = np.full(num_jobs, -1, dtype=np.intp)
+    cdef Py_ssize_t[::1] prev_job_end_rows = np.full(num_jobs, -1, dtype=np.intp)
+
+    cdef Py_ssize_t row, length
+    cdef int job_id, sequence, machine, i
+    cdef double machine_makespan_before
+
+    _reset_memory(num_machines, num_jobs, &machine_makespan_memory[0], workspace.machine_jobs_memory,
+                  workspace.machine_tasks_memory, workspace.job_seq_memory, workspace.prev_job_end_memory,
+                  workspace.job_end_memory)
+
+    for row in range(num_operations):
+        job_id = operation_2d_array[row, 0]
+        sequence = operation_2d_array[row, 2]
+        machine = operation_2d_array[row, 3]
+        machine_makespan_before = machine_makespan_memory[machine]
+
+        if workspace.job_seq_memory[job_id] < sequence:
+            prev_job_end_rows[job_id] = job_end_rows[job_id]
+
+        if _process_operation(job_id, operation_2d_array[row, 1], sequence, machine,
+                              &machine_makespan_memory[0], workspace.machine_jobs_memory,
+                              workspace.machine_tasks_memory, workspace.job_seq_memory,
+                              workspace.prev_job_end_memory, workspace.job_end_memory,
+                              task_processing_times_matrix, sequence_dependency_matrix,
+                              job_task_index_matrix, INFINITY) != _FEASIBLE:
+            raise InfeasibleSolutionException()
+
+        if workspace.prev_job_end_memory[job_id] > machine_makespan_before:
+            predecessor_rows[row] = prev_job_end_rows[job_id]
+        else:
+            predecessor_rows[row] = machine_last_rows[machine]
+
+        if machine_makespan_memory[machine] >= workspace.job_end_memory[job_id]:
+            job_end_rows[job_id] = row
+        machine_last_rows[machine] = row
+
+    if num_operations == 0:
+        return np.empty(0, dtype=np.intp)
+
+    # walk back from the last operation on the machine with the makespan
+    machine = 0
+    for i in range(1, num_machines):
+        if machine_makespan_memory[i] > machine_makespan_memory[machine]:
+            machine = i
+
+    result = np.empty(num_operations, dtype=np.intp)
+    cdef Py_ssize_t[::1] result_view = result
+    length = 0
+    row = machine_last_rows[machine]
+    while row != -1:
+        result_view[length] = row
+        length += 1
+        row = predecessor_rows[row]
+
+    return result[:length][::-1].copy()
+
+
+cdef inline uint64_t _mix64(uint64_t z) nogil:
+    """
+    Scrambles the bits of z (splitmix64 finalizer).
+    """
+    z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9ULL
+    z = (z ^ (z >> 27)) * 0x94D049BB133111EBULL
+    return z ^ (z >> 31)
+
+
+cdef inline uint64_t _operation_hash(int job_id, int task_id, int machine, Py_ssize_t position) nogil:
+    """
+    Returns the hash of an operation at a position of an operation 2d array.
+    """
+    cdef uint64_t z = _mix64(<uint64_t> job_id + 0x9E3779B97F4A7C15ULL)
+    z = _mix64(z ^ <uint64_t> task_id)
+    z = _mix64(z ^ <uint64_t> machine)
+    return _mix64(z ^ <uint64_t> position)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+cpdef uint64_t compute_operation_hash(const int[:, ::1] operation_2d_array):
+    """
+    Computes the 64 bit hash of an operation 2d array,
+    which is the xor of the hashes of each operation's job, task, and machine at its position.
+
+    Equal operation 2d arrays have equal hashes, so different hashes mean different operation 2d arrays.
+
+    :type operation_2d_array: nparray
+    :param operation_2d_array: nparray of operations to hash
+
+    :rtype: int
+    :returns: 64 bit hash
+    """
+    cdef Py_ssize_t row
+    cdef uint64_t result = 0
+    with nogil:
+        for row in range(operation_2d_array.shape[0]):
+            result ^= _operation_hash(operation_2d_array[row, 0], operation_2d_array[row, 1],
+                                      operation_2d_array[row, 3], row)
+    return result
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+cpdef np.ndarray compute_move_hashes(const int[:, ::1] operation_2d_array, uint64_t operation_hash,
+                                     const int[:, ::1] moves):
+    """
+    Computes the hashes of the operation 2d arrays that result from a 2d nparray of moves
+    (see MakespanCheckpoints.compute_move_makespans_batch) from the hash of operation_2d_array.
+
+    Only the operations that change positions are rehashed, i.e. the rows between the from and to index of a move.
+
+    :type operation_2d_array: nparray
+    :param operation_2d_array: nparray of operations the moves are applied to
+
+    :type operation_hash: int
+    :param operation_hash: hash of operation_2d_array (see compute_operation_hash)
+
+    :type moves: nparray
+    :param moves: 2d nparray of moves in the form [from_index, to_index, machine]
+
+    :rtype: nparray
+    :returns: 1d nparray of the uint64 hashes of the moves' operation 2d arrays
+    """
+    cdef Py_ssize_t num_moves = moves.shape[0]
+    result = np.empty(num_moves, dtype=np.uint64)
+    cdef uint64_t[::1] result_view = result
+    cdef Py_ssize_t c, row, from_index, to_index
+    cdef uint64_t move_hash
+
+    if num_moves > 0 and moves.shape[1] != 3:
+        raise ValueError("moves must have 3 columns")
+
+    with nogil:
+        for c in range(num_moves):
+            from_index = moves[c, 0]
+            to_index = moves[c, 1]
+            move_hash = operation_hash ^ _operation_hash(operation_2d_array[from_index, 0],
+                                                         operation_2d_array[from_index, 1],
+                                                         operation_2d_array[from_index, 3], from_index)
+
+            # the operations in between shift one position towards from_index
+            if from_index < to_index:
+                for row in range(from_index + 1, to_index + 1):
+                    move_hash ^= _operation_hash(operation_2d_array[row, 0], operation_2d_array[row, 1],
+                                                 operation_2d_array[row, 3], row) \
+                                 ^ _operation_hash(operation_2d_array[row, 0], operation_2d_array[row, 1],
+                                                   operation_2d_array[row, 3], row - 1)
+            else:
+                for row in range(to_index, from_index):
+                    move_hash ^= _operation_hash(operation_2d_array[row, 0], operation_2d_array[row, 1],
+                                                 operation_2d_array[row, 3], row) \
+                                 ^ _operation_hash(operation_2d_array[row, 0], operation_2d_array[row, 1],
+                                                   operation_2d_array[row, 3], row + 1)
+
+            result_view[c] = move_hash ^ _operation_hash(operation_2d_array[from_index, 0],
+                                                         operation_2d_array[from_index, 1],
+                                                         moves[c, 2], to_index)
+
+    return result
+
+
+cdef class MakespanWorkspace:
+    """
+    Preallocated memory modules for computing the machine makespans of the operation 2d arrays of one JSSP instance.
+
+    Unlike compute_machine_makespans, computing makespans with a workspace does not allocate any memory
+    and reports infeasible operation 2d arrays with a return code instead of raising an exception.
+    It also accepts a cutoff makespan, above which the computation stops early and reports a dominated return code.
+    A workspace must not be used by more than one thread at a time.
+
+    :type task_processing_times_matrix: nparray
+    :param task_processing_times_matrix: task processing times matrix from static Data
+
+    :type sequence_dependency_matrix: nparray
+    :param sequence_dependency_matrix: sequence dependency matrix from static Data
+
+    :type job_task_index_matrix: nparray
+    :param job_task_index_matrix: job task index matrix from static Data
+    """
+    cdef readonly Py_ssize_t num_jobs
+    cdef readonly Py_ssize_t num_machines
+    cdef int * machine_jobs_memory
+    cdef int * machine_tasks_memory
+    cdef int * job_seq_memory
+    cdef double * prev_job_end_memory
+    cdef double * job_end_memory
+    cdef const double[:, ::1] task_processing_times_matrix
+    cdef const int[:, ::1] sequence_dependency_matrix
+    cdef const int[:, ::1] job_task_index_matrix
+
+    def __init__(self, const double[:, ::1] task_processing_times_matrix,
+                 const int[:, ::1] sequence_dependency_matrix,
+                 const int[:, ::1] job_task_index_matrix):
+        """
+        Initializes an instance of MakespanWorkspace.
+
+        See help(MakespanWorkspace)
+        """
+        self.num_jobs = job_task_index_matrix.shape[0]
+        self.num_machines = task_processing_times_matrix.shape[1]
+        self.task_processing_times_matrix = task_processing_times_matrix
+        self.sequence_dependency_matrix = sequence_dependency_matrix
+        self.job_task_index_matrix = job_task_index_matrix
+
+        self.machine_jobs_memory = <int *> malloc(sizeof(int) * self.num_machines)
+        self.machine_tasks_memory = <int *> malloc(sizeof(int) * self.num_machines)
+        self.job_seq_memory = <int *> malloc(sizeof(int) * self.num_jobs)
+        self.prev_job_end_memory = <double *> malloc(sizeof(double) * self.num_jobs)
+        self.job_end_memory = <double *> malloc(sizeof(double) * self.num_jobs)
+
+        if self.machine_jobs_memory == NULL or self.machine_tasks_memory == NULL or self.job_seq_memory == NULL \
+                or self.prev_job_end_memory == NULL or self.job_end_memory == NULL:
+            raise MemoryError()
+
+    def __dealloc__(self):
+        free(self.machine_jobs_memory)
+        free(self.machine_tasks_memory)
+        free(self.job_seq_memory)
+        free(self.prev_job_end_memory)
+        free(self.job_end_memory)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.nonecheck(False)
+    cpdef double compute_makespan(self, const int[:, ::1] operation_2d_array, double[::1] machine_makespans,
+                                  double cutoff=INFINITY) except? -2:
+        """
+        Computes the machine makespans of an operation 2d array into machine_makespans and returns the makespan.
+
+        :type operation_2d_array: nparray
+        :param operation_2d_array: nparray of operations to compute the machine makespans for
+
+        :type machine_makespans: nparray
+        :param machine_makespans: 1d nparray of size total_number_of_machines to store the machine makespans in
+
+        :type cutoff: float
+        :param cutoff: the computation stops as soon as a machine makespan is greater than cutoff
+
+        :rtype: float
+        :returns: the makespan (i.e. the max machine makespan), INFEASIBLE_MAKESPAN if the solution is infeasible,
+        or DOMINATED_MAKESPAN if the makespan is greater than cutoff
+
+        :raise: ValueError if machine_makespans does not have size total_number_of_machines
+        """
+        if machine_makespans.shape[0] != self.num_machines:
+            raise ValueError(f"machine_makespans must have size {self.num_machines}")
+
+        _reset_memory(self.num_machines, self.num_jobs, &machine_makespans[0], self.machine_jobs_memory,
+                      self.machine_tasks_memory, self.job_seq_memory, self.prev_job_end_memory, self.job_end_memory)
+
+        return self._replay(operation_2d_array, 0, machine_makespans, cutoff)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.nonecheck(False)
+    cdef double _replay(self, const int[:, ::1] operation_2d_array, Py_ssize_t start_row,
+                        double[::1] machine_makespans, double cutoff) nogil:
+        """
+        Processes the operations from start_row on with the current state of the memory modules
+        and returns the makespan, _INFEASIBLE_MAKESPAN or _DOMINATED_MAKESPAN.
+        """
+        cdef Py_ssize_t i
+        cdef double makespan = 0.0
+        cdef int status = _replay_operations(operation_2d_array, start_row, operation_2d_array.shape[0],
+                                             &machine_makespans[0], self.machine_jobs_memory,
+                                             self.machine_tasks_memory, self.job_seq_memory,
+                                             self.prev_job_end_memory, self.job_end_memory,
+                                             self.task_processing_times_matrix, self.sequence_dependency_matrix,
+                                             self.job_task_index_matrix, cutoff)
+        if status == _INFEASIBLE:
+            return _INFEASIBLE_MAKESPAN
+        elif status == _DOMINATED:
+            return _DOMINATED_MAKESPAN
+
+        for i in range(self.num_machines):
+            if machine_makespans[i] > makespan:
+                makespan = machine_makespans[i]
+
+        return makespan
+
+
+cdef class MakespanCheckpoints:
+    """
+    Snapshots of the makespan computation state (i.e. the per machine and per job memory modules)
+    taken every interval rows of an operation 2d array.
+
+    The snapshots are used to compute the machine makespans of a neighboring operation 2d array
+    that only differs from the original one at or after a given row,
+    by restoring the closest snapshot before that row and replaying the remaining rows.
+
+    :type operation_2d_array: nparray
+    :param operation_2d_array: nparray of operations to take the snapshots of
+
+    :type task_processing_times_matrix: nparray
+    :param task_processing_times_matrix: task processing times matrix from static Data
+
+    :type sequence_dependency_matrix: nparray
+    :param sequence_dependency_matrix: sequence dependency matrix from static Data
+
+    :type job_task_index_matrix: nparray
+    :param job_task_index_matrix: job task index matrix from static Data
+
+    :type interval: int
+    :param interval: number of rows between snapshots, defaults to the square root of the number of operations
+
+    :raise: InfeasibleSolutionException if the operation 2d array is infeasible
+    """
+    cdef readonly Py_ssize_t interval
+    cdef readonly Py_ssize_t num_checkpoints
+    cdef readonly Py_ssize_t num_operations
+    cdef Py_ssize_t num_jobs, num_machines
+    cdef double[:, ::1] machine_makespan_snapshots
+    cdef int[:, ::1] machine_jobs_snapshots
+    cdef int[:, ::1] machine_tasks_snapshots
+    cdef int[:, ::1] job_seq_snapshots
+    cdef double[:, ::1] prev_job_end_snapshots
+    cdef double[:, ::1] job_end_snapshots
+    cdef const double[:, ::1] task_processing_times_matrix
+    cdef const int[:, ::1] sequence_dependency_matrix
+    cdef const int[:, ::1] job_task_index_matrix
+    cdef const int[:, ::1] operation_2d_array
+    cdef MakespanWorkspace workspace
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.nonecheck(False)
+    @cython.cdivision(True)
+    def __init__(self, const int[:, ::1] operation_2d_array,
+                 const double[:, ::1] task_processing_times_matrix,
+                 const int[:, ::1] sequence_dependency_matrix,
+                 const int[:, ::1] job_task_index_matrix,
+                 Py_ssize_t interval=0):
+        """
+        Initializes an instance of MakespanCheckpoints by processing the operation 2d array once.
+
+        See help(MakespanCheckpoints)
+        """
+        cdef Py_ssize_t k, start_row, end_row
+        self.num_operations = operation_2d_array.shape[0]
+        self.num_jobs = job_task_index_matrix.shape[0]
+        self.num_machines = task_processing_times_matrix.shape[1]
+        self.interval = interval if interval > 0 else max(1, <Py_ssize_t> ceil(sqrt(self.num_operations)))
+        self.num_checkpoints = max(1, (self.num_operations + self.interval - 1) // self.interval)
+
+        self.task_processing_times_matrix = task_processing_times_matrix
+        self.sequence_dependency_matrix = sequence_dependency_matrix
+        self.job_task_index_matrix = job_task_index_matrix
+        self.operation_2d_array = operation_2d_array
+        self.workspace = MakespanWorkspace(task_processing_times_matrix, sequence_dependency_matrix,
+                                           job_task_index_matrix)
+
+        self.machine_makespan_snapshots = np.empty((self.num_checkpoints, self.num_machines), dtype=np.float64)
+        self.machine_jobs_snapshots = np.empty((self.num_checkpoints, self.num_machines), dtype=np.intc)
+        self.machine_tasks_snapshots = np.empty((self.num_checkpoints, self.num_machines), dtype=np.intc)
+        self.job_seq_snapshots = np.empty((self.num_checkpoints, self.num_jobs), dtype=np.intc)
+        self.prev_job_end_snapshots = np.empty((self.num_checkpoints, self.num_jobs), dtype=np.float64)
+        self.job_end_snapshots = np.empty((self.num_checkpoints, self.num_jobs), dtype=np.float64)
+
+        # snapshot k is the state before processing row k * interval,
+        # so each snapshot is built by copying the previous one and replaying the rows in between
+        _reset_memory(self.num_machines, self.num_jobs,
+                      &self.machine_makespan_snapshots[0, 0], &self.machine_jobs_snapshots[0, 0],
+                      &self.machine_tasks_snapshots[0, 0], &self.job_seq_snapshots[0, 0],
+                      &self.prev_job_end_snapshots[0, 0], &self.job_end_snapshots[0, 0])
+
+        for k in range(1, self.num_checkpoints):
+            self._copy_snapshot(k - 1, k)
+            start_row = (k - 1) * self.interval
+            end_row = k * self.interval
+            if _replay_operations(operation_2d_array, start_row, end_row,
+                                  &self.machine_makespan_snapshots[k, 0], &self.machine_jobs_snapshots[k, 0],
+                                  &self.machine_tasks_snapshots[k, 0], &self.job_seq_snapshots[k, 0],
+                                  &self.prev_job_end_snapshots[k, 0], &self.job_end_snapshots[k, 0],
+                                  task_processing_times_matrix, sequence_dependency_matrix,
+                                  job_task_index_matrix, INFINITY) != _FEASIBLE:
+                raise InfeasibleSolutionException()
+
+    cdef void _copy_snapshot(self, Py_ssize_t src, Py_ssize_t dst):
+        memcpy(&self.machine_makespan_snapshots[dst, 0], &self.machine_makespan_snapshots[src, 0],
+               sizeof(double) * self.num_machines)
+        memcpy(&self.machine_jobs_snapshots[dst, 0], &self.machine_jobs_snapshots[src, 0],
+               sizeof(int) * self.num_machines)
+        memcpy(&self.machine_tasks_snapshots[dst, 0], &self.machine_tasks_snapshots[src, 0],
+               sizeof(int) * self.num_machines)
+        memcpy(&self.job_seq_snapshots[dst, 0], &self.job_seq_snapshots[src, 0],
+               sizeof(int) * self.num_jobs)
+        memcpy(&self.prev_job_end_snapshots[dst, 0], &self.prev_job_end_snapshots[src, 0],
+               sizeof(double) * self.num_jobs)
+        memcpy(&self.job_end_snapshots[dst, 0], &self.job_end_snapshots[src, 0],
+               sizeof(double) * self.num_jobs)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.nonecheck(False)
+    @cython.cdivision(True)
+    cpdef double[::1] compute_machine_makespans(self, int[:, ::1] operation_2d_array, Py_ssize_t first_changed_row):
+        """
+        Computes the machine makespans of an operation 2d array that is equal to the one these checkpoints
+        were taken of in all rows before first_changed_row.
+
+        :type operation_2d_array: nparray
+        :param operation_2d_array: nparray of operations to compute the machine makespans for
+
+        :type first_changed_row: int
+        :param first_changed_row: index of the first row where operation_2d_array differs
+
+        :rtype: nparray
+        :returns: memory view of a 1d nparray of machine make span times, where makespan[i] = makespan of machine i
+        :raise: InfeasibleSolutionException if the solution is infeasible
+        """
+        cdef double[::1] machine_makespan_memory = np.empty(self.num_machines, dtype=np.float64)
+        if self.compute_makespan(operation_2d_array, first_changed_row, machine_makespan_memory) == _INFEASIBLE_MAKESPAN:
+            raise InfeasibleSolutionException()
+
+        return machine_makespan_memory
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.nonecheck(False)
+    @cython.cdivision(True)
+    cpdef double compute_makespan(self, const int[:, ::1] operation_2d_array, Py_ssize_t first_changed_row,
+                                  double[::1] machine_makespans, double cutoff=INFINITY) except? -2:
+        """
+        Computes the machine makespans of an operation 2d array that is equal to the one these checkpoints
+        were taken of in all rows before first_changed_row into machine_makespans and returns the makespan.
+
+        No memory is allocated and infeasibility is reported with a return code (see MakespanWorkspace).
+
+        :type operation_2d_array: nparray
+        :param operation_2d_array: nparray of operations to compute the machine makespans for
+
+        :type first_changed_row: int
+        :param first_changed_row: index of the first row where operation_2d_array differs
+
+        :type machine_makespans: nparray
+        :param machine_makespans: 1d nparray of size total_number_of_machines to store the machine makespans in
+
+        :type cutoff: float
+        :param cutoff: the computation stops as soon as a machine makespan is greater than cutoff
+
+        :rtype: float
+        :returns: the makespan (i.e. the max machine makespan), INFEASIBLE_MAKESPAN if the solution is infeasible,
+        or DOMINATED_MAKESPAN if the makespan is greater than cutoff
+
+        :raise: ValueError if machine_makespans does not have size total_number_of_machines
+        """
+        cdef Py_ssize_t k = min(max(first_changed_row, 0) // self.interval, self.num_checkpoints - 1)
+
+        if machine_makespans.shape[0] != self.num_machines:
+            raise ValueError(f"machine_makespans must have size {self.num_machines}")
+
+        memcpy(&machine_makespans[0], &self.machine_makespan_snapshots[k, 0], sizeof(double) * self.num_machines)
+        memcpy(self.workspace.machine_jobs_memory, &self.machine_jobs_snapshots[k, 0], sizeof(int) * self.num_machines)
+        memcpy(self.workspace.machine_tasks_memory, &self.machine_tasks_snapshots[k, 0], sizeof(int) * self.num_machines)
+        memcpy(self.workspace.job_seq_memory, &self.job_seq_snapshots[k, 0], sizeof(int) * self.num_jobs)
+        memcpy(self.workspace.prev_job_end_memory, &self.prev_job_end_snapshots[k, 0], sizeof(double) * self.num_jobs)
+        memcpy(self.workspace.job_end_memory, &self.job_end_snapshots[k, 0], sizeof(double) * self.num_jobs)
+
+        return self.workspace._replay(operation_2d_array, k * self.interval, machine_makespans, cutoff)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.nonecheck(False)
+    @cython.cdivision(True)
+    cpdef tuple compute_machine_makespans_batch(self, const int[:, :, ::1] operation_3d_array,
+                                                const Py_ssize_t[::1] first_changed_rows, int num_threads=1,
+                                                double cutoff=INFINITY):
+        """
+        Computes the machine makespans of a stack of candidate operation 2d arrays without holding the GIL,
+        where candidate i is equal to the operation 2d array these checkpoints were taken of
+        in all rows before first_changed_rows[i].
+
+        If the extension was compiled with OpenMP the candidates are divided among num_threads threads,
+        otherwise they are computed serially.
+        The computation of a candidate stops as soon as one of its machine makespans exceeds cutoff.
+
+        :type operation_3d_array: nparray
+        :param operation_3d_array: 3d nparray of shape (n_candidates, n_tasks, 4) of candidate operation 2d arrays
+
+        :type first_changed_rows: nparray
+        :param first_changed_rows: 1d nparray of the index of the first row where each candidate differs
+
+        :type num_threads: int
+        :param num_threads: number of threads to compute the candidates with
+
+        :type cutoff: float
+        :param cutoff: candidates with a makespan greater than cutoff are dominated
+
+        :rtype: (nparray, nparray)
+        :returns: 2d nparray of shape (n_candidates, n_machines) of machine makespans
+        and a 1d boolean nparray that is true for the feasible candidates that are not dominated.
+        The machine makespans of the other candidates are not meaningful.
+        """
+        cdef Py_ssize_t num_candidates = operation_3d_array.shape[0]
+        cdef Py_ssize_t num_operations = operation_3d_array.shape[1]
+        cdef Py_ssize_t num_jobs = self.num_jobs
+        cdef Py_ssize_t num_machines = self.num_machines
+
+        machine_makespans = np.zeros((num_candidates, num_machines), dtype=np.float64)
+        feasible = np.zeros(num_candidates, dtype=np.uint8)
+        cdef double[:, ::1] machine_makespans_view = machine_makespans
+        cdef unsigned char[::1] feasible_view = feasible
+
+        cdef int * machine_jobs_memory
+        cdef int * machine_tasks_memory
+        cdef int * job_seq_memory
+        cdef double * prev_job_end_memory
+        cdef double * job_end_memory
+        cdef Py_ssize_t c, k
+
+        if num_candidates == 0:
+            return machine_makespans, feasible.view(np.bool_)
+
+        num_threads = max(1, num_threads)
+        with nogil, parallel(num_threads=num_threads):
+            # per thread scratch memory
+            machine_jobs_memory = <int *> malloc(sizeof(int) * num_machines)
+            machine_tasks_memory = <int *> malloc(sizeof(int) * num_machines)
+            job_seq_memory = <int *> malloc(sizeof(int) * num_jobs)
+            prev_job_end_memory = <double *> malloc(sizeof(double) * num_jobs)
+            job_end_memory = <double *> malloc(sizeof(double) * num_jobs)
+
+            if machine_jobs_memory == NULL or machine_tasks_memory == NULL or job_seq_memory == NULL \
+                    or prev_job_end_memory == NULL or job_end_memory == NULL:
+                abort()
+
+            for c in prange(num_candidates, schedule='dynamic'):
+                k = min(max(first_changed_rows[c], 0) // self.interval, self.num_checkpoints - 1)
+                memcpy(&machine_makespans_view[c, 0], &self.machine_makespan_snapshots[k, 0],
+                       sizeof(double) * num_machines)
+                memcpy(machine_jobs_memory, &self.machine_jobs_snapshots[k, 0], sizeof(int) * num_machines)
+                memcpy(machine_tasks_memory, &self.machine_tasks_snapshots[k, 0], sizeof(int) * num_machines)
+                memcpy(job_seq_memory, &self.job_seq_snapshots[k, 0], sizeof(int) * num_jobs)
+                memcpy(prev_job_end_memory, &self.prev_job_end_snapshots[k, 0], sizeof(double) * num_jobs)
+                memcpy(job_end_memory, &self.job_end_snapshots[k, 0], sizeof(double) * num_jobs)
+
+                feasible_view[c] = _replay_operations(operation_3d_array[c], k * self.interval, num_operations,
+                                                      &machine_makespans_view[c, 0], machine_jobs_memory,
+                                                      machine_tasks_memory, job_seq_memory, prev_job_end_memory,
+                                                      job_end_memory, self.task_processing_times_matrix,
+                                                      self.sequence_dependency_matrix,
+                                                      self.job_task_index_matrix, cutoff) == _FEASIBLE
+
+            free(machine_jobs_memory)
+            free(machine_tasks_memory)
+            free(job_seq_memory)
+            free(prev_job_end_memory)
+            free(job_end_memory)
+
+        return machine_makespans, feasible.view(np.bool_)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.nonecheck(False)
+    @cython.cdivision(True)
+    cpdef tuple compute_move_makespans_batch(self, const int[:, ::1] moves, int num_threads=1,
+                                             double cutoff=INFINITY):
+        """
+        Computes the machine makespans of the neighbors described by a 2d nparray of moves without holding the GIL.
+
+        A move is a row in the form [from_index, to_index, machine],
+        where the neighbor is the operation 2d array these checkpoints were taken of
+        with the operation at from_index removed and inserted at to_index on the given machine.
+        The neighbors are evaluated by remapping the rows of the original operation 2d array,
+        so they are never built.
+
+        If the extension was compiled with OpenMP the moves are divided among num_threads threads,
+        otherwise they are computed serially.
+        The computation of a move stops as soon as one of its machine makespans exceeds cutoff.
+
+        :type moves: nparray
+        :param moves: 2d nparray of shape (n_moves, 3) of moves
+
+        :type num_threads: int
+        :param num_threads: number of threads to compute the moves with
+
+        :type cutoff: float
+        :param cutoff: moves with a makespan greater than cutoff are dominated
+
+        :rtype: (nparray, nparray)
+        :returns: 2d nparray of shape (n_moves, n_machines) of machine makespans
+        and a 1d boolean nparray that is true for the feasible moves that are not dominated.
+        The machine makespans of the other moves are not meaningful.
+        """
+        cdef Py_ssize_t num_moves = moves.shape[0]
+        cdef Py_ssize_t num_jobs = self.num_jobs
+        cdef Py_ssize_t num_machines = self.num_machines
+
+        if num_moves > 0 and moves.shape[1] != 3:
+            raise ValueError("moves must have 3 columns")
+
+        machine_makespans = np.zeros((num_moves, num_machines), dtype=np.float64)
+        feasible = np.zeros(num_moves, dtype=np.uint8)
+        cdef double[:, ::1] machine_makespans_view = machine_makespans
+        cdef unsigned char[::1] feasible_view = feasible
+
+        cdef int * machine_jobs_memory
+        cdef int * machine_tasks_memory
+        cdef int * job_seq_memory
+        cdef double * prev_job_end_memory
+        cdef double * job_end_memory
+        cdef Py_ssize_t c, k, from_index, to_index
+
+        if num_moves == 0:
+            return machine_makespans, feasible.view(np.bool_)
+
+        num_threads = max(1, num_threads)
+        with nogil, parallel(num_threads=num_threads):
+            # per thread scratch memory
+            machine_jobs_memory = <int *> malloc(sizeof(int) * num_machines)
+            machine_tasks_memory = <int *> malloc(sizeof(int) * num_machines)
+            job_seq_memory = <int *> malloc(sizeof(int) * num_jobs)
+            prev_job_end_memory = <double *> malloc(sizeof(double) * num_jobs)
+            job_end_memory = <double *> malloc(sizeof(double) * num_jobs)
+
+            if machine_jobs_memory == NULL or machine_tasks_memory == NULL or job_seq_memory == NULL \
+                    or prev_job_end_memory == NULL or job_end_memory == NULL:
+                abort()
+
+            for c in prange(num_moves, schedule='dynamic'):
+                from_index = moves[c, 0]
+                to_index = moves[c, 1]
+                if from_index < 0 or from_index >= self.num_operations \
+                        or to_index < 0 or to_index >= self.num_operations:
+                    feasible_view[c] = False
+                    continue
+
+                # the neighbor only differs from the original at or after the first of the two indices
+                k = min(min(from_index, to_index) // self.interval, self.num_checkpoints - 1)
+                memcpy(&machine_makespans_view[c, 0], &self.machine_makespan_snapshots[k, 0],
+                       sizeof(double) * num_machines)
+                memcpy(machine_jobs_memory, &self.machine_jobs_snapshots[k, 0], sizeof(int) * num_machines)
+                memcpy(machine_tasks_memory, &self.machine_tasks_snapshots[k, 0], sizeof(int) * num_machines)
+                memcpy(job_seq_memory, &self.job_seq_snapshots[k, 0], sizeof(int) * num_jobs)
+                memcpy(prev_job_end_memory, &self.prev_job_end_snapshots[k, 0], sizeof(double) * num_jobs)
+                memcpy(job_end_memory, &self.job_end_snapshots[k, 0], sizeof(double) * num_jobs)
+
+                feasible_view[c] = _replay_move(self.operation_2d_array, from_index, to_index, moves[c, 2],
+                                                k * self.interval, &machine_makespans_view[c, 0],
+                                                machine_jobs_memory, machine_tasks_memory, job_seq_memory,
+                                                prev_job_end_memory, job_end_memory,
+                                                self.task_processing_times_matrix,
+                                                self.sequence_dependency_matrix,
+                                                self.job_task_index_matrix, cutoff) == _FEASIBLE
+
+            free(machine_jobs_memory)
+            free(machine_tasks_memory)
+            free(job_seq_memory)
+            free(prev_job_end_memory)
+            free(job_end_memory)
+
+        return machine_makespans, feasible.view(np.bool_)
@@ -2,6 +2,7 @@ import datetime
 import random
 from pathlib import Path
 
+import numpy as np
 import plotly.figure_factory as ff
 import xlsxwriter
 from plotly.offline import plot, iplot
@@ -56,6 +57,19 @@ def _check_output_path(output_path, file_ext):
         return output_path
 
 
+def _datetimes_to_strings(datetimes):
+    """
+    Formats an nparray of datetime64 as a list of "%Y-%m-%d %H:%M:%S" strings.
+
+    :type datetimes: nparray
+    :param datetimes: nparray of datetime64
+
+    :rtype: [str]
+    :returns: list of formatted datetimes
+    """
+    return np.char.replace(np.datetime_as_string(datetimes, unit='s'), 'T', ' ').tolist()
+
+
 def create_schedule_xlsx_file(solution, output_path, start_date=datetime.date.today(), start_time=datetime.time(hour=8, minute=0),
                               end_time=datetime.time(hour=20, minute=0), continuous=False):
     """
@@ -101,15 +115,14 @@ def create_schedule_xlsx_file(solution, output_path, start_date=datetime.date.to
 
     worksheet.set_row(2, 16, cell_format=colored)
     machine_current_row = [3] * solution.data.total_number_of_machines
-    strftime = "%Y-%m-%d %H:%M:%S"
-    operations = solution.get_operation_list_for_machine(start_date, start_time, end_time, continuous=continuous)
-    for operation in operations:
-        job_id = operation.job_id
-        task_id = operation.task_id
-        machine = operation.machine
-        setup_start = operation.setup_start_time.strftime(strftime)
-        setup_end = operation.setup_end_time.strftime(strftime)
-        runtime_end = operation.runtime_end_time.strftime(strftime)
+    operation_times = solution.get_operation_times(start_date, start_time, end_time, continuous=continuous)
+    operation_machines = operation_times['machine']
+    for job_id, task_id, machine, setup_start, setup_end, runtime_end in zip(operation_times['job_id'].tolist(),
+                                                                             operation_times['task_id'].tolist(),
+                                                                             operation_machines.tolist(),
+                                                                             _datetimes_to_strings(operation_times['setup_start']),
+                                                                             _datetimes_to_strings(operation_times['setup_end']),
+                                                                             _datetimes_to_strings(operation_times['runtime_end'])):
 
         worksheet.write_row(machine_current_row[machine],
                             machine * 4,
@@ -123,11 +136,11 @@ def create_schedule_xlsx_file(solution, output_path, start_date=datetime.date.to
 
     col = 0
     for machine in range(solution.data.total_number_of_machines):
-        machine_operations = [op for op in operations if op.machine == machine]
-        if len(machine_operations) > 0:
-            s = machine_operations[0].setup_start_time
-            e = machine_operations[-1].runtime_end_time
-            makespan = str(e - s)
+        machine_rows = np.flatnonzero(operation_machines == machine)
+        if len(machine_rows) > 0:
+            s = operation_times['setup_start'][machine_rows[0]]
+            e = operation_times['runtime_end'][machine_rows[-1]]
+            makespan = str((e - s).item())
         else:
             makespan = "0"
         worksheet.write_row(1, col, ["Makespan =", makespan])
@@ -177,14 +190,12 @@ def create_gantt_chart(solution, output_path, title='Gantt Chart', start_date=da
         output_path = _check_output_path(output_path, ".html")
 
     df = []
-    strftime = "%Y-%m-%d %H:%M:%S"
-    operations = solution.get_operation_list_for_machine(start_date, start_time, end_time, continuous=continuous)
-    for operation in operations:
-        job_id = operation.job_id
-        machine = operation.machine
-        setup_start = operation.setup_start_time.strftime(strftime)
-        setup_end = operation.setup_end_time.strftime(strftime)
-        runtime_end = operation.runtime_end_time.strftime(strftime)
+    operation_times = solution.get_operation_times(start_date, start_time, end_time, continuous=continuous)
+    for job_id, machine, setup_start, setup_end, runtime_end in zip(operation_times['job_id'].tolist(),
+                                                                    operation_times['machine'].tolist(),
+                                                                    _datetimes_to_strings(operation_times['setup_start']),
+                                                                    _datetimes_to_strings(operation_times['setup_end']),
+                                                                    _datetimes_to_strings(operation_times['runtime_end'])):
 
         df.append(dict(Task=f"Machine-{machine}",
                        Start=setup_start,
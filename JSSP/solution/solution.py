@@ -1,11 +1,83 @@
 import datetime
+import weakref
 
 import numpy as np
 
-from ._makespan import compute_machine_makespans
+from ._makespan import MakespanCheckpoints, MakespanWorkspace, INFEASIBLE_MAKESPAN, compute_operation_times, \
+    compute_operation_hash
 from ._schedule_creator import create_schedule_xlsx_file, create_gantt_chart
 from ..data import Data
-from ..exception import IncompleteSolutionException
+from ..exception import IncompleteSolutionException, InfeasibleSolutionException
+
+# MakespanWorkspace of each Data instance in this process
+_makespan_workspaces = weakref.WeakKeyDictionary()
+
+# layout of the structured nparrays returned by Solution.get_operation_times
+_SCHEDULE_DTYPE = np.dtype([('job_id', np.intc), ('task_id', np.intc), ('machine', np.intc),
+                            ('wait', np.float64), ('setup', np.float64), ('runtime', np.float64),
+                            ('setup_start', 'datetime64[us]'), ('setup_end', 'datetime64[us]'),
+                            ('runtime_end', 'datetime64[us]')])
+
+
+def _get_makespan_workspace(data):
+    """
+    Gets the MakespanWorkspace of a Data instance, creating it on the first call.
+
+    :type data: Data
+    :param data: JSSP instance data
+
+    :rtype: MakespanWorkspace
+    :returns: makespan workspace of data
+    """
+    workspace = _makespan_workspaces.get(data)
+    if workspace is None:
+        workspace = MakespanWorkspace(data.task_processing_times_matrix,
+                                      data.sequence_dependency_matrix,
+                                      data.job_task_index_matrix)
+        _makespan_workspaces[data] = workspace
+    return workspace
+
+
+def _get_comparison_key(makespan, machine_makespans):
+    """
+    Gets the key that Solutions are ordered by.
+
+    :type makespan: float
+    :param makespan: makespan of the Solution
+
+    :type machine_makespans: nparray
+    :param machine_makespans: machine makespans of the Solution
+
+    :rtype: tuple
+    :returns: (makespan, machine makespans in descending order)
+    """
+    return (makespan,) + tuple(np.sort(machine_makespans)[::-1].tolist())
+
+
+def _minutes_to_timedelta64(minutes):
+    """
+    Converts an nparray of minutes to an nparray of timedelta64 rounded to the nearest microsecond.
+
+    :type minutes: nparray
+    :param minutes: nparray of minutes
+
+    :rtype: nparray
+    :returns: nparray of timedelta64[us]
+    """
+    return np.rint(minutes * 60e6).astype(np.int64).astype('timedelta64[us]')
+
+
+def _minutes_after_midnight(time):
+    """
+    Converts a datetime.time to the number of minutes after midnight.
+
+    :type time: datetime.time
+    :param time: time to convert
+
+    :rtype: float
+    :returns: minutes after midnight
+    """
+    return time.hour * 60 + time.minute + time.second / 60 + time.microsecond / 60e6
 
 
 class Operation:
@@ -30,21 +102,32 @@ class Solution:
     Solution class which is composed of a 2d nparray of operations where
     an operation is a 1d nparray in the form [job_id, task_id, sequence, machine],
     a 1d nparray memory view of machine makespan times,
-    and the makespan time.
+    the makespan time, and a 64 bit hash of the operations used for identity checks.
+
+    Solutions are ordered by their comparison_key, the tuple (makespan, machine makespans in descending order),
+    which is computed once so that comparing two Solutions does not allocate anything.
 
     :type data: Data
     :param data: JSSP instance data
 
     :type operation_2d_array: nparray
     :param operation_2d_array: 2d nparray of operations
+
+    :type machine_makespans: nparray
+    :param machine_makespans: precomputed machine makespans of operation_2d_array, or None
+
+    :type operation_hash: int
+    :param operation_hash: precomputed hash of operation_2d_array (see compute_operation_hash), or None
     """
 
-    def __init__(self, data, operation_2d_array):
+    def __init__(self, data, operation_2d_array, machine_makespans=None, operation_hash=None):
         """
         Initializes an instance of Solution.
 
         First it checks if the operation_2d_array parameter is feasible,
         then it computes the nparray of machine makespan times and the makespan time of the Solution.
+        If machine_makespans is not None the computation is skipped and machine_makespans is used instead,
+        and the same goes for operation_hash.
 
         :raise: InfeasibleSolutionException if solution is infeasible
         :raise: IncompleteSolutionException if solution is incomplete
@@ -55,16 +138,32 @@ class Solution:
             raise IncompleteSolutionException(f"Incomplete Solution of size {operation_2d_array.shape[0]}. "
                                               f"Should be {data.total_number_of_tasks}")
 
-        self.machine_makespans = compute_machine_makespans(operation_2d_array,
-                                                           data.task_processing_times_matrix,
-                                                           data.sequence_dependency_matrix,
-                                                           data.job_task_index_matrix)
-        self.makespan = max(self.machine_makespans)
+        if machine_makespans is None:
+            machine_makespans = np.empty(data.total_number_of_machines, dtype=np.float64)
+            makespan = _get_makespan_workspace(data).compute_makespan(operation_2d_array, machine_makespans)
+            if makespan == INFEASIBLE_MAKESPAN:
+                raise InfeasibleSolutionException()
+        else:
+            makespan = float(np.max(machine_makespans))
+
+        if operation_hash is None:
+            operation_hash = compute_operation_hash(operation_2d_array)
+
+        self.machine_makespans = machine_makespans
+        self.makespan = makespan
         self.operation_2d_array = operation_2d_array
+        self.operation_hash = int(operation_hash)
+        self.comparison_key = _get_comparison_key(makespan, machine_makespans)
         self.data = data
+        self._makespan_checkpoints = None
 
     def __eq__(self, other_solution):
-        return np.array_equal(self.operation_2d_array, other_solution.operation_2d_array)
+        # the arrays are only compared if the hashes collide
+        return self.operation_hash == other_solution.operation_hash \
+               and np.array_equal(self.operation_2d_array, other_solution.operation_2d_array)
+
+    def __hash__(self):
+        return self.operation_hash
 
     def __ne__(self, other_solution):
         return not self == other_solution
@@ -80,23 +179,10 @@ class Solution:
         :rtype: bool
         :returns: true if self is "better" than other_solution
         """
-        if self.makespan < other_solution.makespan:
-            return True
-        elif self.makespan > other_solution.makespan:
-            return False
-        else:
-            self_machine_makespans_sorted = sorted(list(self.machine_makespans), reverse=True)
-            other_machine_makespans_sorted = sorted(list(other_solution.machine_makespans), reverse=True)
-            for i in range(len(self_machine_makespans_sorted)):
-                if self_machine_makespans_sorted[i] < other_machine_makespans_sorted[i]:
-                    return True
-                elif self_machine_makespans_sorted[i] > other_machine_makespans_sorted[i]:
-                    return False
-
-        return False
+        return self.comparison_key < other_solution.comparison_key
 
     def __le__(self, other_solution):
-        return not self > other_solution
+        return self.comparison_key <= other_solution.comparison_key
 
     def __gt__(self, other_solution):
         """
@@ -109,23 +195,10 @@ class Solution:
         :rtype: bool
         :returns: true if self is "worse" than other_solution
         """
-        if self.makespan > other_solution.makespan:
-            return True
-        elif self.makespan < other_solution.makespan:
-            return False
-        else:
-            self_machine_makespans_sorted = sorted(list(self.machine_makespans), reverse=True)
-            other_machine_makespans_sorted = sorted(list(other_solution.machine_makespans), reverse=True)
-            for i in range(len(self_machine_makespans_sorted)):
-                if self_machine_makespans_sorted[i] > other_machine_makespans_sorted[i]:
-                    return True
-                elif self_machine_makespans_sorted[i] < other_machine_makespans_sorted[i]:
-                    return False
-
-        return False
+        return self.comparison_key > other_solution.comparison_key
 
     def __ge__(self, other_solution):
-        return not self < other_solution
+        return self.comparison_key >= other_solution.comparison_key
 
     def __str__(self):
         return f"makespan = {self.makespan}\n" \
@@ -138,13 +211,37 @@ class Solution:
         return {'operation_2d_array': self.operation_2d_array,
                 'machine_makespans': self.machine_makespans,
                 'makespan': self.makespan,
+                'operation_hash': self.operation_hash,
                 'data': self.data}
 
     def __setstate__(self, state):
         self.operation_2d_array = state['operation_2d_array']
         self.machine_makespans = state['machine_makespans']
         self.makespan = state['makespan']
+        self.operation_hash = state.get('operation_hash')
+        if self.operation_hash is None:
+            # solutions pickled before the operation hashes were added
+            self.operation_hash = compute_operation_hash(self.operation_2d_array)
+        self.comparison_key = _get_comparison_key(self.makespan, self.machine_makespans)
         self.data = state['data']
+        self._makespan_checkpoints = None
+
+    def get_makespan_checkpoints(self):
+        """
+        Gets the MakespanCheckpoints of this Solution, creating them on the first call.
+
+        The checkpoints are used to compute the machine makespans of neighbors of this Solution
+        without replaying the operations that the neighbors have in common with it.
+
+        :rtype: MakespanCheckpoints
+        :returns: makespan checkpoints of this Solution's operation_2d_array
+        """
+        if self._makespan_checkpoints is None:
+            self._makespan_checkpoints = MakespanCheckpoints(self.operation_2d_array,
+                                                             self.data.task_processing_times_matrix,
+                                                             self.data.sequence_dependency_matrix,
+                                                             self.data.job_task_index_matrix)
+        return self._makespan_checkpoints
 
     def create_schedule_xlsx_file(self, output_path, start_date=datetime.date.today(), start_time=datetime.time(hour=8, minute=0),
                                   end_time=datetime.time(hour=20, minute=0), continuous=False):
@@ -229,6 +326,48 @@ class Solution:
                            end_time=end_time, iplot_bool=False, auto_open=auto_open,
                            continuous=continuous)
 
+    def get_operation_times(self, start_date=datetime.date.today(), start_time=datetime.time(hour=8),
+                            end_time=datetime.time(hour=20), continuous=False):
+        """
+        Gets the schedule of every operation of this Solution as a structured nparray.
+
+        The nparray has one element per row of operation_2d_array with the fields
+        job_id, task_id, machine, wait, setup, runtime (in minutes),
+        and setup_start, setup_end, runtime_end (as datetime64[us]).
+
+        :type start_date: datetime.date
+        :param start_date: date to start the schedule from
+
+        :type start_time: datetime.time
+        :param start_time: start time of the work day
+
+        :type end_time: datetime.time
+        :param end_time: end time of the work day
+
+        :type continuous: bool
+        :param continuous: if true a continuous schedule is created. (i.e. start_time and end_time are not used)
+
+        :rtype: nparray
+        :returns: structured 1d nparray of the operations' times
+        """
+        start_time = start_time.replace(microsecond=0)
+        operation_times = compute_operation_times(self.operation_2d_array,
+                                                  self.data.task_processing_times_matrix,
+                                                  self.data.sequence_dependency_matrix,
+                                                  self.data.job_task_index_matrix,
+                                                  day_start=_minutes_after_midnight(start_time),
+                                                  day_end=_minutes_after_midnight(end_time),
+                                                  continuous=continuous)
+
+        start_datetime = np.datetime64(datetime.datetime.combine(start_date, start_time), 'us')
+        result = np.empty(operation_times.shape[0], dtype=_SCHEDULE_DTYPE)
+        for field in ('job_id', 'task_id', 'machine', 'wait', 'setup', 'runtime'):
+            result[field] = operation_times[field]
+        result['setup_start'] = start_datetime + _minutes_to_timedelta64(operation_times['start'])
+        result['setup_end'] = result['setup_start'] + _minutes_to_timedelta64(operation_times['setup'])
+        result['runtime_end'] = result['setup_end'] + _minutes_to_timedelta64(operation_times['runtime'])
+        return result
+
     def get_operation_list_for_machine(self, start_date=datetime.date.today(), start_time=datetime.time(hour=8),
                                        end_time=datetime.time(hour=20), continuous=False, machines=None):
         """
@@ -252,77 +391,15 @@ class Solution:
         :rtype: [Operation]
         :returns: list of Operations
         """
-        result = []
-        num_jobs = self.data.total_number_of_jobs
-        num_machines = self.data.total_number_of_machines
-        start_datetime = datetime.datetime(year=start_date.year, month=start_date.month, day=start_date.day,
-                                           hour=start_time.hour, minute=start_time.minute, second=start_time.second)
-        machine_datetime_dict = {machine_id: start_datetime for machine_id in range(num_machines)}
-
-        # memory for keeping track of all machine's make span times
-        machine_makespan_memory = [0] * num_machines
-
-        # memory for keeping track of all machine's latest (job, task) that was processed
-        machine_jobs_memory = [(-1, -1)] * num_machines
-
-        # memory for keeping track of all job's latest task's sequence that was processed
-        job_seq_memory = [0] * num_jobs
-
-        # memory for keeping track of all job's previous sequence end time (used for calculating wait times)
-        prev_job_seq_end_memory = [0] * num_jobs
-
-        # memory for keeping track of all job's latest end time (used for updating prev_job_seq_end_memory)
-        job_end_memory = [0] * num_jobs
-
-        for row in range(self.operation_2d_array.shape[0]):
-
-            job_id = self.operation_2d_array[row, 0]
-            task_id = self.operation_2d_array[row, 1]
-            sequence = self.operation_2d_array[row, 2]
-            machine = self.operation_2d_array[row, 3]
-
-            setup = self.data.get_setup_time(job_id, task_id, machine_jobs_memory[machine][0], machine_jobs_memory[machine][1])
-
-            if job_seq_memory[job_id] < sequence:
-                prev_job_seq_end_memory[job_id] = job_end_memory[job_id]
-
-            if prev_job_seq_end_memory[job_id] <= machine_makespan_memory[machine]:
-                wait = 0
-            else:
-                wait = prev_job_seq_end_memory[job_id] - machine_makespan_memory[machine]
-
-            runtime = self.data.get_runtime(job_id, task_id, machine)
-
-            tmp_dt = machine_datetime_dict[machine] + datetime.timedelta(minutes=wait)
-            if not continuous and (tmp_dt.time() > end_time or tmp_dt.day != machine_datetime_dict[machine].day):
-                machine_datetime_dict[machine] += datetime.timedelta(days=1)
-                machine_datetime_dict[machine].replace(hour=start_time.hour, minute=start_time.minute,
-                                                       second=start_time.second)
-            else:
-                machine_datetime_dict[machine] += datetime.timedelta(minutes=wait)
-
-            tmp_dt = machine_datetime_dict[machine] + datetime.timedelta(minutes=setup + runtime)
-            if not continuous and (tmp_dt.time() > end_time or tmp_dt.day != machine_datetime_dict[machine].day):
-                machine_datetime_dict[machine] += datetime.timedelta(days=1)
-                machine_datetime_dict[machine].replace(hour=start_time.hour, minute=start_time.minute,
-                                                       second=start_time.second)
-                setup = 0
-
-            if machines is None or machine in machines:
-                result.append(Operation(job_id,
-                                        task_id,
-                                        machine,
-                                        float(wait),
-                                        float(setup),
-                                        float(runtime),
-                                        machine_datetime_dict[machine]))  # start time
-
-            machine_datetime_dict[machine] += datetime.timedelta(minutes=setup + runtime)
-
-            # compute total added time and update memory modules
-            machine_makespan_memory[machine] += runtime + wait + setup
-            job_end_memory[job_id] = max(machine_makespan_memory[machine], job_end_memory[job_id])
-            job_seq_memory[job_id] = sequence
-            machine_jobs_memory[machine] = (job_id, task_id)
-
-        return result
+        operation_times = self.get_operation_times(start_date, start_time, end_time, continuous=continuous)
+        if machines is not None:
+            operation_times = operation_times[np.isin(operation_times['machine'], list(machines))]
+
+        return [Operation(int(operation['job_id']),
+                          int(operation['task_id']),
+                          int(operation['machine']),
+                          float(operation['wait']),
+                          float(operation['setup']),
+                          float(operation['runtime']),
+                          operation['setup_start'].item())  # start time
+                for operation in operation_times]
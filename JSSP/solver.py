@@ -1,14 +1,24 @@
+import asyncio
 import datetime
 import multiprocessing as mp
-import pickle
 import time
+from operator import attrgetter
+from pathlib import Path
 
+import numpy as np
 from progressbar import Bar, ETA, ProgressBar, RotatingMarker
 
 from . import benchmark_plotter
+from . import checkpoint
 from . import genetic_algorithm
 from . import tabu_search
+from .data import loads_without_data
 from .solution import SolutionFactory, Solution
+from .util import get_process_context
+
+# checkpoint files of the agents in a checkpoint directory
+_TS_CHECKPOINT_FILE = 'ts_agent_{}.npz'
+_GA_CHECKPOINT_FILE = 'ga_agent.npz'
 
 
 def _run_progress_bar(seconds):
@@ -29,6 +39,69 @@ def _run_progress_bar(seconds):
     pbar.finish()
 
 
+def _get_stopping_condition(runtime, iterations):
+    """
+    Gets the stopping condition of an optimization function from either a runtime or a number of iterations.
+
+    :type runtime: float | datetime.timedelta
+    :param runtime: either the number of seconds or timedelta to run for, or None
+
+    :type iterations: int
+    :param iterations: number of iterations to run for, or None
+
+    :rtype: (float, bool)
+    :returns: the stopping condition and true if it is a time condition
+
+    :raise: UserWarning if not exactly one of runtime and iterations is None
+    """
+    if (runtime is None) == (iterations is None):
+        raise UserWarning("Exactly one of runtime and iterations must be given.")
+
+    if iterations is not None:
+        return iterations, False
+
+    if isinstance(runtime, datetime.timedelta):
+        return runtime.total_seconds(), True
+
+    return runtime, True
+
+
+def _exhaust(generator):
+    """
+    Runs a generator until it is exhausted.
+
+    :type generator: generator
+    :param generator: generator to run
+
+    :returns: None
+    """
+    for _ in generator:
+        pass
+
+
+class SearchImprovement:
+    """
+    New best solution found by an optimization function that is ran with one of the iterator functions of Solver.
+
+    :type solution: Solution
+    :param solution: the new best solution
+
+    :type elapsed_time: float
+    :param elapsed_time: number of seconds since the optimization function started
+
+    :type iteration: int
+    :param iteration: iteration (or generation) the solution was found in, or None if it is not known
+
+    :type worker_id: int
+    :param worker_id: process id of the tabu search process that found the solution, or None
+    """
+    def __init__(self, solution, elapsed_time, iteration, worker_id=None):
+        self.solution = solution
+        self.elapsed_time = elapsed_time
+        self.iteration = iteration
+        self.worker_id = worker_id
+
+
 class Solver:
     """
     The main solver class which calls tabu search and/or the genetic algorithm.
@@ -44,19 +117,52 @@ class Solver:
         self.data = data
         self.solution = None
         self.ts_agent_list = None
+        self.ts_cooperative = False
         self.ga_agent = None
         self.solution_factory = SolutionFactory(data)
+        self.worker_pool = None
+
+    def start_worker_pool(self, num_workers=4):
+        """
+        Starts a pool of tabu search worker processes that the tabu search functions of this Solver run on
+        until close_worker_pool is called, instead of starting new processes for every call.
+
+        The workers keep the instance data, so only the parameters and initial solutions are sent to them for each call.
+        The num_processes parameter of the tabu search functions must not exceed num_workers while the pool is used.
+
+        :type num_workers: int
+        :param num_workers: number of worker processes
+
+        :returns: None
+        """
+        self.close_worker_pool()
+        self.worker_pool = tabu_search.TabuSearchWorkerPool(self.data, num_workers)
+
+    def close_worker_pool(self):
+        """
+        Stops the worker processes started by start_worker_pool, if any.
+
+        :returns: None
+        """
+        if self.worker_pool is not None:
+            self.worker_pool.close()
+            self.worker_pool = None
 
     def tabu_search_time(self, runtime, num_solutions_per_process=1, num_processes=4, tabu_list_size=50,
                          neighborhood_size=300, neighborhood_wait=0.1, probability_change_machine=0.8,
-                         reset_threshold=100, initial_solutions=None, benchmark=False, verbose=False, progress_bar=False):
+                         reset_threshold=100, initial_solutions=None, benchmark=False, verbose=False, progress_bar=False,
+                         screening_tolerance=None, neighborhood_enum=tabu_search.TSNeighborhoodEnum.RANDOM,
+                         attribute_tabu=False, num_threads=1, cooperative=False, early_stopping=None,
+                         checkpoint_dir=None, checkpoint_interval=60, path_relinking=False,
+                         benchmark_stride=1, benchmark_max_samples=10000):
         """
         Performs parallel tabu search for a certain number of seconds.
 
         First the function generates random initial solutions if the initial_solutions parameter is None,
         then it forks/spawns num_processes of child processes to run tabu search in parallel.
 
-        The parent process waits for the child processes to finish, then collects their results and updates self.solution.
+        While the child processes run, the parent process receives the improvements they find and keeps self.solution
+        set to the best solution found so far. When the child processes finish it collects their results.
 
         :type runtime: float | datetime.timedelta
         :param runtime: either the number of seconds or timedelta that tabu search should run for
@@ -74,7 +180,7 @@ class Solver:
         :param neighborhood_size: size of neighborhoods to generate during tabu search
 
         :type neighborhood_wait: float
-        :param neighborhood_wait: maximum time to wait while generating a neighborhood in seconds
+        :param neighborhood_wait: not used, neighborhoods are generated in a single batch (kept for backwards compatibility)
 
         :type probability_change_machine: float
         :param probability_change_machine: probability of changing a chosen operations machine, must be in range [0, 1]
@@ -94,6 +200,39 @@ class Solver:
         :type progress_bar: bool
         :param progress_bar: if true a progress bar is spawned
 
+        :type screening_tolerance: float
+        :param screening_tolerance: if not None, neighbors with a makespan greater than (1 + screening_tolerance) times the seed solution's makespan are discarded without being fully evaluated
+
+        :type neighborhood_enum: TSNeighborhoodEnum
+        :param neighborhood_enum: how neighborhoods are generated. Options are TSNeighborhoodEnum.RANDOM, TSNeighborhoodEnum.CRITICAL_PATH
+
+        :type attribute_tabu: bool
+        :param attribute_tabu: if true the tabu lists hold the attributes of the last moves instead of whole solutions, and tabu moves are allowed if they improve the best makespan found
+
+        :type num_threads: int
+        :param num_threads: number of threads each tabu search process evaluates its neighborhoods with, only used if the extensions were compiled with OpenMP
+
+        :type cooperative: bool
+        :param cooperative: if true the processes share their best solutions in an elite pool and continue from a solution in the pool when they stop improving, instead of forcing a move to a worse solution
+
+        :type early_stopping: EarlyStopping
+        :param early_stopping: criteria for stopping all the processes before the runtime or iterations are used up (e.g. a target makespan), or None
+
+        :type path_relinking: bool
+        :param path_relinking: if true the processes relink their seed solutions with their best solutions (or the elite pool's) when they stop improving, and continue from the best solution on the path
+
+        :type checkpoint_dir: Path | str
+        :param checkpoint_dir: if not None, the state of each process is written to this directory every checkpoint_interval seconds, so that the run can be continued with Solver.resume if it is interrupted
+
+        :type checkpoint_interval: float
+        :param checkpoint_interval: number of seconds between checkpoints
+
+        :type benchmark_stride: int
+        :param benchmark_stride: number of iterations between the samples of the benchmark traces (see JSSP.util.TraceRecorder)
+
+        :type benchmark_max_samples: int
+        :param benchmark_max_samples: maximum number of samples each benchmark trace keeps, longer runs are downsampled
+
         :rtype: Solution
         :returns: best solution found
         """
@@ -107,18 +246,29 @@ class Solver:
                                  neighborhood_size=neighborhood_size, neighborhood_wait=neighborhood_wait,
                                  probability_change_machine=probability_change_machine,
                                  reset_threshold=reset_threshold, initial_solutions=initial_solutions,
-                                 benchmark=benchmark, verbose=verbose, progress_bar=progress_bar)
+                                 benchmark=benchmark, verbose=verbose, progress_bar=progress_bar,
+                                 screening_tolerance=screening_tolerance, neighborhood_enum=neighborhood_enum,
+                                 attribute_tabu=attribute_tabu, num_threads=num_threads,
+                                 cooperative=cooperative, early_stopping=early_stopping,
+                                 checkpoint_dir=checkpoint_dir, checkpoint_interval=checkpoint_interval,
+                                 path_relinking=path_relinking,
+                                 benchmark_stride=benchmark_stride, benchmark_max_samples=benchmark_max_samples)
 
     def tabu_search_iter(self, iterations, num_solutions_per_process=1, num_processes=4, tabu_list_size=50,
                          neighborhood_size=300, neighborhood_wait=0.1, probability_change_machine=0.8,
-                         reset_threshold=100, initial_solutions=None, benchmark=False, verbose=False):
+                         reset_threshold=100, initial_solutions=None, benchmark=False, verbose=False,
+                         screening_tolerance=None, neighborhood_enum=tabu_search.TSNeighborhoodEnum.RANDOM,
+                         attribute_tabu=False, num_threads=1, cooperative=False, early_stopping=None,
+                         checkpoint_dir=None, checkpoint_interval=60, path_relinking=False,
+                         benchmark_stride=1, benchmark_max_samples=10000):
         """
         Performs parallel tabu search for a certain number of iterations.
 
         First the function generates random initial solutions if the initial_solutions parameter is None,
         then it forks a number of child processes to run tabu search.
 
-        The parent process waits for the child processes to finish, then collects their results and updates self.solution.
+        While the child processes run, the parent process receives the improvements they find and keeps self.solution
+        set to the best solution found so far. When the child processes finish it collects their results.
 
         :type iterations: int
         :param iterations: number of iterations for each tabu search to go through
@@ -136,7 +286,7 @@ class Solver:
         :param neighborhood_size: size of neighborhoods to generate during tabu search
 
         :type neighborhood_wait: float
-        :param neighborhood_wait: maximum time to wait while generating a neighborhood in seconds
+        :param neighborhood_wait: not used, neighborhoods are generated in a single batch (kept for backwards compatibility)
 
         :type probability_change_machine: float
         :param probability_change_machine: probability of changing a chosen operations machine, must be in range [0, 1]
@@ -153,6 +303,39 @@ class Solver:
         :type verbose: bool
         :param verbose: if true runs in verbose mode
 
+        :type screening_tolerance: float
+        :param screening_tolerance: if not None, neighbors with a makespan greater than (1 + screening_tolerance) times the seed solution's makespan are discarded without being fully evaluated
+
+        :type neighborhood_enum: TSNeighborhoodEnum
+        :param neighborhood_enum: how neighborhoods are generated. Options are TSNeighborhoodEnum.RANDOM, TSNeighborhoodEnum.CRITICAL_PATH
+
+        :type attribute_tabu: bool
+        :param attribute_tabu: if true the tabu lists hold the attributes of the last moves instead of whole solutions, and tabu moves are allowed if they improve the best makespan found
+
+        :type num_threads: int
+        :param num_threads: number of threads each tabu search process evaluates its neighborhoods with, only used if the extensions were compiled with OpenMP
+
+        :type cooperative: bool
+        :param cooperative: if true the processes share their best solutions in an elite pool and continue from a solution in the pool when they stop improving, instead of forcing a move to a worse solution
+
+        :type early_stopping: EarlyStopping
+        :param early_stopping: criteria for stopping all the processes before the runtime or iterations are used up (e.g. a target makespan), or None
+
+        :type path_relinking: bool
+        :param path_relinking: if true the processes relink their seed solutions with their best solutions (or the elite pool's) when they stop improving, and continue from the best solution on the path
+
+        :type checkpoint_dir: Path | str
+        :param checkpoint_dir: if not None, the state of each process is written to this directory every checkpoint_interval seconds, so that the run can be continued with Solver.resume if it is interrupted
+
+        :type checkpoint_interval: float
+        :param checkpoint_interval: number of seconds between checkpoints
+
+        :type benchmark_stride: int
+        :param benchmark_stride: number of iterations between the samples of the benchmark traces (see JSSP.util.TraceRecorder)
+
+        :type benchmark_max_samples: int
+        :param benchmark_max_samples: maximum number of samples each benchmark trace keeps, longer runs are downsampled
+
         :rtype: Solution
         :returns: best solution found
         """
@@ -161,18 +344,331 @@ class Solver:
                                  neighborhood_size=neighborhood_size, neighborhood_wait=neighborhood_wait,
                                  probability_change_machine=probability_change_machine,
                                  reset_threshold=reset_threshold, initial_solutions=initial_solutions,
-                                 benchmark=benchmark, verbose=verbose, progress_bar=False)
+                                 benchmark=benchmark, verbose=verbose, progress_bar=False,
+                                 screening_tolerance=screening_tolerance, neighborhood_enum=neighborhood_enum,
+                                 attribute_tabu=attribute_tabu, num_threads=num_threads,
+                                 cooperative=cooperative, early_stopping=early_stopping,
+                                 checkpoint_dir=checkpoint_dir, checkpoint_interval=checkpoint_interval,
+                                 path_relinking=path_relinking,
+                                 benchmark_stride=benchmark_stride, benchmark_max_samples=benchmark_max_samples)
+
+    def iter_tabu_search(self, runtime=None, iterations=None, num_solutions_per_process=1, num_processes=4,
+                         tabu_list_size=50, neighborhood_size=300, neighborhood_wait=0.1, probability_change_machine=0.8,
+                         reset_threshold=100, initial_solutions=None, benchmark=False, verbose=False,
+                         screening_tolerance=None, neighborhood_enum=tabu_search.TSNeighborhoodEnum.RANDOM,
+                         attribute_tabu=False, num_threads=1, cooperative=False, early_stopping=None,
+                         path_relinking=False, benchmark_stride=1, benchmark_max_samples=10000):
+        """
+        Performs parallel tabu search for a certain number of seconds or iterations,
+        and generates the best solutions as they are found while the search continues.
+
+        The best initial solution is generated first and self.solution is always set to the best solution found so far.
+        If the consumer stops iterating (e.g. breaks out of a for loop), the tabu search processes are terminated.
+
+        :type runtime: float | datetime.timedelta
+        :param runtime: either the number of seconds or timedelta to run tabu search for, or None if iterations is given
+
+        :type iterations: int
+        :param iterations: number of iterations to run each tabu search process for, or None if runtime is given
+
+        :type num_solutions_per_process: int
+        :param num_solutions_per_process: number of solutions that one tabu search process should gather
+
+        :type num_processes: int
+        :param num_processes: number of processes to run tabu search in parallel
+
+        :type tabu_list_size: int
+        :param tabu_list_size: size of the tabu list
+
+        :type neighborhood_size: int
+        :param neighborhood_size: size of neighborhoods to generate during tabu search
+
+        :type neighborhood_wait: float
+        :param neighborhood_wait: not used, neighborhoods are generated in a single batch (kept for backwards compatibility)
+
+        :type probability_change_machine: float
+        :param probability_change_machine: probability of changing a chosen operations machine, must be in range [0, 1]
+
+        :type reset_threshold: int
+        :param reset_threshold: number of iterations to potentially force a worse move after if the best solution is not improved
+
+        :type initial_solutions: [Solution]
+        :param initial_solutions: initial solutions to start the tabu searches from
+
+        :type benchmark: bool
+        :param benchmark: if true benchmark data is gathered (e.g. # of iterations, makespans, etc.)
+
+        :type verbose: bool
+        :param verbose: if true runs in verbose mode
+
+        :type screening_tolerance: float
+        :param screening_tolerance: if not None, neighbors with a makespan greater than (1 + screening_tolerance) times the seed solution's makespan are discarded without being fully evaluated
+
+        :type neighborhood_enum: TSNeighborhoodEnum
+        :param neighborhood_enum: how neighborhoods are generated. Options are TSNeighborhoodEnum.RANDOM, TSNeighborhoodEnum.CRITICAL_PATH
+
+        :type attribute_tabu: bool
+        :param attribute_tabu: if true the tabu lists hold the attributes of the last moves instead of whole solutions, and tabu moves are allowed if they improve the best makespan found
+
+        :type num_threads: int
+        :param num_threads: number of threads each tabu search process evaluates its neighborhoods with, only used if the extensions were compiled with OpenMP
+
+        :type cooperative: bool
+        :param cooperative: if true the processes share their best solutions in an elite pool and continue from a solution in the pool when they stop improving, instead of forcing a move to a worse solution
+
+        :type early_stopping: EarlyStopping
+        :param early_stopping: criteria for stopping all the processes before the runtime or iterations are used up (e.g. a target makespan), or None
+
+        :type path_relinking: bool
+        :param path_relinking: if true the processes relink their seed solutions with their best solutions (or the elite pool's) when they stop improving, and continue from the best solution on the path
+
+        :type benchmark_stride: int
+        :param benchmark_stride: number of iterations between the samples of the benchmark traces (see JSSP.util.TraceRecorder)
+
+        :type benchmark_max_samples: int
+        :param benchmark_max_samples: maximum number of samples each benchmark trace keeps, longer runs are downsampled
+
+        :rtype: generator
+        :returns: generator of SearchImprovement, one for each new best solution
+
+        :raise: UserWarning if not exactly one of runtime and iterations is given
+        """
+        stopping_condition, time_condition = _get_stopping_condition(runtime, iterations)
+        return self._iter_tabu_search(stopping_condition, time_condition,
+                                      num_solutions_per_process=num_solutions_per_process,
+                                      num_processes=num_processes, tabu_list_size=tabu_list_size,
+                                      neighborhood_size=neighborhood_size, neighborhood_wait=neighborhood_wait,
+                                      probability_change_machine=probability_change_machine,
+                                      reset_threshold=reset_threshold, initial_solutions=initial_solutions,
+                                      benchmark=benchmark, verbose=verbose, progress_bar=False,
+                                      screening_tolerance=screening_tolerance, neighborhood_enum=neighborhood_enum,
+                                      attribute_tabu=attribute_tabu, num_threads=num_threads,
+                                      cooperative=cooperative, early_stopping=early_stopping,
+                                      path_relinking=path_relinking,
+                                      benchmark_stride=benchmark_stride, benchmark_max_samples=benchmark_max_samples)
+
+    async def tabu_search_async(self, runtime=None, iterations=None, num_solutions_per_process=1, num_processes=4,
+                                tabu_list_size=50, neighborhood_size=300, neighborhood_wait=0.1,
+                                probability_change_machine=0.8, reset_threshold=100, initial_solutions=None,
+                                benchmark=False, verbose=False, screening_tolerance=None,
+                                neighborhood_enum=tabu_search.TSNeighborhoodEnum.RANDOM, attribute_tabu=False,
+                                num_threads=1, cooperative=False, early_stopping=None, path_relinking=False,
+                                benchmark_stride=1, benchmark_max_samples=10000):
+        """
+        Performs parallel tabu search for a certain number of seconds or iterations without blocking the event loop.
+
+        The child processes are started from the calling thread and their results are received in a thread of the
+        event loop's default executor, while self.solution is kept set to the best solution found so far.
+        If the task running this coroutine is cancelled, the child processes are terminated and
+        the best solution found so far is returned.
+
+        :type runtime: float | datetime.timedelta
+        :param runtime: either the number of seconds or timedelta to run tabu search for, or None if iterations is given
+
+        :type iterations: int
+        :param iterations: number of iterations to run each tabu search process for, or None if runtime is given
+
+        :type num_solutions_per_process: int
+        :param num_solutions_per_process: number of solutions that one tabu search process should gather
+
+        :type num_processes: int
+        :param num_processes: number of processes to run tabu search in parallel
+
+        :type tabu_list_size: int
+        :param tabu_list_size: size of the tabu list
+
+        :type neighborhood_size: int
+        :param neighborhood_size: size of neighborhoods to generate during tabu search
+
+        :type neighborhood_wait: float
+        :param neighborhood_wait: not used, neighborhoods are generated in a single batch (kept for backwards compatibility)
+
+        :type probability_change_machine: float
+        :param probability_change_machine: probability of changing a chosen operations machine, must be in range [0, 1]
+
+        :type reset_threshold: int
+        :param reset_threshold: number of iterations to potentially force a worse move after if the best solution is not improved
+
+        :type initial_solutions: [Solution]
+        :param initial_solutions: initial solutions to start the tabu searches from
+
+        :type benchmark: bool
+        :param benchmark: if true benchmark data is gathered (e.g. # of iterations, makespans, etc.)
+
+        :type verbose: bool
+        :param verbose: if true runs in verbose mode
+
+        :type screening_tolerance: float
+        :param screening_tolerance: if not None, neighbors with a makespan greater than (1 + screening_tolerance) times the seed solution's makespan are discarded without being fully evaluated
+
+        :type neighborhood_enum: TSNeighborhoodEnum
+        :param neighborhood_enum: how neighborhoods are generated. Options are TSNeighborhoodEnum.RANDOM, TSNeighborhoodEnum.CRITICAL_PATH
+
+        :type attribute_tabu: bool
+        :param attribute_tabu: if true the tabu lists hold the attributes of the last moves instead of whole solutions, and tabu moves are allowed if they improve the best makespan found
+
+        :type num_threads: int
+        :param num_threads: number of threads each tabu search process evaluates its neighborhoods with, only used if the extensions were compiled with OpenMP
+
+        :type cooperative: bool
+        :param cooperative: if true the processes share their best solutions in an elite pool and continue from a solution in the pool when they stop improving, instead of forcing a move to a worse solution
+
+        :type early_stopping: EarlyStopping
+        :param early_stopping: criteria for stopping all the processes before the runtime or iterations are used up (e.g. a target makespan), or None
+
+        :type path_relinking: bool
+        :param path_relinking: if true the processes relink their seed solutions with their best solutions (or the elite pool's) when they stop improving, and continue from the best solution on the path
+
+        :type benchmark_stride: int
+        :param benchmark_stride: number of iterations between the samples of the benchmark traces (see JSSP.util.TraceRecorder)
+
+        :type benchmark_max_samples: int
+        :param benchmark_max_samples: maximum number of samples each benchmark trace keeps, longer runs are downsampled
+
+        :rtype: Solution
+        :returns: best solution found
+
+        :raise: UserWarning if not exactly one of runtime and iterations is given
+        """
+        stopping_condition, time_condition = _get_stopping_condition(runtime, iterations)
+        child_results_queue = get_process_context(num_threads).Queue()
+        improvements = self._iter_tabu_search(stopping_condition, time_condition,
+                                              num_solutions_per_process=num_solutions_per_process,
+                                              num_processes=num_processes, tabu_list_size=tabu_list_size,
+                                              neighborhood_size=neighborhood_size,
+                                              neighborhood_wait=neighborhood_wait,
+                                              probability_change_machine=probability_change_machine,
+                                              reset_threshold=reset_threshold, initial_solutions=initial_solutions,
+                                              benchmark=benchmark, verbose=verbose, progress_bar=False,
+                                              screening_tolerance=screening_tolerance,
+                                              neighborhood_enum=neighborhood_enum, attribute_tabu=attribute_tabu,
+                                              num_threads=num_threads, cooperative=cooperative,
+                                              early_stopping=early_stopping, child_results_queue=child_results_queue,
+                                              path_relinking=path_relinking,
+                                              benchmark_stride=benchmark_stride,
+                                              benchmark_max_samples=benchmark_max_samples)
+
+        # start the child processes from this thread, then wait for them in the background
+        next(improvements)
+        results_future = asyncio.get_running_loop().run_in_executor(None, _exhaust, improvements)
+        try:
+            await asyncio.shield(results_future)
+        except asyncio.CancelledError:
+            if self.worker_pool is not None:
+                # the agents stop at their next iteration and the thread waiting for results receives them
+                self.worker_pool.early_stopping.stop()
+            else:
+                # wake up the thread waiting for results, which terminates the child processes
+                child_results_queue.put(None)
+            await results_future
+
+        return self.solution
+
+    def continue_tabu_search(self, runtime=None, iterations=None, cooperative=None, verbose=False,
+                             early_stopping=None):
+        """
+        Continues the agents of the last tabu search of this Solver for a certain number of seconds or iterations.
+
+        The agents continue from their seed solutions with their tabu lists, best solutions and random states,
+        instead of starting over from initial solutions, and with the parameters of the last tabu search.
+        If a worker pool is started (see start_worker_pool), the agents continue on its processes.
+        If benchmark data was gathered, the continued agents gather it from iteration 0 again,
+        and it replaces the benchmark data of the last tabu search.
+
+        :type runtime: float | datetime.timedelta
+        :param runtime: either the number of seconds or timedelta to continue tabu search for, or None if iterations is given
+
+        :type iterations: int
+        :param iterations: number of iterations to continue tabu search for, or None if runtime is given
+
+        :type cooperative: bool
+        :param cooperative: if true the processes share their best solutions in an elite pool and continue from a solution in the pool when they stop improving, instead of forcing a move to a worse solution, if None the processes are cooperative if they were in the last tabu search
+
+        :type verbose: bool
+        :param verbose: if true runs in verbose mode
+
+        :type early_stopping: EarlyStopping
+        :param early_stopping: criteria for stopping all the processes before the runtime or iterations are used up (e.g. a target makespan), or None
+
+        :rtype: Solution
+        :returns: best solution found
+
+        :raise: UserWarning if the last tabu search did not finish, or if not exactly one of runtime and iterations is given
+        """
+        if not self.ts_agent_list or any(ts_agent.search_state is None for ts_agent in self.ts_agent_list):
+            raise UserWarning("There is no finished tabu search to continue.")
+
+        stopping_condition, time_condition = _get_stopping_condition(runtime, iterations)
+        if cooperative is None:
+            cooperative = self.ts_cooperative
+
+        # the runtime and iterations of the continued agents start over
+        ts_agents = self.ts_agent_list
+        resume_states = [dict(ts_agent.search_state, iterations=np.array(0), elapsed_time=np.array(0.0))
+                         for ts_agent in ts_agents]
+        ts_agent = ts_agents[0]
+        return self._tabu_search(stopping_condition, time_condition,
+                                 num_solutions_per_process=ts_agent.num_solutions_to_find,
+                                 num_processes=len(ts_agents), tabu_list_size=ts_agent.tabu_list_size,
+                                 neighborhood_size=ts_agent.neighborhood_size,
+                                 neighborhood_wait=ts_agent.neighborhood_wait,
+                                 probability_change_machine=ts_agent.probability_change_machine,
+                                 reset_threshold=ts_agent.reset_threshold,
+                                 initial_solutions=[ts_agent.initial_solution for ts_agent in ts_agents],
+                                 benchmark=ts_agent.benchmark, verbose=verbose, progress_bar=False,
+                                 screening_tolerance=ts_agent.screening_tolerance,
+                                 neighborhood_enum=ts_agent.neighborhood_enum, attribute_tabu=ts_agent.attribute_tabu,
+                                 num_threads=ts_agent.num_threads, cooperative=cooperative,
+                                 early_stopping=early_stopping, resume_states=resume_states,
+                                 path_relinking=ts_agent.path_relinking, benchmark_stride=ts_agent.benchmark_stride,
+                                 benchmark_max_samples=ts_agent.benchmark_max_samples)
 
     def _tabu_search(self, stopping_condition, time_condition, num_solutions_per_process, num_processes, tabu_list_size,
                      neighborhood_size, neighborhood_wait, probability_change_machine, reset_threshold,
-                     initial_solutions, benchmark, verbose, progress_bar):
+                     initial_solutions, benchmark, verbose, progress_bar, screening_tolerance=None,
+                     neighborhood_enum=tabu_search.TSNeighborhoodEnum.RANDOM, attribute_tabu=False,
+                     num_threads=1, cooperative=False, early_stopping=None, checkpoint_dir=None,
+                     checkpoint_interval=60, resume_states=None, path_relinking=False,
+                     benchmark_stride=1, benchmark_max_samples=10000):
         """
         Performs parallel tabu search until the stopping condition is met.
 
+        See help(Solver._iter_tabu_search)
+
+        :rtype: Solution
+        :returns: best solution found
+        """
+        for _ in self._iter_tabu_search(stopping_condition, time_condition, num_solutions_per_process, num_processes,
+                                        tabu_list_size, neighborhood_size, neighborhood_wait,
+                                        probability_change_machine, reset_threshold, initial_solutions, benchmark,
+                                        verbose, progress_bar, screening_tolerance=screening_tolerance,
+                                        neighborhood_enum=neighborhood_enum, attribute_tabu=attribute_tabu,
+                                        num_threads=num_threads, cooperative=cooperative,
+                                        early_stopping=early_stopping, checkpoint_dir=checkpoint_dir,
+                                        checkpoint_interval=checkpoint_interval, resume_states=resume_states,
+                                        path_relinking=path_relinking,
+                                        benchmark_stride=benchmark_stride, benchmark_max_samples=benchmark_max_samples):
+            pass
+
+        return self.solution
+
+    def _iter_tabu_search(self, stopping_condition, time_condition, num_solutions_per_process, num_processes,
+                          tabu_list_size, neighborhood_size, neighborhood_wait, probability_change_machine,
+                          reset_threshold, initial_solutions, benchmark, verbose, progress_bar,
+                          screening_tolerance=None, neighborhood_enum=tabu_search.TSNeighborhoodEnum.RANDOM,
+                          attribute_tabu=False, num_threads=1, cooperative=False, early_stopping=None,
+                          child_results_queue=None, checkpoint_dir=None, checkpoint_interval=60,
+                          resume_states=None, path_relinking=False, benchmark_stride=1, benchmark_max_samples=10000):
+        """
+        Performs parallel tabu search until the stopping condition is met and generates the best solutions as they are found.
+
         First the function generates random initial solutions if the initial_solutions parameter is None,
         then it forks a number of child processes to run tabu search.
 
-        The parent process waits for the child processes to finish, then collects their results and updates self.solution.
+        While the child processes run, the parent process receives the improvements they find and keeps self.solution
+        set to the best solution found so far. When the child processes finish it collects their results.
+        If the generator is closed before the child processes finish, or None is put into child_results_queue,
+        the child processes are terminated and self.ts_agent_list only holds the results of the processes that finished.
 
         :type stopping_condition: float
         :param stopping_condition: either the duration in seconds or the number of iterations to search
@@ -193,7 +689,7 @@ class Solver:
         :param neighborhood_size: size of neighborhoods to generate during tabu search
 
         :type neighborhood_wait: float
-        :param neighborhood_wait: maximum time to wait while generating a neighborhood in seconds
+        :param neighborhood_wait: not used, neighborhoods are generated in a single batch (kept for backwards compatibility)
 
         :type probability_change_machine: float
         :param probability_change_machine: probability of changing a chosen operations machine, must be in range [0, 1]
@@ -213,8 +709,47 @@ class Solver:
         :type progress_bar: bool
         :param progress_bar: if true a progress bar is spawned
 
-        :rtype: Solution
-        :returns: best solution found
+        :type screening_tolerance: float
+        :param screening_tolerance: if not None, neighbors with a makespan greater than (1 + screening_tolerance) times the seed solution's makespan are discarded without being fully evaluated
+
+        :type neighborhood_enum: TSNeighborhoodEnum
+        :param neighborhood_enum: how neighborhoods are generated. Options are TSNeighborhoodEnum.RANDOM, TSNeighborhoodEnum.CRITICAL_PATH
+
+        :type attribute_tabu: bool
+        :param attribute_tabu: if true the tabu lists hold the attributes of the last moves instead of whole solutions, and tabu moves are allowed if they improve the best makespan found
+
+        :type num_threads: int
+        :param num_threads: number of threads each tabu search process evaluates its neighborhoods with, only used if the extensions were compiled with OpenMP
+
+        :type cooperative: bool
+        :param cooperative: if true the processes share their best solutions in an elite pool and continue from a solution in the pool when they stop improving, instead of forcing a move to a worse solution
+
+        :type early_stopping: EarlyStopping
+        :param early_stopping: criteria for stopping all the processes before the runtime or iterations are used up (e.g. a target makespan), or None
+
+        :type path_relinking: bool
+        :param path_relinking: if true the processes relink their seed solutions with their best solutions (or the elite pool's) when they stop improving, and continue from the best solution on the path
+
+        :type child_results_queue: multiprocessing.Queue
+        :param child_results_queue: queue the child processes push their results to, or None to create a new one
+
+        :type checkpoint_dir: Path | str
+        :param checkpoint_dir: if not None, the state of each process is written to this directory every checkpoint_interval seconds, so that the run can be continued with Solver.resume if it is interrupted
+
+        :type checkpoint_interval: float
+        :param checkpoint_interval: number of seconds between checkpoints
+
+        :type resume_states: [dict]
+        :param resume_states: if not None, the state that each process continues from instead of its initial solution (see TabuSearchAgent), or None for the processes that start from their initial solutions
+
+        :type benchmark_stride: int
+        :param benchmark_stride: number of iterations between the samples of the benchmark traces (see JSSP.util.TraceRecorder)
+
+        :type benchmark_max_samples: int
+        :param benchmark_max_samples: maximum number of samples each benchmark trace keeps, longer runs are downsampled
+
+        :rtype: generator
+        :returns: generator of SearchImprovement, one for each new best solution starting with the best initial solution
         """
         if initial_solutions is None:
             initial_solutions = [self.solution_factory.get_solution() for _ in range(num_processes)]
@@ -222,18 +757,59 @@ class Solver:
             initial_solutions += [self.solution_factory.get_solution() for _ in
                                   range(max(0, num_processes - len(initial_solutions)))]
 
-        ts_agent_list = [tabu_search.TabuSearchAgent(stopping_condition,
-                                                     time_condition,
-                                                     initial_solution,
-                                                     num_solutions_per_process,
-                                                     tabu_list_size,
-                                                     neighborhood_size,
-                                                     neighborhood_wait,
-                                                     probability_change_machine,
-                                                     reset_threshold,
-                                                     benchmark)
-                         for initial_solution in initial_solutions
-                         ]
+        agent_parameters = {'stopping_condition': stopping_condition,
+                            'time_condition': time_condition,
+                            'num_solutions_to_find': num_solutions_per_process,
+                            'tabu_list_size': tabu_list_size,
+                            'neighborhood_size': neighborhood_size,
+                            'neighborhood_wait': neighborhood_wait,
+                            'probability_change_machine': probability_change_machine,
+                            'reset_threshold': reset_threshold,
+                            'benchmark': benchmark,
+                            'screening_tolerance': screening_tolerance,
+                            'neighborhood_enum': neighborhood_enum,
+                            'attribute_tabu': attribute_tabu,
+                            'num_threads': num_threads,
+                            'path_relinking': path_relinking,
+                            'benchmark_stride': benchmark_stride,
+                            'benchmark_max_samples': benchmark_max_samples}
+
+        # the agents' parameters only differ in their checkpoint files and the states they resume from
+        if resume_states is None:
+            agents_parameters = [agent_parameters] * len(initial_solutions)
+            resumed_solutions = []
+        else:
+            agents_parameters = [dict(agent_parameters, resume_state=resume_state) for resume_state in resume_states]
+            resumed_solutions = [Solution(self.data, operation_2d_array) for state in resume_states
+                                 if state is not None for operation_2d_array in state['best_solutions']]
+
+        if checkpoint_dir is not None:
+            checkpoint_files = [Path(checkpoint_dir) / _TS_CHECKPOINT_FILE.format(i)
+                                for i in range(len(initial_solutions))]
+            if resume_states is None:
+                self._write_checkpoint_manifest(checkpoint_dir, 'tabu_search', stopping_condition, time_condition,
+                                                initial_solutions, checkpoint_files,
+                                                {'num_solutions_per_process': num_solutions_per_process,
+                                                 'num_processes': num_processes,
+                                                 'tabu_list_size': tabu_list_size,
+                                                 'neighborhood_size': neighborhood_size,
+                                                 'neighborhood_wait': neighborhood_wait,
+                                                 'probability_change_machine': probability_change_machine,
+                                                 'reset_threshold': reset_threshold,
+                                                 'benchmark': benchmark,
+                                                 'screening_tolerance': screening_tolerance,
+                                                 'neighborhood_enum': neighborhood_enum.value,
+                                                 'attribute_tabu': attribute_tabu,
+                                                 'num_threads': num_threads,
+                                                 'cooperative': cooperative,
+                                                 'checkpoint_interval': checkpoint_interval,
+                                                 'path_relinking': path_relinking,
+                                                 'benchmark_stride': benchmark_stride,
+                                                 'benchmark_max_samples': benchmark_max_samples})
+
+            agents_parameters = [dict(parameters, checkpoint_file=checkpoint_file,
+                                      checkpoint_interval=checkpoint_interval)
+                                 for parameters, checkpoint_file in zip(agents_parameters, checkpoint_files)]
 
         if verbose:
             if benchmark:
@@ -250,43 +826,116 @@ class Solver:
             print("neighborhood_wait =", neighborhood_wait)
             print("probability_change_machine =", probability_change_machine)
             print("reset_threshold =", reset_threshold)
+            print("screening_tolerance =", screening_tolerance)
+            print("neighborhood =", neighborhood_enum.name)
+            print("attribute_tabu =", attribute_tabu)
+            print("num_threads =", num_threads)
+            print("cooperative =", cooperative)
+            print("path_relinking =", path_relinking)
             print()
             print("Initial Solution's makespans:")
             print([round(x.makespan) for x in initial_solutions])
             print()
 
-        # create child processes to run tabu search
-        child_results_queue = mp.Queue()
-        processes = [
-            mp.Process(target=ts_agent.start, args=[child_results_queue])
-            for ts_agent in ts_agent_list
-        ]
+        if early_stopping is not None:
+            early_stopping.reset()
+        start_time = time.time()
 
-        # start child processes
-        for p in processes:
-            p.start()
-            if verbose:
-                print(f"child TS process started. pid = {p.pid}")
+        processes = []
+        shares_data = False
+        if self.worker_pool is not None:
+            # run the agents on the worker pool's processes which push their results to the pool's queue
+            self.worker_pool.run(initial_solutions, agents_parameters, cooperative, early_stopping)
+            child_results_queue = self.worker_pool.results_queue
+        else:
+            # create child processes to run tabu search, which are not forked if they use several threads
+            # in cooperative mode they share an elite pool that holds as many solutions as there are processes
+            context = get_process_context(num_threads)
+            if child_results_queue is None:
+                child_results_queue = context.Queue()
+            elite_pool = tabu_search.ElitePool(self.data, len(initial_solutions), context) if cooperative else None
+
+            # the child processes are started with the instance data, so it is bound before their agents are created
+            # child processes that are not forked attach to its matrices in shared memory for the duration of the run
+            data = self.data
+            if context.get_start_method() != 'fork':
+                shares_data = not self.data.is_shared()
+                if shares_data:
+                    self.data.share_memory()
+                data = self.data.get_shared_reference()
+            processes = [
+                context.Process(target=tabu_search.worker_pool._run_agent,
+                                args=[data, parameters, initial_solution.operation_2d_array,
+                                      int(np.random.randint(0, 2 ** 63, dtype=np.int64)), child_results_queue,
+                                      elite_pool, early_stopping])
+                for initial_solution, parameters in zip(initial_solutions, agents_parameters)
+            ]
+
+            # start child processes
+            for p in processes:
+                p.start()
+                if verbose:
+                    print(f"child TS process started. pid = {p.pid}")
 
         # start progress bar
         if progress_bar and time_condition:
             mp.Process(target=_run_progress_bar, args=[stopping_condition]).start()
 
-        # collect results from Queue and wait for child processes to finish
+        # keep self.solution up to date with the improvements the child processes find until they all finish
+        self.solution = min(initial_solutions + resumed_solutions, key=attrgetter('comparison_key'))
         self.ts_agent_list = []
-        for p in processes:
-            self.ts_agent_list.append(pickle.loads(child_results_queue.get()))
-
-            if verbose:
-                print(f"child TS process finished. pid = {p.pid}")
-
-        self.solution = min([ts_agent.best_solution for ts_agent in self.ts_agent_list])
-        return self.solution
+        self.ts_cooperative = cooperative
+        try:
+            yield SearchImprovement(self.solution, 0.0, 0)
+
+            while len(self.ts_agent_list) < len(initial_solutions):
+                result = child_results_queue.get()
+                if result is None:  # the search was stopped early
+                    break
+                elif isinstance(result, tabu_search.TSImprovementEvent):
+                    if result.makespan < self.solution.makespan:
+                        self.solution = result.get_solution(self.data)
+                        if verbose:
+                            print(f"child TS process {result.worker_id} improved makespan to {round(result.makespan)} "
+                                  f"at iteration {result.iteration}")
+                        yield SearchImprovement(self.solution, result.timestamp - start_time, result.iteration,
+                                                result.worker_id)
+                else:
+                    ts_agent = loads_without_data(result)
+                    self.ts_agent_list.append(ts_agent)
+                    if verbose:
+                        print(f"child TS process finished. best makespan = {round(ts_agent.best_solution.makespan)}")
+        finally:
+            # stop the agents that are still running if the generator was closed early,
+            # the worker pool's processes are kept for the next call
+            if len(self.ts_agent_list) < len(initial_solutions):
+                if self.worker_pool is not None:
+                    self.worker_pool.stop(len(initial_solutions) - len(self.ts_agent_list))
+                for p in processes:
+                    p.terminate()
+            for p in processes:
+                p.join()
+            if shares_data:
+                self.data.release_shared_memory()
+
+        # the worker pool's agents updated the pool's copy of the early stopping criteria
+        if self.worker_pool is not None and early_stopping is not None:
+            early_stopping.copy_state(self.worker_pool.early_stopping)
+
+        if len(self.ts_agent_list) < len(initial_solutions):
+            return
+
+        # the agents' best solutions can only differ from the improvements in their machine makespans
+        best_solution = min((ts_agent.best_solution for ts_agent in self.ts_agent_list), key=attrgetter('comparison_key'))
+        if best_solution < self.solution:
+            self.solution = best_solution
+            yield SearchImprovement(self.solution, time.time() - start_time, None)
 
     def genetic_algorithm_time(self, runtime, population=None, population_size=200,
                                selection_method_enum=genetic_algorithm.GASelectionEnum.TOURNAMENT,
                                mutation_probability=0.8, selection_size=10, benchmark=False, verbose=False,
-                               progress_bar=False):
+                               progress_bar=False, early_stopping=None, checkpoint_dir=None, checkpoint_interval=60,
+                               benchmark_stride=1, benchmark_max_samples=10000):
         """
         Performs the genetic algorithm for a certain number of seconds.
 
@@ -320,6 +969,21 @@ class Solver:
         :type progress_bar: bool
         :param progress_bar: if true a progress bar is spawned
 
+        :type early_stopping: EarlyStopping
+        :param early_stopping: criteria for stopping the GA before the runtime or generations are used up (e.g. a target makespan), or None
+
+        :type checkpoint_dir: Path | str
+        :param checkpoint_dir: if not None, the state of the GA is written to this directory every checkpoint_interval seconds, so that the run can be continued with Solver.resume if it is interrupted
+
+        :type checkpoint_interval: float
+        :param checkpoint_interval: number of seconds between checkpoints
+
+        :type benchmark_stride: int
+        :param benchmark_stride: number of generations between the samples of the benchmark trace (see JSSP.util.TraceRecorder)
+
+        :type benchmark_max_samples: int
+        :param benchmark_max_samples: maximum number of samples the benchmark trace keeps, longer runs are downsampled
+
         :rtype: Solution
         :returns: best solution found
         """
@@ -331,12 +995,16 @@ class Solver:
                                        population_size=population_size, selection_method_enum=selection_method_enum,
                                        mutation_probability=mutation_probability,
                                        selection_size=selection_size, benchmark=benchmark, verbose=verbose,
-                                       progress_bar=progress_bar)
+                                       progress_bar=progress_bar, early_stopping=early_stopping,
+                                       checkpoint_dir=checkpoint_dir, checkpoint_interval=checkpoint_interval,
+                                       benchmark_stride=benchmark_stride, benchmark_max_samples=benchmark_max_samples)
 
     def genetic_algorithm_iter(self, iterations, population=None, population_size=200,
                                selection_method_enum=genetic_algorithm.GASelectionEnum.TOURNAMENT,
                                mutation_probability=0.8,
-                               selection_size=10, benchmark=False, verbose=False):
+                               selection_size=10, benchmark=False, verbose=False, early_stopping=None,
+                               checkpoint_dir=None, checkpoint_interval=60,
+                               benchmark_stride=1, benchmark_max_samples=10000):
         """
         Performs the genetic algorithm for a certain number of generations.
 
@@ -367,6 +1035,21 @@ class Solver:
         :type verbose: bool
         :param verbose: if true runs in verbose mode
 
+        :type early_stopping: EarlyStopping
+        :param early_stopping: criteria for stopping the GA before the runtime or generations are used up (e.g. a target makespan), or None
+
+        :type checkpoint_dir: Path | str
+        :param checkpoint_dir: if not None, the state of the GA is written to this directory every checkpoint_interval seconds, so that the run can be continued with Solver.resume if it is interrupted
+
+        :type checkpoint_interval: float
+        :param checkpoint_interval: number of seconds between checkpoints
+
+        :type benchmark_stride: int
+        :param benchmark_stride: number of generations between the samples of the benchmark trace (see JSSP.util.TraceRecorder)
+
+        :type benchmark_max_samples: int
+        :param benchmark_max_samples: maximum number of samples the benchmark trace keeps, longer runs are downsampled
+
         :rtype: Solution
         :returns: best solution found
         """
@@ -374,14 +1057,149 @@ class Solver:
                                        population_size=population_size, selection_method_enum=selection_method_enum,
                                        mutation_probability=mutation_probability,
                                        selection_size=selection_size, benchmark=benchmark, verbose=verbose,
-                                       progress_bar=False)
+                                       progress_bar=False, early_stopping=early_stopping,
+                                       checkpoint_dir=checkpoint_dir, checkpoint_interval=checkpoint_interval,
+                                       benchmark_stride=benchmark_stride, benchmark_max_samples=benchmark_max_samples)
+
+    def iter_genetic_algorithm(self, runtime=None, iterations=None, population=None, population_size=200,
+                               selection_method_enum=genetic_algorithm.GASelectionEnum.TOURNAMENT,
+                               mutation_probability=0.8, selection_size=10, benchmark=False, verbose=False,
+                               early_stopping=None, benchmark_stride=1, benchmark_max_samples=10000):
+        """
+        Performs the genetic algorithm for a certain number of seconds or generations,
+        and generates the best solutions as they are found while the genetic algorithm continues.
+
+        The best solution of the initial population is generated first and self.solution is always set to the best solution found so far.
+        If the consumer stops iterating (e.g. breaks out of a for loop), the genetic algorithm stops.
+
+        :type runtime: float | datetime.timedelta
+        :param runtime: either the number of seconds or timedelta to run the GA for, or None if iterations is given
+
+        :type iterations: int
+        :param iterations: number of generations to go through during the GA, or None if runtime is given
+
+        :type population: [Solution]
+        :param population: list of Solutions to start the GA from
+
+        :type population_size: int
+        :param population_size: size of the initial population
+
+        :type selection_method_enum: GASelectionEnum
+        :param selection_method_enum: selection method to use for selecting parents from the population. Options are GASelectionEnum.TOURNAMENT, GASelectionEnum.FITNESS_PROPORTIONATE, GASelectionEnum.RANDOM
+
+        :type mutation_probability: float
+        :param mutation_probability: probability of mutating a chromosome (i.e change an operation's machine), must be in range [0, 1]
+
+        :type selection_size: int
+        :param selection_size: size of the selection group for tournament style selection
+
+        :type benchmark: bool
+        :param benchmark: if true benchmark data is gathered (i.e. # of iterations, makespans, min makespan iteration)
+
+        :type verbose: bool
+        :param verbose: if true runs in verbose mode
+
+        :type early_stopping: EarlyStopping
+        :param early_stopping: criteria for stopping the GA before the runtime or generations are used up (e.g. a target makespan), or None
+
+        :type benchmark_stride: int
+        :param benchmark_stride: number of generations between the samples of the benchmark trace (see JSSP.util.TraceRecorder)
+
+        :type benchmark_max_samples: int
+        :param benchmark_max_samples: maximum number of samples the benchmark trace keeps, longer runs are downsampled
+
+        :rtype: generator
+        :returns: generator of SearchImprovement, one for each new best solution
+
+        :raise: UserWarning if not exactly one of runtime and iterations is given
+        """
+        stopping_condition, time_condition = _get_stopping_condition(runtime, iterations)
+        return self._iter_genetic_algorithm(stopping_condition, time_condition, population=population,
+                                            population_size=population_size,
+                                            selection_method_enum=selection_method_enum,
+                                            mutation_probability=mutation_probability,
+                                            selection_size=selection_size, benchmark=benchmark, verbose=verbose,
+                                            progress_bar=False, early_stopping=early_stopping,
+                                            benchmark_stride=benchmark_stride,
+                                            benchmark_max_samples=benchmark_max_samples)
+
+    def continue_genetic_algorithm(self, runtime=None, iterations=None, verbose=False, early_stopping=None):
+        """
+        Continues the last genetic algorithm of this Solver for a certain number of seconds or generations.
+
+        The genetic algorithm continues from its last population and random states with the parameters of the last run,
+        instead of starting over from a new population.
+
+        :type runtime: float | datetime.timedelta
+        :param runtime: either the number of seconds or timedelta to continue the GA for, or None if iterations is given
+
+        :type iterations: int
+        :param iterations: number of generations to continue the GA for, or None if runtime is given
+
+        :type verbose: bool
+        :param verbose: if true runs in verbose mode
+
+        :type early_stopping: EarlyStopping
+        :param early_stopping: criteria for stopping the GA before the runtime or generations are used up (e.g. a target makespan), or None
+
+        :rtype: Solution
+        :returns: best solution found
+
+        :raise: UserWarning if the last genetic algorithm did not finish, or if not exactly one of runtime and iterations is given
+        """
+        if self.ga_agent is None or self.ga_agent.search_state is None:
+            raise UserWarning("There is no finished genetic algorithm to continue.")
+
+        stopping_condition, time_condition = _get_stopping_condition(runtime, iterations)
+
+        # the runtime and generations of the continued GA start over
+        ga_agent = self.ga_agent
+        return self._genetic_algorithm(stopping_condition, time_condition, population=ga_agent.initial_population,
+                                       population_size=ga_agent.population_size,
+                                       selection_method_enum=ga_agent.selection_method,
+                                       mutation_probability=ga_agent.mutation_probability,
+                                       selection_size=ga_agent.selection_size, benchmark=ga_agent.benchmark,
+                                       verbose=verbose, progress_bar=False, early_stopping=early_stopping,
+                                       resume_state=dict(ga_agent.search_state, iterations=np.array(0),
+                                                         elapsed_time=np.array(0.0)),
+                                       benchmark_stride=ga_agent.benchmark_stride,
+                                       benchmark_max_samples=ga_agent.benchmark_max_samples)
 
     def _genetic_algorithm(self, stopping_condition, time_condition, population=None, population_size=200,
                            selection_method_enum=genetic_algorithm.GASelectionEnum.TOURNAMENT, mutation_probability=0.8,
-                           selection_size=5, benchmark=False, verbose=False, progress_bar=False):
+                           selection_size=5, benchmark=False, verbose=False, progress_bar=False,
+                           early_stopping=None, checkpoint_dir=None, checkpoint_interval=60, resume_state=None,
+                           benchmark_stride=1, benchmark_max_samples=10000):
         """
         Performs the genetic algorithm until the stopping condition is met.
 
+        See help(Solver._iter_genetic_algorithm)
+
+        :rtype: Solution
+        :returns: best solution found
+        """
+        for _ in self._iter_genetic_algorithm(stopping_condition, time_condition, population=population,
+                                              population_size=population_size,
+                                              selection_method_enum=selection_method_enum,
+                                              mutation_probability=mutation_probability,
+                                              selection_size=selection_size, benchmark=benchmark, verbose=verbose,
+                                              progress_bar=progress_bar, early_stopping=early_stopping,
+                                              checkpoint_dir=checkpoint_dir, checkpoint_interval=checkpoint_interval,
+                                              resume_state=resume_state,
+                                              benchmark_stride=benchmark_stride,
+                                              benchmark_max_samples=benchmark_max_samples):
+            pass
+
+        return self.solution
+
+    def _iter_genetic_algorithm(self, stopping_condition, time_condition, population=None, population_size=200,
+                                selection_method_enum=genetic_algorithm.GASelectionEnum.TOURNAMENT,
+                                mutation_probability=0.8, selection_size=5, benchmark=False, verbose=False,
+                                progress_bar=False, early_stopping=None, checkpoint_dir=None, checkpoint_interval=60,
+                                resume_state=None, benchmark_stride=1, benchmark_max_samples=10000):
+        """
+        Performs the genetic algorithm until the stopping condition is met and generates the best solutions as they are found.
+
         First this function generates a random initial population if the population parameter is None,
         then it runs GA with the parameters specified and updates self.solution.
 
@@ -415,21 +1233,59 @@ class Solver:
         :type progress_bar: bool
         :param progress_bar: if true a progress bar is spawned
 
-        :rtype: Solution
-        :returns: best solution found
+        :type early_stopping: EarlyStopping
+        :param early_stopping: criteria for stopping the GA before the runtime or generations are used up (e.g. a target makespan), or None
+
+        :type checkpoint_dir: Path | str
+        :param checkpoint_dir: if not None, the state of the GA is written to this directory every checkpoint_interval seconds, so that the run can be continued with Solver.resume if it is interrupted
+
+        :type checkpoint_interval: float
+        :param checkpoint_interval: number of seconds between checkpoints
+
+        :type resume_state: dict
+        :param resume_state: if not None, the state that the GA continues from instead of the population (see GeneticAlgorithmAgent)
+
+        :type benchmark_stride: int
+        :param benchmark_stride: number of generations between the samples of the benchmark trace (see JSSP.util.TraceRecorder)
+
+        :type benchmark_max_samples: int
+        :param benchmark_max_samples: maximum number of samples the benchmark trace keeps, longer runs are downsampled
+
+        :rtype: generator
+        :returns: generator of SearchImprovement, one for each new best solution starting with the best initial solution
         """
         if population is None:
             population = [self.solution_factory.get_solution() for _ in range(population_size)]
         else:
             population = population[:] + [self.solution_factory.get_solution() for _ in range(max(0, population_size - len(population)))]
 
+        checkpoint_file = None
+        if checkpoint_dir is not None:
+            checkpoint_file = Path(checkpoint_dir) / _GA_CHECKPOINT_FILE
+            if resume_state is None:
+                self._write_checkpoint_manifest(checkpoint_dir, 'genetic_algorithm', stopping_condition,
+                                                time_condition, population, [checkpoint_file],
+                                                {'population_size': population_size,
+                                                 'selection_method_enum': selection_method_enum.__name__,
+                                                 'mutation_probability': mutation_probability,
+                                                 'selection_size': selection_size,
+                                                 'benchmark': benchmark,
+                                                 'checkpoint_interval': checkpoint_interval,
+                                                 'benchmark_stride': benchmark_stride,
+                                                 'benchmark_max_samples': benchmark_max_samples})
+
         self.ga_agent = genetic_algorithm.GeneticAlgorithmAgent(stopping_condition,
                                                                 population,
                                                                 time_condition,
                                                                 selection_method_enum,
                                                                 mutation_probability,
                                                                 selection_size,
-                                                                benchmark
+                                                                benchmark,
+                                                                checkpoint_file=checkpoint_file,
+                                                                checkpoint_interval=checkpoint_interval,
+                                                                resume_state=resume_state,
+                                                                benchmark_stride=benchmark_stride,
+                                                                benchmark_max_samples=benchmark_max_samples
                                                                 )
 
         if verbose:
@@ -449,9 +1305,162 @@ class Solver:
         if progress_bar and time_condition:
             mp.Process(target=_run_progress_bar, args=[stopping_condition]).start()
 
-        self.solution = self.ga_agent.start()
+        if early_stopping is not None:
+            early_stopping.reset()
+        start_time = time.time()
+        for iteration, solution in self.ga_agent.iter_start(early_stopping):
+            self.solution = solution
+            yield SearchImprovement(solution, time.time() - start_time, iteration)
+
+    def resume(self, checkpoint_dir, verbose=False, early_stopping=None):
+        """
+        Continues a tabu search or genetic algorithm run that was started with a checkpoint_dir from its last checkpoints.
+
+        The run continues with the same parameters for the rest of its runtime or iterations, and keeps writing checkpoints.
+        Processes that did not write a checkpoint yet start over from their initial solutions.
+        In a cooperative tabu search the processes publish the elite solutions of their checkpoints to the new elite pool.
+        If benchmark data is gathered, it only covers the resumed part of the run.
+
+        :type checkpoint_dir: Path | str
+        :param checkpoint_dir: checkpoint directory of the run
+
+        :type verbose: bool
+        :param verbose: if true runs in verbose mode
+
+        :type early_stopping: EarlyStopping
+        :param early_stopping: criteria for stopping the run before the runtime or iterations are used up, or None
+
+        :rtype: Solution
+        :returns: best solution found
+
+        :raise: UserWarning if checkpoint_dir is not a checkpoint directory of this Solver's data
+        """
+        manifest = checkpoint.read_manifest(checkpoint_dir)
+        if manifest['data_fingerprint'] != self.data.get_fingerprint():
+            raise UserWarning(f"The checkpoints in {checkpoint_dir} are not of this Solver's data.")
+
+        initial_solutions = [Solution(self.data, operation_2d_array) for operation_2d_array in
+                             checkpoint.load_state(Path(checkpoint_dir) / checkpoint.INITIAL_SOLUTIONS_FILE)['operations']]
+        parameters = manifest['parameters']
+
+        if manifest['algorithm'] == 'tabu_search':
+            checkpoint_files = [Path(checkpoint_dir) / _TS_CHECKPOINT_FILE.format(i)
+                                for i in range(len(initial_solutions))]
+            resume_states = [checkpoint.load_state(checkpoint_file) if checkpoint_file.exists() else None
+                             for checkpoint_file in checkpoint_files]
+            parameters['neighborhood_enum'] = tabu_search.TSNeighborhoodEnum(parameters['neighborhood_enum'])
+            return self._tabu_search(manifest['stopping_condition'], manifest['time_condition'],
+                                     initial_solutions=initial_solutions, verbose=verbose, progress_bar=False,
+                                     early_stopping=early_stopping, checkpoint_dir=checkpoint_dir,
+                                     resume_states=resume_states, **parameters)
+
+        checkpoint_file = Path(checkpoint_dir) / _GA_CHECKPOINT_FILE
+        resume_state = checkpoint.load_state(checkpoint_file) if checkpoint_file.exists() else None
+
+        parameters['selection_method_enum'] = {method.__name__: method for method in
+                                               (genetic_algorithm.GASelectionEnum.TOURNAMENT,
+                                                genetic_algorithm.GASelectionEnum.FITNESS_PROPORTIONATE,
+                                                genetic_algorithm.GASelectionEnum.RANDOM)
+                                               }[parameters['selection_method_enum']]
+        return self._genetic_algorithm(manifest['stopping_condition'], manifest['time_condition'],
+                                       population=initial_solutions, verbose=verbose, progress_bar=False,
+                                       early_stopping=early_stopping, checkpoint_dir=checkpoint_dir,
+                                       resume_state=resume_state, **parameters)
+
+    def path_relinking(self, solutions=None, num_solutions=10, num_threads=1):
+        """
+        Relinks pairs of elite solutions and keeps the best solution found on the paths between them.
+
+        For every ordered pair of solutions, the moves that take the first solution closer to the second one are
+        evaluated with the batched makespan kernel, and the best of them is made until the second solution is reached
+        (see JSSP.tabu_search.path_relinking.relink).
+        self.solution is replaced if a better solution is found.
+
+        :type solutions: [Solution]
+        :param solutions: solutions to relink, or None to relink the best solutions of the last tabu search and genetic algorithm
+
+        :type num_solutions: int
+        :param num_solutions: number of distinct best solutions to relink if solutions is None
+
+        :type num_threads: int
+        :param num_threads: number of threads to evaluate the moves with in this process, only used if the extensions were compiled with OpenMP (tabu search processes that use several threads are not forked from a process that did, see JSSP.util.get_process_context)
+
+        :rtype: Solution
+        :returns: best solution found
+
+        :raise: UserWarning if there are less than two distinct solutions to relink
+        """
+        if solutions is None:
+            solutions = [] if self.solution is None else [self.solution]
+            if self.ts_agent_list:
+                solutions += [solution for ts_agent in self.ts_agent_list for solution in ts_agent.all_solutions]
+            if self.ga_agent is not None:
+                solutions += self.ga_agent.result_population
+
+            # keep the best distinct solutions
+            elite_solutions = []
+            for solution in sorted(solutions, key=attrgetter('comparison_key')):
+                if len(elite_solutions) == num_solutions:
+                    break
+                if solution not in elite_solutions:
+                    elite_solutions.append(solution)
+            solutions = elite_solutions
+
+        if len(solutions) < 2 or all(solution == solutions[0] for solution in solutions):
+            raise UserWarning("Path relinking needs at least two distinct solutions.")
+
+        relinked_solution = tabu_search.path_relinking(solutions, num_threads)
+        best_solution = min(solutions, key=attrgetter('comparison_key'))
+        if relinked_solution is not None and relinked_solution < best_solution:
+            best_solution = relinked_solution
+        if self.solution is None or best_solution < self.solution:
+            self.solution = best_solution
+
         return self.solution
 
+    def _write_checkpoint_manifest(self, checkpoint_dir, algorithm, stopping_condition, time_condition,
+                                   initial_solutions, checkpoint_files, parameters):
+        """
+        Writes the manifest and initial solutions of a run to its checkpoint directory,
+        and removes the agents' checkpoints of a previous run in the directory.
+
+        :type checkpoint_dir: Path | str
+        :param checkpoint_dir: checkpoint directory of the run
+
+        :type algorithm: str
+        :param algorithm: 'tabu_search' or 'genetic_algorithm'
+
+        :type stopping_condition: float
+        :param stopping_condition: either the duration in seconds or the number of iterations of the run
+
+        :type time_condition: bool
+        :param time_condition: if true stopping_condition is a duration
+
+        :type initial_solutions: [Solution]
+        :param initial_solutions: initial solutions or population of the run
+
+        :type checkpoint_files: [Path]
+        :param checkpoint_files: checkpoint files of the agents of the run
+
+        :type parameters: dict
+        :param parameters: JSON serializable keyword arguments of Solver._tabu_search or Solver._genetic_algorithm
+
+        :returns: None
+        """
+        Path(checkpoint_dir).mkdir(parents=True, exist_ok=True)
+        for checkpoint_file in checkpoint_files:
+            checkpoint.remove_checkpoint(checkpoint_file)
+
+        checkpoint.save_state(Path(checkpoint_dir) / checkpoint.INITIAL_SOLUTIONS_FILE,
+                              {'operations': np.stack([solution.operation_2d_array for solution in initial_solutions])})
+
+        # the manifest is written last, so a directory with a manifest always has the initial solutions
+        checkpoint.write_manifest(checkpoint_dir, {'algorithm': algorithm,
+                                                   'data_fingerprint': self.data.get_fingerprint(),
+                                                   'stopping_condition': stopping_condition,
+                                                   'time_condition': time_condition,
+                                                   'parameters': parameters})
+
     def output_benchmark_results(self, output_dir, title=None, auto_open=True):
         """
         Outputs html files containing benchmark results in the output directory specified.
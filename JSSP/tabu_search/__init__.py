@@ -1 +1,6 @@
 from .ts import TabuSearchAgent
+from .ts import TSNeighborhoodEnum
+from .ts import ElitePool
+from .ts import TSImprovementEvent
+from .worker_pool import TabuSearchWorkerPool
+from .path_relinking import relink, path_relinking
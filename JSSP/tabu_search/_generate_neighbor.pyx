@@ -1,7 +1,9 @@
 from ..solution import Solution
+from ..solution._makespan import compute_critical_path
 cimport cython
 import numpy as np
 cimport numpy as np
+from libc.stdint cimport uint64_t
 
 
 @cython.boundscheck(False)
@@ -26,51 +28,411 @@ cpdef generate_neighbor(solution, double probability_change_machine, int[:, ::1]
     :rtype: Solution
     :returns: neighbor of the solution parameter
     """
-    cdef int[:, ::1] result_operation_2d_array = np.copy(solution.operation_2d_array)
-    cdef int[::1] operation, usable_machines
-    cdef Py_ssize_t random_index, lower_index, upper_index, placement_index, min_machine_makespan, i
-    cdef int job_id, sequence
-    cdef double[::1] makespans
+    result_operation_2d_array, first_changed_row = generate_neighbor_array(solution, probability_change_machine,
+                                                                           dependency_matrix_index_encoding,
+                                                                           usable_machines_matrix)
+
+    # the neighbor only differs from the solution at or after first_changed_row,
+    # so its machine makespans are computed from the solution's closest checkpoint before that row
+    makespans = solution.get_makespan_checkpoints().compute_machine_makespans(result_operation_2d_array,
+                                                                              first_changed_row)
+
+    return Solution(solution.data, result_operation_2d_array, makespans)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+cpdef tuple generate_neighbor_array(solution, double probability_change_machine, int[:, ::1] dependency_matrix_index_encoding, int[:, ::1] usable_machines_matrix):
+    """
+    Generates the operation 2d array of a neighbor of the solution parameter without computing its makespans.
+
+    See help(generate_neighbor_move)
+
+    :type solution: Solution
+    :param solution: solution to generate a neighbor of
+    
+    :type probability_change_machine: float
+    :param probability_change_machine: probability of changing a chosen operation's machine in the neighbor
+    
+    :type dependency_matrix_index_encoding: nparray
+    :param dependency_matrix_index_encoding: dependency matrix index encoding from static Data
+    
+    :type usable_machines_matrix: nparray
+    :param usable_machines_matrix: usable machines matrix from static Data
+    
+    :rtype: (nparray, int)
+    :returns: operation 2d array of the neighbor and the index of the first row where it differs from the solution
+    """
+    random_index, placement_index, machine = generate_neighbor_move(solution, probability_change_machine,
+                                                                    dependency_matrix_index_encoding,
+                                                                    usable_machines_matrix)
+
+    # the neighbor only differs from the solution at or after the first of the removal and placement indices
+    return apply_move(solution.operation_2d_array, random_index, placement_index, machine), \
+           min(random_index, placement_index)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+cpdef tuple generate_neighbor_move(solution, double probability_change_machine, int[:, ::1] dependency_matrix_index_encoding, int[:, ::1] usable_machines_matrix):
+    """
+    Generates a move that turns the solution parameter into one of its neighbors, without copying its operations.
+
+    A random operation is removed and placed at a random index between the operations of the same job
+    with the previous and next sequence numbers, and its machine is randomly changed if the probability condition is met.
+
+    :type solution: Solution
+    :param solution: solution to generate a neighbor of
+    
+    :type probability_change_machine: float
+    :param probability_change_machine: probability of changing a chosen operation's machine in the neighbor
+    
+    :type dependency_matrix_index_encoding: nparray
+    :param dependency_matrix_index_encoding: dependency matrix index encoding from static Data
+    
+    :type usable_machines_matrix: nparray
+    :param usable_machines_matrix: usable machines matrix from static Data
+    
+    :rtype: (int, int, int)
+    :returns: the index of the operation to remove, the index to insert it at after it is removed,
+    and the machine to process it on
+    """
+    cdef int[:, ::1] operation_2d_array = solution.operation_2d_array
+    cdef Py_ssize_t random_index, lower_index, upper_index, placement_index, i
+    cdef int job_id, sequence, machine
     lower_index = 0
     upper_index = 0
 
     # this is to ensure we are not inserting the randomly removed operation into the same place
     while lower_index >= upper_index:
 
-        random_index = np.random.randint(0, result_operation_2d_array.shape[0])
-        operation = result_operation_2d_array[random_index]
-        job_id = operation[0]
-        sequence = operation[2]
+        random_index = np.random.randint(0, operation_2d_array.shape[0])
+        job_id = operation_2d_array[random_index, 0]
+        sequence = operation_2d_array[random_index, 2]
 
         # find a lower bound for possible placement of the operation
         lower_index = random_index - 1
         while lower_index >= 0 and not (
-                result_operation_2d_array[lower_index, 0] == job_id and result_operation_2d_array[lower_index, 2] == sequence - 1):
+                operation_2d_array[lower_index, 0] == job_id and operation_2d_array[lower_index, 2] == sequence - 1):
             lower_index -= 1
 
         lower_index = 0 if lower_index < 0 else lower_index + 1
 
         # find an upper bound for possible placement of the operation
         upper_index = random_index + 1
-        while upper_index < result_operation_2d_array.shape[0] and not (
-                result_operation_2d_array[upper_index, 0] == job_id and result_operation_2d_array[upper_index, 2] == sequence + 1):
+        while upper_index < operation_2d_array.shape[0] and not (
+                operation_2d_array[upper_index, 0] == job_id and operation_2d_array[upper_index, 2] == sequence + 1):
             upper_index += 1
 
-        if upper_index >= result_operation_2d_array.shape[0] - 1:
+        if upper_index >= operation_2d_array.shape[0] - 1:
             upper_index = upper_index - 2
         else:
             upper_index = upper_index - 1
 
-    result_operation_2d_array = np.delete(result_operation_2d_array, random_index, axis=0)
-
     # get a random placement index that is in between lower and upper index (bounds) and not equal to the random index
     placement_index = random_index
     while placement_index == random_index:
         placement_index = np.random.randint(lower_index, upper_index + 1)
 
     # randomly change operation's machine if probability condition is met
+    machine = operation_2d_array[random_index, 3]
     if np.random.random_sample() < probability_change_machine:
-        i = dependency_matrix_index_encoding[operation[0], operation[1]]
-        operation[3] = np.random.choice(usable_machines_matrix[i])
+        i = dependency_matrix_index_encoding[job_id, operation_2d_array[random_index, 1]]
+        machine = np.random.choice(usable_machines_matrix[i])
+
+    return random_index, placement_index, machine
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+cpdef np.ndarray apply_move(const int[:, ::1] operation_2d_array, Py_ssize_t from_index, Py_ssize_t to_index, int machine):
+    """
+    Builds the operation 2d array that results from a move with a single allocation.
+
+    The result is equal to removing the operation at from_index and inserting it at to_index on the given machine.
+
+    :type operation_2d_array: nparray
+    :param operation_2d_array: operation 2d array to apply the move to, it is not modified
+
+    :type from_index: int
+    :param from_index: index of the operation to move
+
+    :type to_index: int
+    :param to_index: index of the operation after the move
+
+    :type machine: int
+    :param machine: machine to process the moved operation on
+
+    :rtype: nparray
+    :returns: operation 2d array with the move applied
+    """
+    cdef np.ndarray result = np.empty((operation_2d_array.shape[0], operation_2d_array.shape[1]), dtype=np.intc)
+    cdef int[:, ::1] result_view = result
+
+    if from_index <= to_index:
+        result_view[:from_index] = operation_2d_array[:from_index]
+        result_view[from_index:to_index] = operation_2d_array[from_index + 1:to_index + 1]
+    else:
+        result_view[:to_index] = operation_2d_array[:to_index]
+        result_view[to_index + 1:from_index + 1] = operation_2d_array[to_index:from_index]
+
+    result_view[to_index] = operation_2d_array[from_index]
+    result_view[to_index, 3] = machine
+    result_view[max(from_index, to_index) + 1:] = operation_2d_array[max(from_index, to_index) + 1:]
+    return result
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+cdef inline bint _keeps_job_order(int[:, ::1] operation_2d_array, Py_ssize_t from_index, Py_ssize_t to_index):
+    """
+    Returns true if moving the operation at from_index to to_index does not move it past an operation
+    of the same job with a lower (when moving it earlier) or higher (when moving it later) sequence.
+    """
+    cdef Py_ssize_t row
+    cdef int job_id = operation_2d_array[from_index, 0]
+    cdef int sequence = operation_2d_array[from_index, 2]
+
+    if to_index < from_index:
+        for row in range(to_index, from_index):
+            if operation_2d_array[row, 0] == job_id and operation_2d_array[row, 2] < sequence:
+                return False
+    else:
+        for row in range(from_index + 1, to_index + 1):
+            if operation_2d_array[row, 0] == job_id and operation_2d_array[row, 2] > sequence:
+                return False
+
+    return True
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+cpdef np.ndarray generate_critical_path_moves(solution, bint change_machines, int[:, ::1] dependency_matrix_index_encoding, int[:, ::1] usable_machines_matrix):
+    """
+    Generates the moves on the critical path of the solution parameter (see generate_neighbor_move for the move format).
+
+    The critical path is divided into blocks of consecutive operations on the same machine.
+    Each operation of a block is moved to the front and to the back of its block,
+    which includes swapping the first two and the last two operations of each block.
+    If change_machines is true, each critical operation is also moved to every other machine it can be processed on.
+    Moves that would break the sequence order of a job are left out.
+
+    :type solution: Solution
+    :param solution: solution to generate moves of
+
+    :type change_machines: bool
+    :param change_machines: if true machine reassignments of critical operations are generated
+
+    :type dependency_matrix_index_encoding: nparray
+    :param dependency_matrix_index_encoding: dependency matrix index encoding from static Data
+
+    :type usable_machines_matrix: nparray
+    :param usable_machines_matrix: usable machines matrix from static Data
+
+    :rtype: nparray
+    :returns: 2d nparray of moves in the form [from_index, to_index, machine]
+    """
+    cdef int[:, ::1] operation_2d_array = solution.operation_2d_array
+    cdef Py_ssize_t[::1] critical_path = compute_critical_path(solution.operation_2d_array,
+                                                               solution.data.task_processing_times_matrix,
+                                                               solution.data.sequence_dependency_matrix,
+                                                               solution.data.job_task_index_matrix)
+    cdef Py_ssize_t block_start, block_end, i, j, k, row, first_row, last_row
+    cdef int machine, usable_machine
+    moves = []
+
+    block_start = 0
+    while block_start < critical_path.shape[0]:
+        machine = operation_2d_array[critical_path[block_start], 3]
+        block_end = block_start + 1
+        while block_end < critical_path.shape[0] and operation_2d_array[critical_path[block_end], 3] == machine:
+            block_end += 1
+
+        first_row = critical_path[block_start]
+        last_row = critical_path[block_end - 1]
+        for i in range(block_start, block_end):
+            row = critical_path[i]
+
+            # move the operation in front of the first operation and after the last operation of its block
+            if row != first_row and _keeps_job_order(operation_2d_array, row, first_row):
+                moves.append((row, first_row, machine))
+            if row != last_row and _keeps_job_order(operation_2d_array, row, last_row):
+                moves.append((row, last_row, machine))
+
+            if change_machines:
+                k = dependency_matrix_index_encoding[operation_2d_array[row, 0], operation_2d_array[row, 1]]
+                for j in range(usable_machines_matrix.shape[1]):
+                    usable_machine = usable_machines_matrix[k, j]
+
+                    # the rows of usable_machines_matrix repeat the usable machines to fill the row
+                    if usable_machine == usable_machines_matrix[k, 0] and j > 0:
+                        break
+
+                    if usable_machine != machine:
+                        moves.append((row, row, usable_machine))
+
+        block_start = block_end
+
+    return np.array(moves, dtype=np.intc).reshape(-1, 3)
+
+
+cdef inline uint64_t _rotl(uint64_t x, int k) nogil:
+    return (x << k) | (x >> (64 - k))
+
+
+cdef inline uint64_t _splitmix64(uint64_t * x) nogil:
+    cdef uint64_t z
+    x[0] += 0x9E3779B97F4A7C15ULL
+    z = x[0]
+    z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9ULL
+    z = (z ^ (z >> 27)) * 0x94D049BB133111EBULL
+    return z ^ (z >> 31)
+
+
+cdef class NeighborGenerator:
+    """
+    Generator of batches of random moves (see generate_neighbor_move) that uses its own xoshiro256** pseudo random number generator.
+
+    The moves are generated in compiled code without calling into numpy's random module,
+    so each tabu search agent should hold its own NeighborGenerator.
+
+    :type seed: int
+    :param seed: seed of the pseudo random number generator, if None a seed is drawn from numpy's random module
+    """
+    cdef uint64_t state[4]
+
+    def __init__(self, seed=None):
+        """
+        Initializes an instance of NeighborGenerator.
+
+        See help(NeighborGenerator)
+        """
+        if seed is None:
+            seed = np.random.randint(0, 2 ** 63, dtype=np.int64)
+
+        cdef uint64_t x = <uint64_t> (int(seed) & 0xFFFFFFFFFFFFFFFF)
+        cdef int i
+        for i in range(4):
+            self.state[i] = _splitmix64(&x)
+
+    def __reduce__(self):
+        return NeighborGenerator, (0,), (self.state[0], self.state[1], self.state[2], self.state[3])
+
+    def __setstate__(self, state):
+        cdef int i
+        for i in range(4):
+            self.state[i] = state[i]
+
+    cdef inline uint64_t _next(self) nogil:
+        cdef uint64_t result = _rotl(self.state[1] * 5, 7) * 9
+        cdef uint64_t t = self.state[1] << 17
+        self.state[2] ^= self.state[0]
+        self.state[3] ^= self.state[1]
+        self.state[1] ^= self.state[2]
+        self.state[0] ^= self.state[3]
+        self.state[2] ^= t
+        self.state[3] = _rotl(self.state[3], 45)
+        return result
+
+    cdef inline double _random(self) nogil:
+        """
+        Returns a random double in [0, 1).
+        """
+        return (self._next() >> 11) * (1.0 / 9007199254740992.0)
+
+    cdef inline Py_ssize_t _randint(self, Py_ssize_t low, Py_ssize_t high) nogil:
+        """
+        Returns a random integer in [low, high).
+        """
+        return low + <Py_ssize_t> (self._random() * (high - low))
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.nonecheck(False)
+    cpdef np.ndarray generate_moves(self, solution, Py_ssize_t num_moves, double probability_change_machine,
+                                    int[:, ::1] dependency_matrix_index_encoding, int[:, ::1] usable_machines_matrix):
+        """
+        Generates a batch of random moves that turn the solution parameter into its neighbors,
+        in the same way as generate_neighbor_move.
+
+        :type solution: Solution
+        :param solution: solution to generate moves of
+
+        :type num_moves: int
+        :param num_moves: number of moves to generate
+
+        :type probability_change_machine: float
+        :param probability_change_machine: probability of changing a chosen operation's machine in a move
+
+        :type dependency_matrix_index_encoding: nparray
+        :param dependency_matrix_index_encoding: dependency matrix index encoding from static Data
+
+        :type usable_machines_matrix: nparray
+        :param usable_machines_matrix: usable machines matrix from static Data
+
+        :rtype: nparray
+        :returns: 2d nparray of moves in the form [from_index, to_index, machine]
+        """
+        cdef const int[:, ::1] operation_2d_array = solution.operation_2d_array
+        cdef Py_ssize_t num_operations = operation_2d_array.shape[0]
+        result = np.empty((max(num_moves, 0), 3), dtype=np.intc)
+        cdef int[:, ::1] moves = result
+        cdef Py_ssize_t c, random_index, lower_index, upper_index, placement_index, i
+        cdef int job_id, sequence, machine
+
+        # every operation can only be moved to where it already is if there are less than 3 operations
+        if num_operations < 3:
+            return result[:0]
+
+        with nogil:
+            for c in range(moves.shape[0]):
+                lower_index = 0
+                upper_index = 0
+
+                # this is to ensure we are not inserting the randomly removed operation into the same place
+                while lower_index >= upper_index:
+
+                    random_index = self._randint(0, num_operations)
+                    job_id = operation_2d_array[random_index, 0]
+                    sequence = operation_2d_array[random_index, 2]
+
+                    # find a lower bound for possible placement of the operation
+                    lower_index = random_index - 1
+                    while lower_index >= 0 and not (
+                            operation_2d_array[lower_index, 0] == job_id and operation_2d_array[lower_index, 2] == sequence - 1):
+                        lower_index -= 1
+
+                    lower_index = 0 if lower_index < 0 else lower_index + 1
+
+                    # find an upper bound for possible placement of the operation
+                    upper_index = random_index + 1
+                    while upper_index < num_operations and not (
+                            operation_2d_array[upper_index, 0] == job_id and operation_2d_array[upper_index, 2] == sequence + 1):
+                        upper_index += 1
+
+                    if upper_index >= num_operations - 1:
+                        upper_index = upper_index - 2
+                    else:
+                        upper_index = upper_index - 1
+
+                # get a random placement index that is in between lower and upper index (bounds) and not equal to the random index
+                placement_index = random_index
+                while placement_index == random_index:
+                    placement_index = self._randint(lower_index, upper_index + 1)
+
+                # randomly change operation's machine if probability condition is met
+                machine = operation_2d_array[random_index, 3]
+                if self._random() < probability_change_machine:
+                    i = dependency_matrix_index_encoding[job_id, operation_2d_array[random_index, 1]]
+                    machine = usable_machines_matrix[i, self._randint(0, usable_machines_matrix.shape[1])]
+
+                moves[c, 0] = random_index
+                moves[c, 1] = placement_index
+                moves[c, 2] = machine
 
-    return Solution(solution.data, np.insert(result_operation_2d_array, placement_index, operation, axis=0))
+        return result
@@ -0,0 +1,166 @@
+import bisect
+import itertools
+
+import numpy as np
+
+from ._generate_neighbor import apply_move
+from ..solution import Solution
+from ..solution._makespan import compute_move_hashes
+
+
+def _longest_increasing_subsequence(values):
+    """
+    Finds a longest strictly increasing subsequence of values.
+
+    :type values: nparray
+    :param values: 1d nparray of values
+
+    :rtype: nparray
+    :returns: 1d boolean nparray that is true for the elements of the subsequence
+    """
+    tail_values = []  # smallest last value of the increasing subsequences of each length
+    tail_indices = []
+    predecessors = np.full(values.shape[0], -1, dtype=np.intp)
+    for i, value in enumerate(values.tolist()):
+        length = bisect.bisect_left(tail_values, value)
+        if length > 0:
+            predecessors[i] = tail_indices[length - 1]
+        if length == len(tail_values):
+            tail_values.append(value)
+            tail_indices.append(i)
+        else:
+            tail_values[length] = value
+            tail_indices[length] = i
+
+    in_subsequence = np.zeros(values.shape[0], dtype=np.bool_)
+    i = tail_indices[-1] if tail_indices else -1
+    while i >= 0:
+        in_subsequence[i] = True
+        i = predecessors[i]
+    return in_subsequence
+
+
+def _get_relinking_moves(operation_2d_array, job_task_index_matrix, guiding_rows, guiding_machines):
+    """
+    Gets the moves that each take an operation 2d array one step closer to a guiding solution.
+
+    The operations of a longest subsequence that is already in the guiding solution's order stay in place,
+    and every other operation is moved right behind the last operation of the subsequence that comes before it
+    in the guiding solution, onto its machine in the guiding solution.
+    The operations of the subsequence that are on a different machine than in the guiding solution are moved to it.
+
+    :type operation_2d_array: nparray
+    :param operation_2d_array: operation 2d array to move
+
+    :type job_task_index_matrix: nparray
+    :param job_task_index_matrix: job task index matrix from static Data
+
+    :type guiding_rows: nparray
+    :param guiding_rows: 1d nparray of the row of each operation (by task index) in the guiding solution
+
+    :type guiding_machines: nparray
+    :param guiding_machines: 1d nparray of the machine of each operation (by task index) in the guiding solution
+
+    :rtype: nparray
+    :returns: 2d nparray of moves in the form [from_index, to_index, machine], which is empty if operation_2d_array is the guiding solution
+    """
+    task_indices = job_task_index_matrix[operation_2d_array[:, 0], operation_2d_array[:, 1]]
+    ranks = guiding_rows[task_indices]
+    machines = guiding_machines[task_indices]
+    in_order = _longest_increasing_subsequence(ranks)
+
+    machine_rows = np.flatnonzero(in_order & (operation_2d_array[:, 3] != machines))
+
+    in_order_rows = np.flatnonzero(in_order)
+    moved_rows = np.flatnonzero(~in_order)
+    predecessors = np.searchsorted(ranks[in_order_rows], ranks[moved_rows])
+    predecessor_rows = np.where(predecessors > 0, in_order_rows[np.maximum(predecessors - 1, 0)], -1)
+
+    # the moved operation is removed before it is inserted, which shifts the rows after it
+    to_rows = np.where(moved_rows < predecessor_rows, predecessor_rows, predecessor_rows + 1)
+
+    return np.ascontiguousarray(np.concatenate([
+        np.column_stack((machine_rows, machine_rows, machines[machine_rows])),
+        np.column_stack((moved_rows, to_rows, machines[moved_rows]))
+    ]), dtype=np.intc)
+
+
+def relink(initiating_solution, guiding_solution, num_threads=1):
+    """
+    Walks the path of moves from an initiating solution to a guiding solution, and gets the best solution on the path.
+
+    At each step the moves that take the current solution one step closer to the guiding solution
+    (see _get_relinking_moves) are evaluated with the batched makespan kernel, and the best feasible one is made.
+    The path ends one step before the guiding solution, or when none of the moves are feasible.
+
+    :type initiating_solution: Solution
+    :param initiating_solution: solution to start the path from
+
+    :type guiding_solution: Solution
+    :param guiding_solution: solution to walk toward
+
+    :type num_threads: int
+    :param num_threads: number of threads to evaluate the moves with, only used if the extensions were compiled with OpenMP
+
+    :rtype: Solution
+    :returns: best solution strictly between initiating_solution and guiding_solution, or None if the path has none
+    """
+    data = initiating_solution.data
+    job_task_index_matrix = data.job_task_index_matrix
+    guiding_task_indices = job_task_index_matrix[guiding_solution.operation_2d_array[:, 0],
+                                                 guiding_solution.operation_2d_array[:, 1]]
+    guiding_rows = np.empty(data.total_number_of_tasks, dtype=np.intp)
+    guiding_rows[guiding_task_indices] = np.arange(data.total_number_of_tasks)
+    guiding_machines = np.empty(data.total_number_of_tasks, dtype=np.intc)
+    guiding_machines[guiding_task_indices] = guiding_solution.operation_2d_array[:, 3]
+
+    best_solution = None
+    solution = initiating_solution
+    while True:
+        moves = _get_relinking_moves(solution.operation_2d_array, job_task_index_matrix, guiding_rows,
+                                     guiding_machines)
+
+        # a single move left leads to the guiding solution
+        if moves.shape[0] <= 1:
+            break
+
+        machine_makespans, feasible = solution.get_makespan_checkpoints().compute_move_makespans_batch(
+            moves, num_threads=num_threads)
+        if not feasible.any():
+            break
+
+        i = int(np.argmin(np.where(feasible, np.max(machine_makespans, axis=1), np.inf)))
+        from_index, to_index, machine = moves[i]
+        solution = Solution(data, apply_move(solution.operation_2d_array, from_index, to_index, machine),
+                            machine_makespans[i],
+                            compute_move_hashes(solution.operation_2d_array, solution.operation_hash, moves[i:i + 1])[0])
+
+        if best_solution is None or solution < best_solution:
+            best_solution = solution
+
+    return best_solution
+
+
+def path_relinking(solutions, num_threads=1):
+    """
+    Relinks every pair of distinct solutions in both directions, and gets the best solution found on the paths.
+
+    :type solutions: [Solution]
+    :param solutions: elite solutions to relink
+
+    :type num_threads: int
+    :param num_threads: number of threads to evaluate the moves with, only used if the extensions were compiled with OpenMP
+
+    :rtype: Solution
+    :returns: best solution found on the paths, or None if no path has a solution between its ends
+    """
+    best_solution = None
+    for initiating_solution, guiding_solution in itertools.permutations(solutions, 2):
+        if initiating_solution == guiding_solution:
+            continue
+
+        solution = relink(initiating_solution, guiding_solution, num_threads)
+        if solution is not None and (best_solution is None or solution < best_solution):
+            best_solution = solution
+
+    return best_solution
@@ -1,13 +1,31 @@
-import pickle
+import multiprocessing as mp
+import os
 import random
 import time
+from enum import Enum
 from queue import Queue
 
 import numpy as np
 
-from ._generate_neighbor import generate_neighbor
-from ..exception import InfeasibleSolutionException
-from ..util import get_stop_condition, Heap
+from ._generate_neighbor import NeighborGenerator, generate_critical_path_moves, apply_move
+from .path_relinking import relink
+from ..checkpoint import CheckpointWriter, get_random_states, set_random_states
+from ..data import dumps_without_data
+from ..solution import Solution
+from ..solution._makespan import compute_move_hashes
+from ..util import get_stop_condition, Heap, TraceRecorder
+
+
+class TSNeighborhoodEnum(Enum):
+    """
+    Enumeration class containing two ways of generating the neighborhood of a seed solution for tabu search.
+
+    Neighborhoods:
+        1. TSNeighborhoodEnum.RANDOM - Random operations are moved to random feasible places
+        2. TSNeighborhoodEnum.CRITICAL_PATH - Operations on the critical path are moved to the front or back of their machine block or to other machines
+    """
+    RANDOM = 'random'
+    CRITICAL_PATH = 'critical_path'
 
 
 class TabuSearchAgent:
@@ -33,7 +51,7 @@ class TabuSearchAgent:
     :param neighborhood_size: size of neighborhoods to generate during each iteration
 
     :type neighborhood_wait: float
-    :param neighborhood_wait: maximum time (in seconds) to wait while generating a neighborhood
+    :param neighborhood_wait: not used, neighborhoods are generated in a single batch (kept for backwards compatibility)
 
     :type probability_change_machine: float
     :param probability_change_machine: probability of changing a chosen operations machine, must be in range [0, 1]
@@ -43,10 +61,46 @@ class TabuSearchAgent:
 
     :type benchmark: bool
     :param benchmark: if true benchmark data is gathered
+
+    :type benchmark_stride: int
+    :param benchmark_stride: number of iterations between the samples of the benchmark trace (see JSSP.util.TraceRecorder)
+
+    :type benchmark_max_samples: int
+    :param benchmark_max_samples: maximum number of samples the benchmark trace keeps, longer runs are downsampled
+
+    :type screening_tolerance: float
+    :param screening_tolerance: if not None, neighbors with a makespan greater than (1 + screening_tolerance) times the seed solution's makespan are discarded as soon as that bound is exceeded, instead of being fully evaluated
+
+    :type neighborhood_enum: TSNeighborhoodEnum
+    :param neighborhood_enum: how neighborhoods are generated (see TSNeighborhoodEnum)
+
+    :type seed: int
+    :param seed: seed of the agent's neighbor generator, if None a seed is drawn from numpy's random module
+
+    :type attribute_tabu: bool
+    :param attribute_tabu: if true the tabu list holds the attributes of the last moves (i.e. the operation's previous position and machine) for tabu_list_size iterations instead of whole solutions, and tabu moves are allowed if they improve the best makespan found
+
+    :type num_threads: int
+    :param num_threads: number of threads to evaluate each neighborhood with, only used if the extensions were compiled with OpenMP
+
+    :type checkpoint_file: Path | str
+    :param checkpoint_file: if not None, the agent's state is written to this file every checkpoint_interval seconds and when the search is done
+
+    :type checkpoint_interval: float
+    :param checkpoint_interval: number of seconds between checkpoints
+
+    :type resume_state: dict
+    :param resume_state: if not None, the search continues from this state loaded from a checkpoint file (see JSSP.checkpoint.load_state) instead of starting from initial_solution
+
+    :type path_relinking: bool
+    :param path_relinking: if true, when the best solution is not improved for reset_threshold iterations the agent relinks the seed solution with a best solution (see JSSP.tabu_search.path_relinking.relink) and continues from the best solution on the path
     """
     def __init__(self, stopping_condition, time_condition, initial_solution, num_solutions_to_find=1,
                  tabu_list_size=50, neighborhood_size=300, neighborhood_wait=0.1, probability_change_machine=0.8,
-                 reset_threshold=100, benchmark=False):
+                 reset_threshold=100, benchmark=False, screening_tolerance=None,
+                 neighborhood_enum=TSNeighborhoodEnum.RANDOM, seed=None, attribute_tabu=False, num_threads=1,
+                 checkpoint_file=None, checkpoint_interval=60, resume_state=None, path_relinking=False,
+                 benchmark_stride=1, benchmark_max_samples=10000):
         """
         Initializes an instance of TabuSearchAgent.
 
@@ -68,22 +122,66 @@ class TabuSearchAgent:
         self.probability_change_machine = probability_change_machine
         self.reset_threshold = reset_threshold
         self.benchmark = benchmark
+        self.benchmark_stride = benchmark_stride
+        self.benchmark_max_samples = benchmark_max_samples
+        self.screening_tolerance = screening_tolerance
+        self.neighborhood_enum = neighborhood_enum
+        self.neighbor_generator = NeighborGenerator(seed)
+        self.attribute_tabu = attribute_tabu
+        self.num_threads = num_threads
+        self.checkpoint_file = checkpoint_file
+        self.checkpoint_interval = checkpoint_interval
+        self.resume_state = resume_state
+        self.path_relinking = path_relinking
 
         # uninitialized ts results
         self.all_solutions = []
         self.best_solution = None
+        self.search_state = None  # state of the search when it is done, which another agent can resume from
 
         if benchmark:
             # uninitialized ts benchmark results
             self.benchmark_iterations = 0
-            self.neighborhood_size_v_iter = []
-            self.seed_solution_makespan_v_iter = []
-            self.tabu_size_v_iter = []
+            self.benchmark_trace = self._get_trace_recorder()
             self.min_makespan_coordinates = (0, 0)
 
+    def _get_trace_recorder(self):
+        """
+        Gets an empty benchmark trace of this TabuSearchAgent.
+
+        :rtype: TraceRecorder
+        :returns: trace of the seed solution makespan, neighborhood size and tabu list size of the iterations
+        """
+        return TraceRecorder(('seed_solution_makespan', 'neighborhood_size', 'tabu_size'), self.benchmark_stride,
+                             self.benchmark_max_samples)
+
+    @property
+    def seed_solution_makespan_v_iter(self):
+        """
+        :rtype: nparray
+        :returns: seed solution makespans of the iterations in benchmark_trace
+        """
+        return self.benchmark_trace.get('seed_solution_makespan')
+
+    @property
+    def neighborhood_size_v_iter(self):
+        """
+        :rtype: nparray
+        :returns: neighborhood sizes of the iterations in benchmark_trace
+        """
+        return self.benchmark_trace.get('neighborhood_size')
+
+    @property
+    def tabu_size_v_iter(self):
+        """
+        :rtype: nparray
+        :returns: tabu list sizes of the iterations in benchmark_trace
+        """
+        return self.benchmark_trace.get('tabu_size')
+
     def _generate_neighborhood(self, seed_solution, dependency_matrix_index_encoding, usable_machines_matrix):
         """
-        Generates a neighborhood of Solutions instances that are neighbors of the seed_solution parameter.
+        Generates a neighborhood of moves that turn the seed_solution parameter into its neighbors.
 
         :type seed_solution: Solution
         :param seed_solution: The solution to generate a neighborhood of
@@ -94,34 +192,64 @@ class TabuSearchAgent:
         :type usable_machines_matrix: nparray
         :param usable_machines_matrix: Usable machines matrix from static Data
 
-        :rtype: SolutionSet
-        :returns: Neighboring Solutions
+        :rtype: _MoveNeighborhood
+        :returns: Neighboring moves
         """
-        stop_time = time.time() + self.neighborhood_wait
-        neighborhood = _SolutionSet()
-        while neighborhood.size < self.neighborhood_size and time.time() < stop_time:
-            try:
-                neighbor = generate_neighbor(seed_solution, self.probability_change_machine,
-                                             dependency_matrix_index_encoding, usable_machines_matrix)
+        moves = None
+        if self.neighborhood_enum is TSNeighborhoodEnum.CRITICAL_PATH:
+            moves = generate_critical_path_moves(seed_solution, self.probability_change_machine > 0,
+                                                 dependency_matrix_index_encoding, usable_machines_matrix)
+            if moves.shape[0] > self.neighborhood_size:
+                moves = moves[np.random.choice(moves.shape[0], self.neighborhood_size, replace=False)]
+
+        # fall back to random moves if the critical path is a single block on a machine the operations can't leave
+        if moves is None or moves.shape[0] == 0:
+            moves = self.neighbor_generator.generate_moves(seed_solution, self.neighborhood_size,
+                                                           self.probability_change_machine,
+                                                           dependency_matrix_index_encoding, usable_machines_matrix)
+
+        moves, operation_hashes = _unique_moves(seed_solution, moves)
+
+        # in screening mode neighbors that are clearly worse than the seed solution are not fully evaluated
+        if self.screening_tolerance is None:
+            cutoff = np.inf
+        else:
+            cutoff = seed_solution.makespan * (1 + self.screening_tolerance)
 
-                if neighbor not in neighborhood:
-                    neighborhood.add(neighbor)
+        # compute the makespans of all the moves at once from the seed solution's checkpoints,
+        # divided among num_threads threads that each have their own scratch memory
+        machine_makespans, admissible = seed_solution.get_makespan_checkpoints().compute_move_makespans_batch(
+            moves, num_threads=self.num_threads, cutoff=cutoff)
 
-            except InfeasibleSolutionException:
-                # this should not happen
-                # if it does don't add the infeasible solution to the neighborhood
-                pass
-        return neighborhood
+        # infeasible neighbors should not happen, if they do they are not added to the neighborhood
+        # neither are the neighbors that were screened out
+        return _MoveNeighborhood(seed_solution, moves[admissible], machine_makespans[admissible],
+                                 operation_hashes[admissible])
 
-    def start(self, multi_process_queue=None):
+    def start(self, multi_process_queue=None, elite_pool=None, early_stopping=None):
         """
         Starts the search for this TabuSearchAgent.
 
-        If the multi_process_queue parameter is not None, this function attempts to push this TabuSearchAgent to the multi processing queue.
+        If the multi_process_queue parameter is not None, a TSImprovementEvent is pushed to the multi processing queue
+        every time the best makespan is improved, and this TabuSearchAgent is pushed to it when the search is done.
+
+        If checkpoint_file is not None, a snapshot of the agent's state is taken every checkpoint_interval seconds
+        and written to the file by a background thread.
+
+        If the elite_pool parameter is not None, the agent publishes every new best solution it finds to the pool,
+        and when its best solution has not improved for reset_threshold iterations it continues from another solution in the pool
+        instead of forcing a move to a worse neighbor.
+        If path_relinking is true, that solution is used to guide a path relinking from the seed solution instead.
 
         :type multi_process_queue: multiprocessing.Queue
         :param multi_process_queue: queue to put this TabuSearchAgent into
 
+        :type elite_pool: ElitePool
+        :param elite_pool: elite pool shared with the other agents, or None
+
+        :type early_stopping: EarlyStopping
+        :param early_stopping: criteria for stopping the agent and the agents it shares them with early, or None
+
         :rtype: Solution
         :returns: best Solution found
         """
@@ -131,80 +259,157 @@ class TabuSearchAgent:
         usable_machines_matrix = self.initial_solution.data.usable_machines_matrix
 
         # ts variables
-        tabu_list = _TabuList()
+        if self.attribute_tabu:
+            tabu_list = _AttributeTabuList(self.initial_solution.data, self.tabu_list_size)
+        else:
+            tabu_list = _TabuList()
         seed_solution = self.initial_solution
         best_solutions_heap = Heap(max_heap=True)
-        for _ in range(self.num_solutions_to_find):
-            best_solutions_heap.push(self.initial_solution)
 
         # variables used for restarts
         lacking_solution = seed_solution
         counter = 0
 
         iterations = 0
+        elapsed_time = 0
+
+        if self.resume_state is None:
+            for _ in range(self.num_solutions_to_find):
+                best_solutions_heap.push(self.initial_solution)
+        else:
+            seed_solution, lacking_solution, counter, iterations, elapsed_time = \
+                self._restore_checkpoint_state(self.resume_state, tabu_list, best_solutions_heap, elite_pool)
+            self.resume_state = None
+
+        best_solution = min(best_solutions_heap[i] for i in range(len(best_solutions_heap)))
+        best_makespan = best_solution.makespan
+        if elite_pool is not None:
+            elite_pool.publish(best_solution)
+        if early_stopping is not None:
+            early_stopping.update(best_makespan)
 
         # variables used for benchmarks
-        neighborhood_size_v_iter = []
-        tabu_size_v_iter = []
-        seed_solution_makespan_v_iter = []
-        absolute_best_solution_makespan = seed_solution.makespan
-        absolute_best_solution_iteration = 0
+        trace = self._get_trace_recorder() if self.benchmark else None
+        absolute_best_solution_makespan = best_makespan
+        absolute_best_solution_iteration = iterations
+
+        # create stopping condition function, a resumed search only runs for the rest of its runtime
+        start_time = time.time() - elapsed_time
+        stop_condition = get_stop_condition(self.time_condition,
+                                            self.runtime - elapsed_time if self.time_condition else None,
+                                            self.iterations, early_stopping)
 
-        # create stopping condition function
-        stop_condition = get_stop_condition(self.time_condition, self.runtime, self.iterations)
+        checkpoint_writer = None
+        if self.checkpoint_file is not None:
+            checkpoint_writer = CheckpointWriter(self.checkpoint_file, self.checkpoint_interval)
 
         while not stop_condition(iterations):
             neighborhood = self._generate_neighborhood(seed_solution,
                                                        dependency_matrix_index_encoding,
                                                        usable_machines_matrix)
 
-            sorted_neighborhood = sorted(neighborhood.solutions.items())
-            break_boolean = False
+            if self.attribute_tabu:
+                # tabu moves are allowed if they lead to a better makespan than the best found so far (aspiration)
+                tabu_moves = tabu_list.tabu_mask(seed_solution, neighborhood.moves) \
+                             & (neighborhood.makespans >= best_makespan)
 
-            for makespan, lst in sorted_neighborhood:  # sort neighbors in increasing order by makespan
-                for neighbor in sorted(lst):  # sort subset of neighbors with the same makespans
-                    if neighbor not in tabu_list:
-                        # if new seed solution is not better than current seed solution add it to the tabu list
-                        if neighbor >= seed_solution:
-                            tabu_list.put(seed_solution)
-                            if len(tabu_list) > self.tabu_list_size:
-                                tabu_list.get()
+            # neighbors are looked up in the tabu list by their hashes and only the chosen one is built,
+            # unless a hash matches a tabu solution and the neighbor has to be compared to it
+            for i in neighborhood.iter_sorted_indices():  # neighbors in increasing order by machine makespans
+                if self.attribute_tabu:
+                    if tabu_moves[i]:
+                        continue
 
-                        seed_solution = neighbor
-                        break_boolean = True
-                        break
-
-                if break_boolean:
+                    tabu_list.put_move(seed_solution, neighborhood.moves[i])
+                    seed_solution = neighborhood.get_neighbor(i)
                     break
 
-            if seed_solution < best_solutions_heap[0]:
-                best_solutions_heap.pop()  # remove the worst best solution from the heap
-                best_solutions_heap.push(seed_solution)  # add the new best solution to the heap
-                if self.benchmark and seed_solution.makespan < absolute_best_solution_makespan:
-                    absolute_best_solution_makespan = seed_solution.makespan
-                    absolute_best_solution_iteration = iterations
+                if tabu_list.contains_hash(neighborhood.operation_hashes[i]) \
+                        and neighborhood.get_neighbor(i) in tabu_list:
+                    continue
 
-            # if solution is not being improved after a number of iterations, force a move to a worse one
-            counter += 1
-            if counter > self.reset_threshold:
-                if not lacking_solution > seed_solution and len(sorted_neighborhood) > 10:
-                    # add the seed solution to the tabu list
+                neighbor = neighborhood.get_neighbor(i)
+
+                # if new seed solution is not better than current seed solution add it to the tabu list
+                if neighbor >= seed_solution:
                     tabu_list.put(seed_solution)
                     if len(tabu_list) > self.tabu_list_size:
                         tabu_list.get()
+
+                seed_solution = neighbor
+                break
+
+            best_makespan = self._update_best_solutions(seed_solution, best_solutions_heap, best_makespan,
+                                                        iterations, multi_process_queue, elite_pool, early_stopping)
+
+            # if solution is not being improved after a number of iterations, force a move to a worse one
+            counter += 1
+            if counter > self.reset_threshold:
+                distinct_makespans = np.unique(neighborhood.makespans)
+                elite_solution = None
+                if elite_pool is not None and not lacking_solution > seed_solution:
+                    elite_solution = elite_pool.get_solution(exclude=seed_solution)
+
+                relinked_solution = None
+                if self.path_relinking and not lacking_solution > seed_solution:
+                    guiding_solution = elite_solution
+                    if guiding_solution is None:
+                        guiding_solution = best_solutions_heap[random.randrange(len(best_solutions_heap))]
+                    if guiding_solution != seed_solution:
+                        relinked_solution = relink(seed_solution, guiding_solution, self.num_threads)
+
+                if relinked_solution is not None:
+                    # intensify the search between the seed solution and a best solution
+                    if not self.attribute_tabu:
+                        tabu_list.put(seed_solution)
+                        if len(tabu_list) > self.tabu_list_size:
+                            tabu_list.get()
+                    seed_solution = relinked_solution
+                    best_makespan = self._update_best_solutions(seed_solution, best_solutions_heap, best_makespan,
+                                                                iterations, multi_process_queue, elite_pool,
+                                                                early_stopping)
+                elif elite_solution is not None:
+                    # continue from a solution another agent (or this one) found instead of a blind restart
+                    if not self.attribute_tabu:
+                        tabu_list.put(seed_solution)
+                        if len(tabu_list) > self.tabu_list_size:
+                            tabu_list.get()
+                    seed_solution = elite_solution
+                elif not lacking_solution > seed_solution and len(distinct_makespans) > 10:
                     # choose a worse solution from the neighborhood
-                    seed_solution = sorted_neighborhood[random.randint(1, int(0.2 * len(sorted_neighborhood)))][1][0]
+                    makespan = distinct_makespans[random.randint(1, int(0.2 * len(distinct_makespans)))]
+                    i = np.flatnonzero(neighborhood.makespans == makespan)[0]
+
+                    # add the seed solution (or the move away from it) to the tabu list
+                    if self.attribute_tabu:
+                        tabu_list.put_move(neighborhood.seed_solution, neighborhood.moves[i])
+                    else:
+                        tabu_list.put(seed_solution)
+                        if len(tabu_list) > self.tabu_list_size:
+                            tabu_list.get()
+                    seed_solution = neighborhood.get_neighbor(i)
 
                 counter = 0
                 lacking_solution = seed_solution
 
-            if self.benchmark:
-                iterations += 1
-                neighborhood_size_v_iter.append(neighborhood.size)
-                seed_solution_makespan_v_iter.append(seed_solution.makespan)
-                tabu_size_v_iter.append(len(tabu_list))
-            elif not self.time_condition:
-                iterations += 1
+            if self.benchmark and best_makespan < absolute_best_solution_makespan:
+                absolute_best_solution_makespan = best_makespan
+                absolute_best_solution_iteration = iterations
+
+            if self.benchmark and trace.is_sampled(iterations):
+                trace.record(iterations, seed_solution.makespan, neighborhood.size, len(tabu_list))
+            iterations += 1
+
+            if checkpoint_writer is not None and checkpoint_writer.is_due():
+                checkpoint_writer.write(self._get_checkpoint_state(iterations, time.time() - start_time, counter,
+                                                                   seed_solution, lacking_solution,
+                                                                   best_solutions_heap, tabu_list, elite_pool))
+
+        self.search_state = self._get_checkpoint_state(iterations, time.time() - start_time, counter, seed_solution,
+                                                       lacking_solution, best_solutions_heap, tabu_list, elite_pool)
+        if checkpoint_writer is not None:
+            checkpoint_writer.write(self.search_state)
+            checkpoint_writer.flush()
 
         # convert best_solutions_heap to a sorted list
         best_solutions_list = []
@@ -218,24 +423,508 @@ class TabuSearchAgent:
 
         if self.benchmark:
             self.benchmark_iterations = iterations
-            self.neighborhood_size_v_iter = neighborhood_size_v_iter
-            self.seed_solution_makespan_v_iter = seed_solution_makespan_v_iter
-            self.tabu_size_v_iter = tabu_size_v_iter
+            self.benchmark_trace = trace
             self.min_makespan_coordinates = (absolute_best_solution_iteration, absolute_best_solution_makespan)
 
         if multi_process_queue is not None:
-            # pickle results and add to Queue
-            self.initial_solution.machine_makespans = np.asarray(self.initial_solution.machine_makespans)
-            multi_process_queue.put(pickle.dumps(self, protocol=-1))
+            # pickle results without the instance data, they are bound to the parent's data when unpickled
+            multi_process_queue.put(dumps_without_data(self))
 
         return self.best_solution
 
+    @staticmethod
+    def _update_best_solutions(solution, best_solutions_heap, best_makespan, iterations, multi_process_queue,
+                               elite_pool, early_stopping):
+        """
+        Adds a solution to the best solutions if it is better than the worst of them,
+        and publishes it if it improves the best makespan.
+
+        :type solution: Solution
+        :param solution: solution the search moved to
+
+        :type best_solutions_heap: Heap
+        :param best_solutions_heap: max heap of the best solutions found
+
+        :type best_makespan: float
+        :param best_makespan: best makespan found
+
+        :type iterations: int
+        :param iterations: number of iterations ran
+
+        :type multi_process_queue: multiprocessing.Queue
+        :param multi_process_queue: queue to push a TSImprovementEvent to, or None
+
+        :type elite_pool: ElitePool
+        :param elite_pool: elite pool to publish the solution to, or None
+
+        :type early_stopping: EarlyStopping
+        :param early_stopping: early stopping criteria to update, or None
+
+        :rtype: float
+        :returns: best makespan found including solution
+        """
+        if solution < best_solutions_heap[0]:
+            best_solutions_heap.pop()  # remove the worst best solution from the heap
+            best_solutions_heap.push(solution)  # add the new best solution to the heap
+            if solution.makespan < best_makespan:
+                best_makespan = solution.makespan
+                if elite_pool is not None:
+                    elite_pool.publish(solution)
+                if early_stopping is not None:
+                    early_stopping.update(best_makespan)
+                if multi_process_queue is not None:
+                    multi_process_queue.put(TSImprovementEvent(os.getpid(), time.time(), iterations,
+                                                               solution.makespan, solution.operation_2d_array))
+        return best_makespan
+
+    def _get_checkpoint_state(self, iterations, elapsed_time, counter, seed_solution, lacking_solution,
+                              best_solutions_heap, tabu_list, elite_pool):
+        """
+        Takes a snapshot of the state of a running search for a checkpoint.
+
+        The solutions are stored as their operation_2d_arrays, and the random number generators' states are included.
+        The solutions in the elite pool are included too, so a resumed cooperative search does not start with an empty pool.
+
+        :type iterations: int
+        :param iterations: number of iterations done
+
+        :type elapsed_time: float
+        :param elapsed_time: number of seconds the search has run for
+
+        :type counter: int
+        :param counter: number of iterations since the last restart
+
+        :type seed_solution: Solution
+        :param seed_solution: current seed solution
+
+        :type lacking_solution: Solution
+        :param lacking_solution: seed solution at the last restart
+
+        :type best_solutions_heap: Heap
+        :param best_solutions_heap: heap of the best solutions found
+
+        :type tabu_list: _TabuList | _AttributeTabuList
+        :param tabu_list: tabu list of the search
+
+        :type elite_pool: ElitePool
+        :param elite_pool: elite pool the search shares with other agents, or None
+
+        :rtype: dict
+        :returns: state of the search as a dict of nparrays
+        """
+        state = {'iterations': np.array(iterations),
+                 'elapsed_time': np.array(elapsed_time),
+                 'counter': np.array(counter),
+                 'seed_solution': seed_solution.operation_2d_array,
+                 'lacking_solution': lacking_solution.operation_2d_array,
+                 'best_solutions': np.stack([best_solutions_heap[i].operation_2d_array
+                                             for i in range(len(best_solutions_heap))]),
+                 'neighbor_generator_state': np.array(self.neighbor_generator.__reduce__()[2], dtype=np.uint64)}
+
+        if self.attribute_tabu:
+            state['tabu_moves'] = np.array(tabu_list.moves)
+            state['tabu_positions'] = tabu_list.tabu_positions.copy()
+            state['position_tabu_until'] = tabu_list.position_tabu_until.copy()
+            state['machine_tabu_until'] = tabu_list.machine_tabu_until.copy()
+        else:
+            state['tabu_solutions'] = np.array([solution.operation_2d_array for solution in tabu_list.queue],
+                                               dtype=seed_solution.operation_2d_array.dtype).reshape(
+                (-1,) + seed_solution.operation_2d_array.shape)
+
+        if elite_pool is not None:
+            state['elite_solutions'] = np.array([solution.operation_2d_array for solution in elite_pool.get_solutions()],
+                                                dtype=seed_solution.operation_2d_array.dtype).reshape(
+                (-1,) + seed_solution.operation_2d_array.shape)
+
+        state.update(get_random_states())
+        return state
+
+    def _restore_checkpoint_state(self, state, tabu_list, best_solutions_heap, elite_pool):
+        """
+        Restores the state of a search from a checkpoint taken with _get_checkpoint_state.
+
+        :type state: dict
+        :param state: state of the search as a dict of nparrays
+
+        :type tabu_list: _TabuList | _AttributeTabuList
+        :param tabu_list: empty tabu list to restore
+
+        :type best_solutions_heap: Heap
+        :param best_solutions_heap: empty heap to restore the best solutions into
+
+        :type elite_pool: ElitePool
+        :param elite_pool: elite pool to publish the checkpointed elite solutions to, or None
+
+        :rtype: tuple
+        :returns: (seed solution, lacking solution, counter, iterations, elapsed time)
+        """
+        data = self.initial_solution.data
+        for operation_2d_array in state['best_solutions']:
+            best_solutions_heap.push(Solution(data, operation_2d_array))
+
+        if self.attribute_tabu:
+            tabu_list.moves = int(state['tabu_moves'])
+            tabu_list.tabu_positions[:] = state['tabu_positions']
+            tabu_list.position_tabu_until[:] = state['position_tabu_until']
+            tabu_list.machine_tabu_until[:] = state['machine_tabu_until']
+        else:
+            for operation_2d_array in state['tabu_solutions']:
+                tabu_list.put(Solution(data, operation_2d_array))
+
+        if elite_pool is not None and 'elite_solutions' in state:
+            for operation_2d_array in state['elite_solutions']:
+                elite_pool.publish(Solution(data, operation_2d_array))
+
+        self.neighbor_generator.__setstate__(tuple(int(x) for x in state['neighbor_generator_state']))
+        set_random_states(state)
+
+        return Solution(data, state['seed_solution']), Solution(data, state['lacking_solution']), \
+            int(state['counter']), int(state['iterations']), float(state['elapsed_time'])
+
+
+class TSImprovementEvent:
+    """
+    Event that a tabu search agent running in a child process pushes to its queue when it improves its best makespan.
+
+    :type worker_id: int
+    :param worker_id: process id of the agent
+
+    :type timestamp: float
+    :param timestamp: time of the improvement in seconds since the epoch
+
+    :type iteration: int
+    :param iteration: iteration of the agent the improvement was found in
+
+    :type makespan: float
+    :param makespan: makespan of the new best solution
+
+    :type operation_2d_array: nparray
+    :param operation_2d_array: 2d nparray of operations of the new best solution
+    """
+    def __init__(self, worker_id, timestamp, iteration, makespan, operation_2d_array):
+        self.worker_id = worker_id
+        self.timestamp = timestamp
+        self.iteration = iteration
+        self.makespan = makespan
+        self.operation_2d_array = operation_2d_array
+
+    def get_solution(self, data):
+        """
+        Builds the improved solution.
+
+        :type data: Data
+        :param data: JSSP instance data the agent is solving
+
+        :rtype: Solution
+        :returns: the new best solution of the agent
+        """
+        return Solution(data, self.operation_2d_array)
+
+
+class ElitePool:
+    """
+    Pool of the best solutions found by cooperating tabu search agents, kept in shared memory.
+
+    Agents publish their best solutions to the pool and re-seed from it when their search stagnates.
+    The pool has to be created before the agents' processes are started so that they inherit the shared memory.
+
+    :type data: Data
+    :param data: JSSP instance data
+
+    :type pool_size: int
+    :param pool_size: maximum number of solutions in the pool
+
+    :type context: multiprocessing.context.BaseContext
+    :param context: multiprocessing context of the agents' processes (see JSSP.util.get_process_context), or None for the default context
+    """
+    def __init__(self, data, pool_size, context=None):
+        """
+        Initializes an instance of ElitePool.
+
+        See help(ElitePool)
+        """
+        self.data = data
+        self.pool_size = pool_size
+        if context is None:
+            context = mp.get_context()
+        self._lock = context.Lock()
+        self._operations = mp.Array('i', pool_size * data.total_number_of_tasks * 4, lock=False)
+        self._makespans = mp.Array('d', [np.inf] * pool_size, lock=False)
+        self._operation_hashes = mp.Array('Q', pool_size, lock=False)
+
+    def __getstate__(self):
+        # the pool is sent to child processes with their instance data, which is attached to its shared memory if it is
+        state = self.__dict__.copy()
+        state['data'] = self.data.get_shared_reference()
+        return state
+
+    def _arrays(self):
+        """
+        Gets nparray views of the shared memory.
+
+        :rtype: (nparray, nparray, nparray)
+        :returns: 3d nparray of operations, 1d nparray of makespans and 1d nparray of hashes of the pool's slots
+        """
+        operations = np.frombuffer(self._operations, dtype=np.intc).reshape(self.pool_size,
+                                                                            self.data.total_number_of_tasks, 4)
+        return operations, np.frombuffer(self._makespans), np.frombuffer(self._operation_hashes, dtype=np.uint64)
+
+    def publish(self, solution):
+        """
+        Adds a solution to the pool if it is better than the worst solution in the pool and not in the pool already.
+
+        :type solution: Solution
+        :param solution: solution to add
+
+        :rtype: bool
+        :returns: true if the solution was added
+        """
+        operations, makespans, operation_hashes = self._arrays()
+        with self._lock:
+            worst = int(np.argmax(makespans))
+            if solution.makespan >= makespans[worst] \
+                    or np.any((operation_hashes == solution.operation_hash) & (makespans < np.inf)):
+                return False
+
+            operations[worst] = solution.operation_2d_array
+            makespans[worst] = solution.makespan
+            operation_hashes[worst] = solution.operation_hash
+            return True
+
+    def clear(self):
+        """
+        Removes all the solutions from the pool.
+
+        :returns: None
+        """
+        with self._lock:
+            self._arrays()[1][:] = np.inf
+
+    def get_solution(self, exclude=None):
+        """
+        Gets a random solution from the pool.
+
+        :type exclude: Solution
+        :param exclude: solution that should not be returned, or None
+
+        :rtype: Solution
+        :returns: a solution from the pool, or None if the pool has no other solutions
+        """
+        operations, makespans, operation_hashes = self._arrays()
+        with self._lock:
+            candidates = makespans < np.inf
+            if exclude is not None:
+                candidates &= operation_hashes != exclude.operation_hash
+            candidates = np.flatnonzero(candidates)
+            if candidates.shape[0] == 0:
+                return None
+
+            index = candidates[random.randrange(candidates.shape[0])]
+            operation_2d_array = operations[index].copy()
+            operation_hash = operation_hashes[index]
+
+        return Solution(self.data, operation_2d_array, operation_hash=operation_hash)
+
+    def get_solutions(self):
+        """
+        Gets all the solutions in the pool.
+
+        :rtype: [Solution]
+        :returns: solutions in the pool sorted from best to worst
+        """
+        operations, makespans, operation_hashes = self._arrays()
+        with self._lock:
+            indices = np.flatnonzero(makespans < np.inf)
+            solutions = [Solution(self.data, operations[i].copy(), operation_hash=operation_hashes[i]) for i in indices]
+
+        return sorted(solutions)
+
+    def __len__(self):
+        return int(np.count_nonzero(self._arrays()[1] < np.inf))
+
 
 '''
 TS data structures
 '''
 
 
+def _unique_moves(seed_solution, moves):
+    """
+    Removes the moves that result in the same neighbor as an earlier move and computes the hashes of the neighbors.
+
+    Moves are compared by the hashes of their neighbors,
+    so different moves that result in the same neighbor (e.g. the two ways of swapping adjacent operations) are removed.
+    The neighbors of moves with equal hashes are compared exactly, so a neighbor whose hash collides is not removed.
+
+    :type seed_solution: Solution
+    :param seed_solution: solution the moves are applied to
+
+    :type moves: nparray
+    :param moves: 2d nparray of moves in the form [from_index, to_index, machine]
+
+    :rtype: (nparray, nparray)
+    :returns: 2d nparray of the unique moves in the order they were generated and 1d nparray of their neighbors' hashes
+    """
+    operation_hashes = compute_move_hashes(seed_solution.operation_2d_array, seed_solution.operation_hash, moves)
+    unique_hashes, counts = np.unique(operation_hashes, return_counts=True)
+
+    is_duplicate = np.zeros(moves.shape[0], dtype=np.bool_)
+    for operation_hash in unique_hashes[counts > 1]:
+        neighbors = []
+        for i in np.flatnonzero(operation_hashes == operation_hash):
+            neighbor = apply_move(seed_solution.operation_2d_array, *moves[i])
+            if any(np.array_equal(neighbor, other_neighbor) for other_neighbor in neighbors):
+                is_duplicate[i] = True
+            else:
+                neighbors.append(neighbor)
+
+    unique_indices = np.flatnonzero(~is_duplicate)
+    return np.ascontiguousarray(moves[unique_indices]), operation_hashes[unique_indices]
+
+
+class _MoveNeighborhood:
+    """
+    Neighborhood of a seed Solution stored as moves and the machine makespans of the neighbors they result in.
+
+    Only the neighbors that are needed are built into Solution instances.
+
+    :type seed_solution: Solution
+    :param seed_solution: solution the moves are applied to
+
+    :type moves: nparray
+    :param moves: 2d nparray of moves in the form [from_index, to_index, machine]
+
+    :type machine_makespans: nparray
+    :param machine_makespans: 2d nparray of the machine makespans of each move's neighbor
+
+    :type operation_hashes: nparray
+    :param operation_hashes: 1d nparray of the hash of each move's neighbor
+    """
+    def __init__(self, seed_solution, moves, machine_makespans, operation_hashes):
+        self.seed_solution = seed_solution
+        self.moves = moves
+        self.machine_makespans = machine_makespans
+        self.operation_hashes = operation_hashes
+        self.makespans = np.max(machine_makespans, axis=1, initial=0.0)
+        self.size = moves.shape[0]
+
+    def get_neighbor(self, index):
+        """
+        Builds the neighbor of a move.
+
+        :type index: int
+        :param index: index of the move
+
+        :rtype: Solution
+        :returns: neighbor of the seed solution
+        """
+        from_index, to_index, machine = self.moves[index]
+        return Solution(self.seed_solution.data,
+                        apply_move(self.seed_solution.operation_2d_array, from_index, to_index, machine),
+                        self.machine_makespans[index], self.operation_hashes[index])
+
+    def iter_sorted_indices(self):
+        """
+        Generates the indices of the moves from the best to the worst neighbor,
+        where neighbors are compared like Solutions and equal neighbors stay in the order they were generated.
+
+        Only as many neighbors are ordered as are consumed:
+        the neighbors with the lowest makespans are selected in chunks that double in size,
+        and only the machine makespans of each chunk are sorted.
+
+        :rtype: generator
+        :returns: generator of move indices
+        """
+        remaining_indices = np.arange(self.size)
+        chunk_size = 8
+        while remaining_indices.shape[0] > 0:
+            remaining_makespans = self.makespans[remaining_indices]
+            if chunk_size < remaining_indices.shape[0]:
+                # every neighbor left out of the chunk has a greater makespan than the ones in it
+                max_chunk_makespan = np.partition(remaining_makespans, chunk_size - 1)[chunk_size - 1]
+                in_chunk = remaining_makespans <= max_chunk_makespan
+            else:
+                in_chunk = np.ones(remaining_indices.shape[0], dtype=np.bool_)
+
+            chunk_indices = remaining_indices[in_chunk]
+            descending_machine_makespans = -np.sort(-self.machine_makespans[chunk_indices], axis=1)
+            yield from chunk_indices[np.lexsort(descending_machine_makespans.T[::-1])]
+
+            remaining_indices = remaining_indices[~in_chunk]
+            chunk_size *= 2
+
+
+class _AttributeTabuList:
+    """
+    Tabu list of move attributes, where an operation that was moved may not be moved back to its previous position
+    or machine for tenure moves.
+
+    :type data: Data
+    :param data: JSSP instance data
+
+    :type tenure: int
+    :param tenure: number of moves an attribute stays tabu
+    """
+    def __init__(self, data, tenure):
+        self.tenure = tenure
+        self.moves = 0
+        self.job_task_index_matrix = data.job_task_index_matrix
+
+        # previous position of each operation (by task index) and the move until which moving it back is tabu
+        self.tabu_positions = np.full(data.total_number_of_tasks, -1, dtype=np.intp)
+        self.position_tabu_until = np.zeros(data.total_number_of_tasks, dtype=np.int64)
+
+        # the move until which moving each operation (by task index) back to each machine is tabu
+        self.machine_tabu_until = np.zeros((data.total_number_of_tasks, data.total_number_of_machines), dtype=np.int64)
+
+    def put_move(self, solution, move):
+        """
+        Makes moving the operation of a move back to its position and machine in solution tabu.
+
+        :type solution: Solution
+        :param solution: solution the move is applied to
+
+        :type move: nparray
+        :param move: move in the form [from_index, to_index, machine]
+
+        :returns: None
+        """
+        from_index, _, machine = move
+        job_id, task_id, _, previous_machine = solution.operation_2d_array[from_index]
+        task_index = self.job_task_index_matrix[job_id, task_id]
+
+        self.moves += 1
+        self.tabu_positions[task_index] = from_index
+        self.position_tabu_until[task_index] = self.moves + self.tenure
+        if machine != previous_machine:
+            self.machine_tabu_until[task_index, previous_machine] = self.moves + self.tenure
+
+    def tabu_mask(self, solution, moves):
+        """
+        Gets which of the moves of solution are tabu.
+
+        :type solution: Solution
+        :param solution: solution the moves are applied to
+
+        :type moves: nparray
+        :param moves: 2d nparray of moves in the form [from_index, to_index, machine]
+
+        :rtype: nparray
+        :returns: 1d boolean nparray that is true for the tabu moves
+        """
+        operations = solution.operation_2d_array[moves[:, 0]]
+        task_indices = self.job_task_index_matrix[operations[:, 0], operations[:, 1]]
+        position_tabu = (self.position_tabu_until[task_indices] > self.moves) \
+                        & (moves[:, 1] == self.tabu_positions[task_indices])
+        machine_tabu = (moves[:, 2] != operations[:, 3]) \
+                       & (self.machine_tabu_until[task_indices, moves[:, 2]] > self.moves)
+        return position_tabu | machine_tabu
+
+    def __len__(self):
+        return int(np.count_nonzero(self.position_tabu_until > self.moves)
+                   + np.count_nonzero(self.machine_tabu_until > self.moves))
+
+
 class _TabuList(Queue):
     """
     Queue for containing Solution instances.
@@ -256,17 +945,20 @@ class _TabuList(Queue):
     def __contains__(self, solution):
         return solution in self.solutions
 
+    def contains_hash(self, operation_hash):
+        return self.solutions.contains_hash(operation_hash)
+
     def __len__(self):
         return self.solutions.size
 
 
 class _SolutionSet:
     """
-    Set for containing Solution instances.
+    Set for containing Solution instances, where solutions are looked up by their operation hashes.
     """
     def __init__(self):
         self.size = 0
-        self.solutions = {}
+        self.solutions = {}  # operation hash -> list of the solutions with that hash
 
     def add(self, solution):
         """
@@ -277,10 +969,10 @@ class _SolutionSet:
 
         :returns: None
         """
-        if solution.makespan not in self.solutions:
-            self.solutions[solution.makespan] = [solution]
+        if solution.operation_hash not in self.solutions:
+            self.solutions[solution.operation_hash] = [solution]
         else:
-            self.solutions[solution.makespan].append(solution)
+            self.solutions[solution.operation_hash].append(solution)
 
         self.size += 1
 
@@ -293,10 +985,10 @@ class _SolutionSet:
 
         :returns: None
         """
-        if len(self.solutions[solution.makespan]) == 1:
-            del self.solutions[solution.makespan]
+        if len(self.solutions[solution.operation_hash]) == 1:
+            del self.solutions[solution.operation_hash]
         else:
-            self.solutions[solution.makespan].remove(solution)
+            self.solutions[solution.operation_hash].remove(solution)
 
         self.size -= 1
 
@@ -310,4 +1002,16 @@ class _SolutionSet:
         :rtype: bool
         :returns: true if the solution is in this _SolutionSet
         """
-        return solution.makespan in self.solutions and solution in self.solutions[solution.makespan]
+        return solution.operation_hash in self.solutions and solution in self.solutions[solution.operation_hash]
+
+    def contains_hash(self, operation_hash):
+        """
+        Returns true if a solution with the operation hash is in this _SolutionSet.
+
+        :type operation_hash: int
+        :param operation_hash: operation hash to look for
+
+        :rtype: bool
+        :returns: true if a solution with the operation hash is in this _SolutionSet
+        """
+        return int(operation_hash) in self.solutions
@@ -0,0 +1,231 @@
+import random
+import weakref
+
+import numpy as np
+
+from .ts import TabuSearchAgent, TSImprovementEvent, ElitePool
+from ..solution import Solution
+from ..util import EarlyStopping, get_process_context
+
+
+def _run_agent(data, agent_parameters, operation_2d_array, seed, results_queue, elite_pool, early_stopping):
+    """
+    Runs a tabu search agent on data in a child process.
+
+    The instance data is passed first so that it is unpickled before the rest of the arguments
+    when the child process is spawned instead of forked.
+
+    :type data: Data
+    :param data: JSSP instance data
+
+    :type agent_parameters: dict
+    :param agent_parameters: keyword arguments of TabuSearchAgent other than initial_solution and seed
+
+    :type operation_2d_array: nparray
+    :param operation_2d_array: operation 2d array of the agent's initial solution
+
+    :type seed: int
+    :param seed: seed of the agent's random states
+
+    :type results_queue: multiprocessing.Queue
+    :param results_queue: queue the agent pushes its improvement events and results to
+
+    :type elite_pool: ElitePool
+    :param elite_pool: elite pool shared by the agents, or None
+
+    :type early_stopping: EarlyStopping
+    :param early_stopping: early stopping criteria shared by the agents, or None
+
+    :returns: None
+    """
+    # the child processes are forked with the same random states
+    random.seed(seed)
+    np.random.seed(seed % 2 ** 32)
+
+    ts_agent = TabuSearchAgent(initial_solution=Solution(data, operation_2d_array), seed=seed, **agent_parameters)
+    ts_agent.start(results_queue, elite_pool, early_stopping)
+
+
+def _close_workers(task_queues, processes, data):
+    """
+    Stops the workers of a TabuSearchWorkerPool after they finish their current agents,
+    and releases the shared memory of the instance data.
+
+    :type task_queues: [multiprocessing.Queue]
+    :param task_queues: task queues of the workers
+
+    :type processes: [multiprocessing.Process]
+    :param processes: worker processes
+
+    :type data: Data
+    :param data: instance data the pool moved into shared memory, or None
+
+    :returns: None
+    """
+    for task_queue in task_queues:
+        task_queue.put(None)
+    for p in processes:
+        p.join()
+
+    # the workers attach to the shared memory when they start, so it is only released after they exit
+    if data is not None:
+        data.release_shared_memory()
+
+
+def _run_worker(data, task_queue, results_queue, elite_pool, early_stopping):
+    """
+    Runs tabu search agents on data for the tasks put into task_queue until None is put into it.
+
+    A task is a tuple of (agent parameters, initial operation_2d_array, seed, cooperative, early stopping criteria).
+
+    :type data: Data
+    :param data: JSSP instance data the worker keeps for all its tasks
+
+    :type task_queue: multiprocessing.Queue
+    :param task_queue: queue of tasks for this worker
+
+    :type results_queue: multiprocessing.Queue
+    :param results_queue: queue the agents push their improvement events and results to
+
+    :type elite_pool: ElitePool
+    :param elite_pool: elite pool shared by the workers
+
+    :type early_stopping: EarlyStopping
+    :param early_stopping: early stopping criteria shared by the workers
+
+    :returns: None
+    """
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+
+        agent_parameters, operation_2d_array, seed, cooperative, stopping_criteria = task
+
+        early_stopping.target_makespan, early_stopping.lower_bound, \
+            early_stopping.stall_iterations, early_stopping.stall_time = stopping_criteria
+
+        _run_agent(data, agent_parameters, operation_2d_array, seed, results_queue,
+                   elite_pool if cooperative else None, early_stopping)
+
+
+class TabuSearchWorkerPool:
+    """
+    Pool of long lived worker processes that run tabu search agents on the same JSSP instance.
+
+    The workers receive the instance data once when they are started,
+    and for each run only the agents' parameters, initial operations and seeds are sent to them.
+    The matrices of the instance data are moved into shared memory for as long as the pool runs (see Data.share_memory),
+    so the workers attach to them instead of holding copies.
+    Every worker runs one agent at a time, and the agents push their improvement events and results to results_queue.
+    The workers are not forked (see JSSP.util.get_process_context), since the agents of any later run may use several threads.
+
+    The pool has to be closed with close, or used as a context manager, to stop the workers and release the shared memory.
+    Pools that are garbage collected or still open when the interpreter exits are closed then.
+
+    :type data: Data
+    :param data: JSSP instance data
+
+    :type num_workers: int
+    :param num_workers: number of worker processes
+    """
+
+    def __init__(self, data, num_workers):
+        """
+        Initializes an instance of TabuSearchWorkerPool and starts its worker processes.
+
+        See help(TabuSearchWorkerPool)
+        """
+        self.data = data
+        self.num_workers = num_workers
+        context = get_process_context()
+        self.results_queue = context.Queue()
+
+        self._shares_data = not data.is_shared()
+        if self._shares_data:
+            data.share_memory()
+
+        # shared memory is inherited by the workers when they are started and reset for every run
+        self.elite_pool = ElitePool(data, num_workers, context)
+        self.early_stopping = EarlyStopping()
+
+        # the workers attach to the matrices in shared memory instead of receiving copies of them
+        self._task_queues = [context.Queue() for _ in range(num_workers)]
+        self._processes = [context.Process(target=_run_worker,
+                                           args=[data.get_shared_reference(), task_queue, self.results_queue,
+                                                 self.elite_pool, self.early_stopping],
+                                           daemon=True)
+                           for task_queue in self._task_queues]
+        for p in self._processes:
+            p.start()
+
+        self._finalizer = weakref.finalize(self, _close_workers, self._task_queues, self._processes,
+                                           data if self._shares_data else None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def run(self, initial_solutions, agent_parameters, cooperative=False, early_stopping=None):
+        """
+        Starts one tabu search agent for each initial solution on the workers.
+
+        :type initial_solutions: [Solution]
+        :param initial_solutions: initial solutions of the agents, at most num_workers
+
+        :type agent_parameters: dict | [dict]
+        :param agent_parameters: keyword arguments of TabuSearchAgent other than initial_solution and seed, either for all the agents or a list with the arguments of each agent
+
+        :type cooperative: bool
+        :param cooperative: if true the agents share their best solutions in the pool's elite pool
+
+        :type early_stopping: EarlyStopping
+        :param early_stopping: criteria for stopping all the agents early, or None, the agents update a copy of the criteria in the pool's early_stopping instead of this instance (see EarlyStopping.copy_state)
+
+        :returns: None
+
+        :raise: UserWarning if there are more initial solutions than workers
+        """
+        if len(initial_solutions) > self.num_workers:
+            raise UserWarning(f"The worker pool has {self.num_workers} workers "
+                              f"and cannot run {len(initial_solutions)} agents.")
+
+        if early_stopping is None:
+            stopping_criteria = (None, None, None, None)
+        else:
+            stopping_criteria = (early_stopping.target_makespan, early_stopping.lower_bound,
+                                 early_stopping.stall_iterations, early_stopping.stall_time)
+
+        if isinstance(agent_parameters, dict):
+            agent_parameters = [agent_parameters] * len(initial_solutions)
+
+        self.elite_pool.clear()
+        self.early_stopping.reset()
+        for task_queue, initial_solution, parameters in zip(self._task_queues, initial_solutions, agent_parameters):
+            seed = int(np.random.randint(0, 2 ** 63, dtype=np.int64))
+            task_queue.put((parameters, initial_solution.operation_2d_array, seed, cooperative, stopping_criteria))
+
+    def stop(self, num_running_agents):
+        """
+        Stops the running agents and discards their remaining results, so that the workers can be reused.
+
+        :type num_running_agents: int
+        :param num_running_agents: number of agents whose results were not received yet
+
+        :returns: None
+        """
+        self.early_stopping.stop()
+        while num_running_agents > 0:
+            if not isinstance(self.results_queue.get(), TSImprovementEvent):
+                num_running_agents -= 1
+
+    def close(self):
+        """
+        Stops the worker processes after they finish their current agents,
+        and releases the shared memory of the instance data if the pool moved it there.
+
+        :returns: None
+        """
+        self._finalizer()
@@ -1,8 +1,12 @@
 import heapq
+import math
+import multiprocessing as mp
 import time
 
+import numpy as np
 
-def get_stop_condition(time_condition, runtime, max_iterations):
+
+def get_stop_condition(time_condition, runtime, max_iterations, early_stopping=None):
     """
     Gets a function for checking the stopping condition of an optimization function.
 
@@ -15,6 +19,9 @@ def get_stop_condition(time_condition, runtime, max_iterations):
     :type max_iterations: int
     :param max_iterations: maximum number of iterations that the optimization function should execute
 
+    :type early_stopping: EarlyStopping
+    :param early_stopping: criteria for stopping before the runtime or iterations are used up, or None
+
     :rtype: function
     :return: function which returns True if the stopping condition is met
     """
@@ -27,9 +34,319 @@ def get_stop_condition(time_condition, runtime, max_iterations):
         def stop_condition(iterations):
             return iterations >= max_iterations
 
+    if early_stopping is not None:
+        return early_stopping.get_stop_condition(stop_condition)
+
     return stop_condition
 
 
+def get_process_context(num_threads=None):
+    """
+    Gets the multiprocessing context to start child processes with that run the compiled kernels on num_threads threads.
+
+    A process forked from a process that already ran an OpenMP parallel region on several threads
+    deadlocks in its own parallel regions on several threads (e.g. after Solver.path_relinking with num_threads > 1),
+    so if the default start method forks, these processes are started from a fork server (or spawned) instead.
+    Like on platforms that do not fork, scripts that start them have to guard their code with if __name__ == '__main__'.
+
+    :type num_threads: int
+    :param num_threads: number of threads the child processes run the kernels on, or None if it is not known yet
+
+    :rtype: multiprocessing.context.BaseContext
+    :returns: multiprocessing context
+    """
+    context = mp.get_context()
+    if context.get_start_method() == 'fork' and (num_threads is None or num_threads > 1):
+        return mp.get_context('forkserver' if 'forkserver' in mp.get_all_start_methods() else 'spawn')
+    return context
+
+
+class EarlyStopping:
+    """
+    Criteria for stopping an optimization function before its runtime or iterations are used up.
+
+    The state of the criteria is kept in shared memory, so all the processes of a parallel tabu search stop together
+    as soon as one of them meets a criterion. Instances have to be created before the processes are started.
+
+    :type target_makespan: float
+    :param target_makespan: stop as soon as a solution with a makespan less than or equal to target_makespan is found, or None
+
+    :type lower_bound: float
+    :param lower_bound: makespan lower bound (see Data.get_makespan_lower_bound), stop as soon as a solution with this makespan is found, or None
+
+    :type stall_iterations: int
+    :param stall_iterations: stop if the best makespan is not improved for stall_iterations iterations of any one process, or None
+
+    :type stall_time: float
+    :param stall_time: stop if the best makespan is not improved for stall_time seconds, or None
+    """
+
+    def __init__(self, target_makespan=None, lower_bound=None, stall_iterations=None, stall_time=None):
+        """
+        Initializes an instance of EarlyStopping.
+
+        See help(EarlyStopping)
+        """
+        self.target_makespan = target_makespan
+        self.lower_bound = lower_bound
+        self.stall_iterations = stall_iterations
+        self.stall_time = stall_time
+
+        # locks of the spawn context can be passed to child processes of every start method (see get_process_context)
+        context = mp.get_context('spawn')
+        self._stop_event = context.Event()
+        self._best_makespan = context.Value('d', math.inf)
+        self._improvement_time = context.Value('d', time.time(), lock=False)  # guarded by the lock of _best_makespan
+
+    def reset(self):
+        """
+        Resets the criteria at the start of a run.
+
+        :returns: None
+        """
+        self._stop_event.clear()
+        with self._best_makespan.get_lock():
+            self._best_makespan.value = math.inf
+            self._improvement_time.value = time.time()
+
+    def stop(self):
+        """
+        Signals every process to stop.
+
+        :returns: None
+        """
+        self._stop_event.set()
+
+    def is_stopped(self):
+        """
+        Checks if the processes were signaled to stop.
+
+        :rtype: bool
+        :returns: true if the processes should stop
+        """
+        return self._stop_event.is_set()
+
+    def copy_state(self, early_stopping):
+        """
+        Copies the stop signal, the best makespan and the time of its last improvement from another instance,
+        e.g. from the instance that a worker pool's processes updated in place of this one.
+
+        :type early_stopping: EarlyStopping
+        :param early_stopping: instance to copy the state from
+
+        :returns: None
+        """
+        with early_stopping._best_makespan.get_lock():
+            best_makespan = early_stopping._best_makespan.value
+            improvement_time = early_stopping._improvement_time.value
+
+        with self._best_makespan.get_lock():
+            self._best_makespan.value = best_makespan
+            self._improvement_time.value = improvement_time
+
+        if early_stopping.is_stopped():
+            self.stop()
+        else:
+            self._stop_event.clear()
+
+    def update(self, makespan):
+        """
+        Records the makespan of a new best solution of a process,
+        and signals every process to stop if it reaches the target makespan or the lower bound.
+
+        :type makespan: float
+        :param makespan: makespan of the new best solution
+
+        :returns: None
+        """
+        with self._best_makespan.get_lock():
+            if makespan < self._best_makespan.value:
+                self._best_makespan.value = makespan
+                self._improvement_time.value = time.time()
+
+        # the makespans and the lower bound are sums of the same runtimes in different orders
+        if (self.target_makespan is not None and makespan <= self.target_makespan) \
+                or (self.lower_bound is not None and makespan <= self.lower_bound + 1e-6):
+            self.stop()
+
+    def get_stop_condition(self, stop_condition):
+        """
+        Gets a function for checking the stopping condition of one process, including these criteria.
+
+        :type stop_condition: function
+        :param stop_condition: stopping condition of the runtime or iterations (see get_stop_condition)
+
+        :rtype: function
+        :return: function which returns True if the stopping condition is met or a criterion is met by any process
+        """
+        best_makespan = math.inf
+        improvement_iteration = 0
+
+        def early_stop_condition(iterations):
+            nonlocal best_makespan, improvement_iteration
+            if stop_condition(iterations) or self._stop_event.is_set():
+                return True
+
+            if self.stall_iterations is not None:
+                # the iterations are counted from the last time this process saw the best makespan improve
+                shared_best_makespan = self._best_makespan.value
+                if shared_best_makespan < best_makespan:
+                    best_makespan = shared_best_makespan
+                    improvement_iteration = iterations
+                elif iterations - improvement_iteration >= self.stall_iterations:
+                    self.stop()
+                    return True
+
+            if self.stall_time is not None and time.time() - self._improvement_time.value >= self.stall_time:
+                self.stop()
+                return True
+
+            return False
+
+        return early_stop_condition
+
+
+class TraceRecorder:
+    """
+    Records the benchmark trace of an optimization agent in preallocated numpy buffers.
+
+    A sample of every stride-th iteration is recorded, made of the iteration, a wall clock timestamp
+    and a value for each field. Once max_samples samples are recorded, reservoir sampling keeps a uniformly random
+    subset of max_samples of the sampled iterations, so the trace of a long run does not grow with its iterations.
+    The samples are read in increasing order of their iterations.
+
+    :type fields: [str]
+    :param fields: names of the values recorded in each sample
+
+    :type stride: int
+    :param stride: number of iterations between samples
+
+    :type max_samples: int
+    :param max_samples: maximum number of samples to keep
+
+    :raise: UserWarning if stride or max_samples is less than 1
+    """
+
+    def __init__(self, fields, stride=1, max_samples=10000):
+        """
+        Initializes an instance of TraceRecorder.
+
+        See help(TraceRecorder)
+        """
+        if stride < 1 or max_samples < 1:
+            raise UserWarning("stride and max_samples must be positive integers.")
+
+        self.fields = tuple(fields)
+        self.stride = stride
+        self.max_samples = max_samples
+        self._iterations = np.empty(max_samples, dtype=np.int64)
+        self._timestamps = np.empty(max_samples, dtype=np.float64)
+        self._values = np.empty((max_samples, len(self.fields)), dtype=np.float64)
+        self._size = 0
+        self._num_sampled = 0  # number of sampled iterations, including the ones that were not kept
+        self._sorted = True
+        self._rng = np.random.default_rng()
+
+    def is_sampled(self, iteration):
+        """
+        Checks if a sample of an iteration is recorded, so that the values of other iterations are not computed.
+
+        :type iteration: int
+        :param iteration: iteration of the agent
+
+        :rtype: bool
+        :returns: true if iteration is a multiple of stride
+        """
+        return iteration % self.stride == 0
+
+    def record(self, iteration, *values):
+        """
+        Records a sample of an iteration, which may be discarded by reservoir sampling.
+
+        :type iteration: int
+        :param iteration: iteration of the agent, should be sampled (see is_sampled)
+
+        :type values: float
+        :param values: value of each field
+
+        :returns: None
+        """
+        self._num_sampled += 1
+        if self._size < self.max_samples:
+            if self._size == self._iterations.shape[0]:
+                # the buffers of an unpickled trace only hold its samples
+                self._iterations = np.resize(self._iterations, self.max_samples)
+                self._timestamps = np.resize(self._timestamps, self.max_samples)
+                self._values = np.resize(self._values, (self.max_samples, len(self.fields)))
+            i = self._size
+            self._size += 1
+        else:
+            i = self._rng.integers(self._num_sampled)
+            if i >= self.max_samples:
+                return
+            self._sorted = False
+
+        self._iterations[i] = iteration
+        self._timestamps[i] = time.time()
+        self._values[i] = values
+
+    @property
+    def iterations(self):
+        """
+        :rtype: nparray
+        :returns: iterations of the samples
+        """
+        self._sort()
+        return self._iterations[:self._size]
+
+    @property
+    def timestamps(self):
+        """
+        :rtype: nparray
+        :returns: wall clock times (see time.time) at which the samples were recorded
+        """
+        self._sort()
+        return self._timestamps[:self._size]
+
+    def get(self, field):
+        """
+        Gets the values of a field in the samples.
+
+        :type field: str
+        :param field: name of the field
+
+        :rtype: nparray
+        :returns: values of the field in the samples
+        """
+        self._sort()
+        return self._values[:self._size, self.fields.index(field)]
+
+    def _sort(self):
+        """
+        Sorts the samples by their iterations, which reservoir sampling does not keep in order.
+
+        :returns: None
+        """
+        if not self._sorted:
+            order = np.argsort(self._iterations[:self._size], kind='stable')
+            self._iterations[:self._size] = self._iterations[order]
+            self._timestamps[:self._size] = self._timestamps[order]
+            self._values[:self._size] = self._values[order]
+            self._sorted = True
+
+    def __len__(self):
+        return self._size
+
+    def __getstate__(self):
+        # only the recorded samples are pickled, not the unused part of the buffers
+        self._sort()
+        state = self.__dict__.copy()
+        state['_iterations'] = self._iterations[:self._size].copy()
+        state['_timestamps'] = self._timestamps[:self._size].copy()
+        state['_values'] = self._values[:self._size].copy()
+        return state
+
+
 class Heap:
     """
     Heap data structure.
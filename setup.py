@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 
 import os
+import sys
 from pathlib import Path
 
 from setuptools import find_packages, setup, Extension
@@ -15,6 +16,12 @@ with open(requirements_txt) as req_file:
 
 
 class NumpyExtension(Extension):
+    def __init__(self, name, sources, fast_math=True, openmp=False, **kwargs):
+        super().__init__(name, sources, **kwargs)
+        # makespan computations must not be reassociated, otherwise makespans depend on how the kernel was inlined
+        self.fast_math = fast_math
+        self.openmp = openmp
+
     # setuptools calls this function after installing dependencies
     def _convert_pyx_sources_to_lang(self):
         import numpy
@@ -22,14 +29,24 @@ class NumpyExtension(Extension):
         # include libraries and compile flags if not on Windows
         if os.name != 'nt':
             self.libraries.append('m')
-            self.extra_compile_args.append('-ffast-math')
+            if self.fast_math:
+                self.extra_compile_args.append('-ffast-math')
+        # compile prange loops with OpenMP if the compiler supports it (Apple's clang does not), else they run serially
+        if self.openmp:
+            if os.name == 'nt':
+                self.extra_compile_args.append('/openmp')
+            elif sys.platform != 'darwin':
+                self.extra_compile_args.append('-fopenmp')
+                self.extra_link_args.append('-fopenmp')
         super()._convert_pyx_sources_to_lang()
 
 
 ext_modules = [NumpyExtension('JSSP.genetic_algorithm._ga_helpers',
                               ['JSSP/genetic_algorithm/_ga_helpers.pyx']),
                NumpyExtension('JSSP.solution._makespan',
-                              ['JSSP/solution/_makespan.pyx']),
+                              ['JSSP/solution/_makespan.pyx'],
+                              fast_math=False,
+                              openmp=True),
                NumpyExtension('JSSP.tabu_search._generate_neighbor',
                               ['JSSP/tabu_search/_generate_neighbor.pyx'])
                ]
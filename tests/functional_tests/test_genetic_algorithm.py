@@ -1,7 +1,9 @@
 import unittest
 
-from JSSP.genetic_algorithm import GASelectionEnum
+from JSSP import checkpoint
+from JSSP.genetic_algorithm import GASelectionEnum, GeneticAlgorithmAgent
 from JSSP.solver import Solver
+from JSSP.util import EarlyStopping
 from tests.util import tmp_dir, csv_data, rm_tree
 
 
@@ -178,6 +180,113 @@ class TestGA(unittest.TestCase):
         solver.output_benchmark_results(output_file, auto_open=False)
         self.assertTrue(output_file.exists(), "GA benchmark results were not produced")
 
+    def test_ga_iter_benchmark_trace(self):
+        iterations = 30
+        benchmark_stride = 3
+
+        solver = Solver(csv_data)
+        solver.genetic_algorithm_iter(iterations, population_size=20, benchmark=True,
+                                      benchmark_stride=benchmark_stride, benchmark_max_samples=5)
+
+        # the trace holds a sample of every third generation
+        trace = solver.ga_agent.benchmark_trace
+        self.assertEqual(iterations, solver.ga_agent.benchmark_iterations)
+        self.assertEqual(5, len(trace))
+        self.assertTrue(all(iteration % benchmark_stride == 0 for iteration in trace.iterations))
+        self.assertTrue(all(solver.ga_agent.best_solution_makespan_v_iter
+                            <= solver.ga_agent.avg_population_makespan_v_iter))
+
+    def test_ga_iterator(self):
+        iterations = 30
+
+        solver = Solver(csv_data)
+        improvements = list(solver.iter_genetic_algorithm(iterations=iterations, population_size=50))
+
+        self.assertGreater(len(improvements), 1)
+        for improvement1, improvement2 in zip(improvements, improvements[1:]):
+            self.assertLess(improvement2.solution, improvement1.solution)
+            self.assertLessEqual(improvement1.elapsed_time, improvement2.elapsed_time)
+            self.assertLessEqual(improvement1.iteration, improvement2.iteration)
+        self.assertEqual(solver.solution, improvements[-1].solution)
+        self.assertEqual(solver.ga_agent.best_solution, improvements[-1].solution)
+
+    def test_ga_iterator_break(self):
+        solver = Solver(csv_data)
+        for improvement in solver.iter_genetic_algorithm(runtime=60, population_size=50):
+            if improvement.iteration > 0:
+                break
+
+        self.assertEqual(solver.solution, improvement.solution)
+        self.assertEqual(solver.ga_agent.best_solution, improvement.solution)
+
+    def test_iterator_stopping_condition(self):
+        solver = Solver(csv_data)
+        with self.assertRaises(UserWarning):
+            next(solver.iter_genetic_algorithm())
+        with self.assertRaises(UserWarning):
+            next(solver.iter_genetic_algorithm(runtime=10, iterations=10))
+
+    def test_ga_early_stopping(self):
+        runtime = 60  # seconds
+
+        solver = Solver(csv_data)
+        solver.genetic_algorithm_time(runtime, population_size=50, benchmark=True,
+                                      early_stopping=EarlyStopping(stall_iterations=5))
+
+        self.assertLess(solver.ga_agent.benchmark_iterations, 1000)
+        self.assertIsNotNone(solver.solution)
+
+        target_makespan = solver.solution.makespan
+        solver.genetic_algorithm_time(runtime, population=[solver.solution], population_size=50, benchmark=True,
+                                      early_stopping=EarlyStopping(target_makespan=target_makespan))
+
+        self.assertEqual(0, solver.ga_agent.benchmark_iterations)
+        self.assertLessEqual(solver.solution.makespan, target_makespan)
+
+    def test_ga_checkpoint_resume(self):
+        iterations = 10
+        checkpoint_dir = tmp_dir / 'ga_checkpoints'
+
+        solver = Solver(csv_data)
+        solver.genetic_algorithm_iter(iterations, population_size=50,
+                                      selection_method_enum=GASelectionEnum.FITNESS_PROPORTIONATE,
+                                      checkpoint_dir=checkpoint_dir, checkpoint_interval=0)
+        solution = solver.solution
+
+        # an interrupted GA continues from its checkpoint for the rest of its generations
+        state = checkpoint.load_state(checkpoint_dir / 'ga_agent.npz')
+        self.assertEqual(iterations, state['iterations'])
+        resumed_agent = GeneticAlgorithmAgent(2 * iterations, solver.ga_agent.initial_population, benchmark=True,
+                                              resume_state=state)
+        resumed_agent.start()
+        self.assertEqual(2 * iterations, resumed_agent.benchmark_iterations)
+        self.assertLessEqual(resumed_agent.best_solution, solution)
+
+        # resuming a finished run returns its best solution
+        solver = Solver(csv_data)
+        self.assertEqual(solution, solver.resume(checkpoint_dir))
+        self.assertIs(solver.ga_agent.selection_method, GASelectionEnum.FITNESS_PROPORTIONATE)
+
+        with self.assertRaises(UserWarning):
+            solver.resume(tmp_dir)
+
+    def test_ga_continue(self):
+        iterations = 10
+
+        solver = Solver(csv_data)
+        with self.assertRaises(UserWarning):
+            solver.continue_genetic_algorithm(iterations=iterations)
+
+        solver.genetic_algorithm_iter(iterations, population_size=50, selection_size=5, benchmark=True)
+        ga_agent = solver.ga_agent
+        solution = solver.solution
+
+        self.assertLessEqual(solver.continue_genetic_algorithm(iterations=iterations), solution)
+        self.assertEqual(iterations, solver.ga_agent.benchmark_iterations)
+        self.assertEqual(ga_agent.selection_size, solver.ga_agent.selection_size)
+        self.assertEqual(len(ga_agent.result_population), len(solver.ga_agent.result_population))
+        self.assertLessEqual(solver.ga_agent.best_solution, ga_agent.best_solution)
+
 
 class TestGASelectionMethods(unittest.TestCase):
 
@@ -1,7 +1,21 @@
+import asyncio
+import gc
+import multiprocessing as mp
+import pickle
+import queue
+import subprocess
+import sys
 import unittest
+from multiprocessing import shared_memory
+from unittest import mock
 
+from JSSP import checkpoint
+from JSSP.data import loads_without_data
+from JSSP.solution import Solution
 from JSSP.solver import Solver
-from tests.util import tmp_dir, csv_data, rm_tree
+from JSSP.util import EarlyStopping
+from JSSP.tabu_search import ElitePool, TabuSearchAgent, TabuSearchWorkerPool, TSImprovementEvent, TSNeighborhoodEnum, relink
+from tests.util import project_root, tmp_dir, csv_data, csv_data_solution_factory, rm_tree
 
 
 class TestTS(unittest.TestCase):
@@ -189,6 +203,505 @@ class TestTS(unittest.TestCase):
         solver.output_benchmark_results(output_file, auto_open=False)
         self.assertTrue(output_file.exists(), "TS benchmark results were not produced")
 
+    def test_ts_iter_benchmark_trace(self):
+        iterations = 100
+        num_processes = 2
+        benchmark_stride = 2
+        benchmark_max_samples = 20
+
+        solver = Solver(csv_data)
+        solver.tabu_search_iter(iterations,
+                                num_processes=num_processes,
+                                neighborhood_size=200,
+                                benchmark=True,
+                                benchmark_stride=benchmark_stride,
+                                benchmark_max_samples=benchmark_max_samples)
+
+        # the traces hold a sample of the even iterations
+        self.assertEqual(len(solver.ts_agent_list), num_processes)
+        for ts_agent in solver.ts_agent_list:
+            self.assertEqual(iterations, ts_agent.benchmark_iterations)
+            trace = ts_agent.benchmark_trace
+            self.assertEqual(benchmark_max_samples, len(trace))
+            self.assertTrue(all(iteration % benchmark_stride == 0 for iteration in trace.iterations))
+            self.assertEqual(benchmark_max_samples, len(ts_agent.seed_solution_makespan_v_iter))
+            self.assertEqual(benchmark_max_samples, len(ts_agent.neighborhood_size_v_iter))
+            self.assertEqual(benchmark_max_samples, len(ts_agent.tabu_size_v_iter))
+
+        output_file = tmp_dir / 'ts_test_benchmark'
+        solver.output_benchmark_results(output_file, auto_open=False)
+        self.assertTrue(output_file.exists(), "TS benchmark results were not produced")
+
+    def test_ts_iter_screening(self):
+        iterations = 50
+        num_processes = 2
+        screening_tolerance = 0.05
+
+        solver = Solver(csv_data)
+        solver.tabu_search_iter(iterations,
+                                num_processes=num_processes,
+                                neighborhood_size=200,
+                                screening_tolerance=screening_tolerance,
+                                benchmark=True)
+
+        self.assertIsNotNone(solver.solution)
+        self.assertEqual(len(solver.ts_agent_list), num_processes)
+        for ts_agent in solver.ts_agent_list:
+            self.assertEqual(screening_tolerance, ts_agent.screening_tolerance)
+            self.assertLessEqual(ts_agent.best_solution, ts_agent.initial_solution)
+
+    def test_ts_iter_critical_path(self):
+        iterations = 50
+        num_processes = 2
+
+        solver = Solver(csv_data)
+        solver.tabu_search_iter(iterations,
+                                num_processes=num_processes,
+                                neighborhood_size=200,
+                                neighborhood_enum=TSNeighborhoodEnum.CRITICAL_PATH,
+                                benchmark=True)
+
+        self.assertIsNotNone(solver.solution)
+        self.assertEqual(len(solver.ts_agent_list), num_processes)
+        for ts_agent in solver.ts_agent_list:
+            self.assertIs(TSNeighborhoodEnum.CRITICAL_PATH, ts_agent.neighborhood_enum)
+            self.assertLess(ts_agent.best_solution, ts_agent.initial_solution)
+
+    def test_ts_iter_attribute_tabu(self):
+        iterations = 50
+        num_processes = 2
+        tabu_list_size = 10
+
+        solver = Solver(csv_data)
+        solver.tabu_search_iter(iterations,
+                                num_processes=num_processes,
+                                tabu_list_size=tabu_list_size,
+                                neighborhood_size=200,
+                                attribute_tabu=True,
+                                benchmark=True)
+
+        self.assertIsNotNone(solver.solution)
+        self.assertEqual(len(solver.ts_agent_list), num_processes)
+        for ts_agent in solver.ts_agent_list:
+            self.assertTrue(ts_agent.attribute_tabu)
+            self.assertLess(ts_agent.best_solution, ts_agent.initial_solution)
+            self.assertEqual(iterations, len(ts_agent.tabu_size_v_iter))
+
+    def test_ts_iter_num_threads(self):
+        iterations = 50
+        num_processes = 2
+        num_threads = 4
+
+        solver = Solver(csv_data)
+        solver.tabu_search_iter(iterations,
+                                num_processes=num_processes,
+                                neighborhood_size=200,
+                                num_threads=num_threads)
+
+        self.assertIsNotNone(solver.solution)
+        self.assertEqual(len(solver.ts_agent_list), num_processes)
+        for ts_agent in solver.ts_agent_list:
+            self.assertEqual(num_threads, ts_agent.num_threads)
+            self.assertLess(ts_agent.best_solution, ts_agent.initial_solution)
+
+    def test_ts_iter_num_threads_after_relinking(self):
+        # child processes forked after the parent ran a parallel region on several threads used to deadlock,
+        # so the sequence runs in a separate interpreter that is killed if it does not finish
+        script = '\n'.join([
+            "from JSSP.solver import Solver",
+            "from tests.util import csv_data",
+            "solver = Solver(csv_data)",
+            "solver.tabu_search_iter(20, num_processes=2, neighborhood_size=200)",
+            "solver.path_relinking(num_threads=4)",
+            "solver.tabu_search_iter(50, num_processes=2, neighborhood_size=200, num_threads=4)",
+            "solver.start_worker_pool(2)",
+            "solver.tabu_search_iter(50, num_processes=2, neighborhood_size=200, num_threads=4)",
+            "solver.close_worker_pool()",
+        ])
+
+        result = subprocess.run([sys.executable, '-c', script], cwd=project_root, capture_output=True, timeout=300)
+        self.assertEqual(0, result.returncode, result.stderr.decode())
+
+    def test_ts_iter_cooperative(self):
+        iterations = 100
+        num_processes = 2
+
+        solver = Solver(csv_data)
+        solver.tabu_search_iter(iterations,
+                                num_processes=num_processes,
+                                neighborhood_size=200,
+                                reset_threshold=10,
+                                cooperative=True)
+
+        self.assertIsNotNone(solver.solution)
+        self.assertEqual(len(solver.ts_agent_list), num_processes)
+        for ts_agent in solver.ts_agent_list:
+            self.assertLess(ts_agent.best_solution, ts_agent.initial_solution)
+
+    def test_ts_iter_path_relinking(self):
+        iterations = 100
+        num_processes = 2
+
+        for cooperative in (False, True):
+            solver = Solver(csv_data)
+            solver.tabu_search_iter(iterations,
+                                    num_processes=num_processes,
+                                    num_solutions_per_process=3,
+                                    neighborhood_size=200,
+                                    reset_threshold=10,
+                                    cooperative=cooperative,
+                                    path_relinking=True)
+
+            self.assertIsNotNone(solver.solution)
+            self.assertEqual(len(solver.ts_agent_list), num_processes)
+            for ts_agent in solver.ts_agent_list:
+                self.assertTrue(ts_agent.path_relinking)
+                self.assertLess(ts_agent.best_solution, ts_agent.initial_solution)
+
+        # the agent relinks its seed solution with another solution when it stops improving
+        for path_relinking in (False, True):
+            ts_agent = TabuSearchAgent(1000, False, csv_data_solution_factory.get_solution(), num_solutions_to_find=3,
+                                       neighborhood_size=200, reset_threshold=5, seed=0, path_relinking=path_relinking)
+            with mock.patch('JSSP.tabu_search.ts.relink', wraps=relink) as relink_mock:
+                ts_agent.start()
+
+            self.assertEqual(relink_mock.called, path_relinking)
+            for call in relink_mock.call_args_list:
+                initiating_solution, guiding_solution = call.args[:2]
+                self.assertNotEqual(initiating_solution, guiding_solution)
+
+    def test_ts_path_relinking(self):
+        solver = Solver(csv_data)
+        with self.assertRaises(UserWarning):
+            solver.path_relinking()
+
+        solver.tabu_search_iter(50, num_processes=2, num_solutions_per_process=3, neighborhood_size=200)
+        best_solution = solver.solution
+        relinked_solution = solver.path_relinking(num_solutions=4)
+        self.assertIs(solver.solution, relinked_solution)
+        self.assertLessEqual(solver.solution, best_solution)
+
+        # the solutions to relink can be given
+        solutions = csv_data_solution_factory.get_n_solutions(3)
+        solver = Solver(csv_data)
+        self.assertLessEqual(solver.path_relinking(solutions), min(solutions))
+
+    def test_ts_path_relinking_num_threads(self):
+        # the tabu search is continued with the threads of the last one after relinking on several threads,
+        # in a separate interpreter that is killed if the child processes deadlock
+        script = '\n'.join([
+            "from JSSP.solver import Solver",
+            "from tests.util import csv_data",
+            "solver = Solver(csv_data)",
+            "solver.tabu_search_iter(20, num_processes=2, num_solutions_per_process=3, neighborhood_size=200,",
+            "                        num_threads=4)",
+            "solver.path_relinking(num_threads=4)",
+            "solver.continue_tabu_search(iterations=20)",
+            "assert all(ts_agent.num_threads == 4 for ts_agent in solver.ts_agent_list)",
+        ])
+
+        result = subprocess.run([sys.executable, '-c', script], cwd=project_root, capture_output=True, timeout=300)
+        self.assertEqual(0, result.returncode, result.stderr.decode())
+
+    def test_ts_improvement_events(self):
+        iterations = 50
+        results_queue = queue.Queue()
+        initial_solution = csv_data_solution_factory.get_solution()
+        ts_agent = TabuSearchAgent(iterations, False, initial_solution, neighborhood_size=200)
+        ts_agent.start(results_queue)
+
+        results = []
+        while not results_queue.empty():
+            results.append(results_queue.get())
+
+        # improvement events in increasing order of iterations and decreasing order of makespans followed by the agent
+        events = results[:-1]
+        self.assertGreater(len(events), 0)
+        for event in events:
+            self.assertIsInstance(event, TSImprovementEvent)
+            self.assertEqual(event.makespan, event.get_solution(csv_data).makespan)
+        for event1, event2 in zip(events, events[1:]):
+            self.assertLess(event1.iteration, event2.iteration)
+            self.assertLess(event2.makespan, event1.makespan)
+        self.assertLess(events[0].makespan, initial_solution.makespan)
+
+        ts_agent_pickled = loads_without_data(results[-1])
+        self.assertEqual(ts_agent_pickled.best_solution.makespan, events[-1].makespan)
+        # the agent's solutions are bound to the data of this process
+        self.assertIs(ts_agent_pickled.best_solution.data, csv_data)
+
+    def test_ts_iterator(self):
+        iterations = 50
+        num_processes = 2
+
+        solver = Solver(csv_data)
+        improvements = list(solver.iter_tabu_search(iterations=iterations, num_processes=num_processes,
+                                                    neighborhood_size=200))
+
+        self.assertGreater(len(improvements), 1)
+        for improvement1, improvement2 in zip(improvements, improvements[1:]):
+            self.assertLess(improvement2.solution, improvement1.solution)
+        self.assertEqual(solver.solution, improvements[-1].solution)
+        self.assertEqual(len(solver.ts_agent_list), num_processes)
+
+    def test_ts_iterator_spawn(self):
+        iterations = 50
+        num_processes = 2
+
+        start_method = mp.get_start_method()
+        mp.set_start_method('spawn', force=True)
+        try:
+            for cooperative in [False, True]:
+                solver = Solver(csv_data)
+                improvements = list(solver.iter_tabu_search(iterations=iterations, num_processes=num_processes,
+                                                            neighborhood_size=200, cooperative=cooperative,
+                                                            early_stopping=EarlyStopping()))
+
+                self.assertGreater(len(improvements), 1)
+                self.assertEqual(len(solver.ts_agent_list), num_processes)
+                for ts_agent in solver.ts_agent_list:
+                    self.assertIs(ts_agent.best_solution.data, csv_data)
+
+                # the spawned processes only attach to the instance data in shared memory for the duration of the run
+                self.assertFalse(csv_data.is_shared())
+        finally:
+            mp.set_start_method(start_method, force=True)
+
+    def test_ts_iterator_break(self):
+        runtime = 60  # seconds
+
+        solver = Solver(csv_data)
+        improvements = solver.iter_tabu_search(runtime=runtime, num_processes=2, neighborhood_size=200)
+        for improvement in improvements:
+            if improvement.worker_id is not None:
+                break
+        improvements.close()
+
+        # the processes are terminated instead of running for the full runtime
+        self.assertLess(improvement.elapsed_time, runtime)
+        self.assertEqual(solver.solution, improvement.solution)
+        self.assertEqual(solver.ts_agent_list, [])
+
+    def test_ts_async(self):
+        iterations = 50
+        num_processes = 2
+
+        solver = Solver(csv_data)
+        solution = asyncio.run(solver.tabu_search_async(iterations=iterations, num_processes=num_processes,
+                                                        neighborhood_size=200))
+
+        self.assertEqual(solver.solution, solution)
+        self.assertEqual(len(solver.ts_agent_list), num_processes)
+        for ts_agent in solver.ts_agent_list:
+            self.assertEqual(iterations, ts_agent.iterations)
+            self.assertLess(ts_agent.best_solution, ts_agent.initial_solution)
+
+    def test_ts_async_cancel(self):
+        runtime = 60  # seconds
+        solver = Solver(csv_data)
+
+        async def cancel_tabu_search():
+            task = asyncio.ensure_future(solver.tabu_search_async(runtime=runtime, num_processes=2,
+                                                                  neighborhood_size=200))
+            await asyncio.sleep(1)
+            task.cancel()
+            return await task
+
+        solution = asyncio.run(cancel_tabu_search())
+
+        # the best solution found so far is returned and the child processes are terminated
+        self.assertIsNotNone(solution)
+        self.assertEqual(solver.solution, solution)
+        self.assertEqual(solver.ts_agent_list, [])
+        self.assertEqual(mp.active_children(), [])
+
+    def test_ts_early_stopping(self):
+        iterations = 10000
+        num_processes = 2
+
+        # the initial solutions already reach the target makespan
+        solver = Solver(csv_data)
+        solver.tabu_search_iter(iterations, num_processes=num_processes, neighborhood_size=200, benchmark=True,
+                                early_stopping=EarlyStopping(target_makespan=float('inf')))
+
+        self.assertEqual(len(solver.ts_agent_list), num_processes)
+        for ts_agent in solver.ts_agent_list:
+            self.assertEqual(0, ts_agent.benchmark_iterations)
+
+        # all processes stop together as soon as one of them stalls
+        stall_iterations = 20
+        early_stopping = EarlyStopping(stall_iterations=stall_iterations)
+        solver.tabu_search_iter(iterations, num_processes=num_processes, neighborhood_size=200, benchmark=True,
+                                early_stopping=early_stopping)
+
+        self.assertEqual(len(solver.ts_agent_list), num_processes)
+        for ts_agent in solver.ts_agent_list:
+            self.assertLess(ts_agent.benchmark_iterations, iterations)
+        self.assertTrue(early_stopping.is_stopped())
+
+        # the agents of a worker pool update the pool's copy of the criteria, whose state is copied back
+        solver.start_worker_pool(num_processes)
+        try:
+            for stall_iterations, stopped in ((stall_iterations, True), (None, False)):
+                early_stopping = EarlyStopping(stall_iterations=stall_iterations)
+                solver.tabu_search_iter(50 if stall_iterations is None else iterations, num_processes=num_processes,
+                                        neighborhood_size=200, early_stopping=early_stopping)
+                self.assertEqual(stopped, early_stopping.is_stopped())
+                best_makespan = min(ts_agent.best_solution.makespan for ts_agent in solver.ts_agent_list)
+                self.assertEqual(best_makespan, early_stopping._best_makespan.value)
+        finally:
+            solver.close_worker_pool()
+
+    def test_ts_worker_pool(self):
+        iterations = 50
+        num_workers = 2
+
+        solver = Solver(csv_data)
+        solver.start_worker_pool(num_workers)
+        try:
+            worker_pids = {p.pid for p in mp.active_children()}
+            for cooperative in (False, True):
+                solver.tabu_search_iter(iterations, num_processes=num_workers, neighborhood_size=200,
+                                        cooperative=cooperative)
+
+                self.assertEqual(len(solver.ts_agent_list), num_workers)
+                for ts_agent in solver.ts_agent_list:
+                    self.assertEqual(iterations, ts_agent.iterations)
+                    self.assertLess(ts_agent.best_solution, ts_agent.initial_solution)
+
+            # the workers are reused after a run is stopped early
+            for improvement in solver.iter_tabu_search(runtime=60, num_processes=num_workers):
+                if improvement.worker_id is not None:
+                    break
+            solver.tabu_search_iter(iterations, num_processes=1, neighborhood_size=200)
+            self.assertEqual(len(solver.ts_agent_list), 1)
+            self.assertEqual(worker_pids, {p.pid for p in mp.active_children()})
+
+            with self.assertRaises(UserWarning):
+                solver.tabu_search_iter(iterations, num_processes=num_workers + 1)
+        finally:
+            solver.close_worker_pool()
+
+        self.assertEqual(mp.active_children(), [])
+
+    def test_ts_worker_pool_shared_memory(self):
+        solver = Solver(csv_data)
+        solver.start_worker_pool(2)
+        try:
+            self.assertTrue(csv_data.is_shared())
+            block_names = [block.name for block in csv_data._shared_memory.values()]
+            solver.tabu_search_iter(20, num_processes=2, neighborhood_size=200)
+            pickled_solution = pickle.dumps(solver.solution)
+        finally:
+            solver.close_worker_pool()
+
+        # solutions pickled while the pool runs can be unpickled after it is closed
+        self.assertFalse(csv_data.is_shared())
+        self.assertEqual(solver.solution, pickle.loads(pickled_solution))
+        for block_name in block_names:
+            with self.assertRaises(FileNotFoundError):
+                shared_memory.SharedMemory(name=block_name)
+
+        # the shared memory of pools that are not closed is released when they are garbage collected
+        worker_pool = TabuSearchWorkerPool(csv_data, 1)
+        block_names = [block.name for block in csv_data._shared_memory.values()]
+        del worker_pool
+        gc.collect()
+        self.assertFalse(csv_data.is_shared())
+        for block_name in block_names:
+            with self.assertRaises(FileNotFoundError):
+                shared_memory.SharedMemory(name=block_name)
+
+        with TabuSearchWorkerPool(csv_data, 1) as worker_pool:
+            self.assertTrue(csv_data.is_shared())
+        self.assertFalse(csv_data.is_shared())
+        self.assertEqual(mp.active_children(), [])
+
+    def test_ts_checkpoint_resume(self):
+        iterations = 50
+        checkpoint_dir = tmp_dir / 'ts_checkpoints'
+
+        for attribute_tabu in (False, True):
+            solver = Solver(csv_data)
+            solver.tabu_search_iter(iterations, num_processes=2, neighborhood_size=200, benchmark=True,
+                                    attribute_tabu=attribute_tabu, checkpoint_dir=checkpoint_dir,
+                                    checkpoint_interval=0)
+            solution = solver.solution
+
+            # an interrupted agent continues from its checkpoint for the rest of its iterations
+            ts_agent = solver.ts_agent_list[0]
+            state = checkpoint.load_state(checkpoint_dir / 'ts_agent_0.npz')
+            self.assertEqual(iterations, state['iterations'])
+            resumed_agent = TabuSearchAgent(2 * iterations, False, ts_agent.initial_solution, neighborhood_size=200,
+                                            benchmark=True, attribute_tabu=attribute_tabu, resume_state=state)
+            resumed_agent.start()
+            self.assertEqual(2 * iterations, resumed_agent.benchmark_iterations)
+            self.assertLessEqual(resumed_agent.best_solution, ts_agent.best_solution)
+
+            # resuming a finished run returns its best solution
+            solver = Solver(csv_data)
+            self.assertEqual(solution, solver.resume(checkpoint_dir))
+            self.assertEqual(len(solver.ts_agent_list), 2)
+            for ts_agent in solver.ts_agent_list:
+                self.assertEqual(0, len(ts_agent.seed_solution_makespan_v_iter))
+
+        # a cooperative run checkpoints the elite pool, which a resumed agent publishes to its new elite pool
+        solver = Solver(csv_data)
+        solver.tabu_search_iter(iterations, num_processes=2, neighborhood_size=200, cooperative=True,
+                                checkpoint_dir=checkpoint_dir, checkpoint_interval=0)
+        state = checkpoint.load_state(checkpoint_dir / 'ts_agent_0.npz')
+        elite_solutions = [Solution(csv_data, operation_2d_array) for operation_2d_array in state['elite_solutions']]
+        self.assertGreater(len(elite_solutions), 0)
+
+        elite_pool = ElitePool(csv_data, 2)
+        resumed_agent = TabuSearchAgent(iterations, False, solver.ts_agent_list[0].initial_solution,
+                                        neighborhood_size=200, resume_state=state)
+        resumed_agent.start(elite_pool=elite_pool)
+        self.assertGreaterEqual(len(elite_pool), len(elite_solutions))
+        self.assertEqual(min(elite_solutions).makespan, elite_pool.get_solutions()[0].makespan)
+
+    def test_ts_continue(self):
+        iterations = 30
+        num_processes = 2
+
+        solver = Solver(csv_data)
+        with self.assertRaises(UserWarning):
+            solver.continue_tabu_search(iterations=iterations)
+
+        solver.start_worker_pool(num_processes)
+        try:
+            worker_pids = {p.pid for p in mp.active_children()}
+            solver.tabu_search_iter(iterations, num_processes=num_processes, neighborhood_size=200, benchmark=True,
+                                    attribute_tabu=True)
+            ts_agents = solver.ts_agent_list
+            solution = solver.solution
+
+            for _ in range(2):
+                self.assertLessEqual(solver.continue_tabu_search(iterations=iterations), solution)
+                solution = solver.solution
+
+                # the agents continue from where they stopped with their parameters on the worker pool
+                self.assertEqual(worker_pids, {p.pid for p in mp.active_children()})
+                self.assertEqual(len(solver.ts_agent_list), num_processes)
+                for ts_agent in solver.ts_agent_list:
+                    self.assertEqual(iterations, ts_agent.benchmark_iterations)
+                    self.assertTrue(ts_agent.attribute_tabu)
+                    self.assertIn(ts_agent.initial_solution, [agent.initial_solution for agent in ts_agents])
+
+            # the agents stay cooperative unless cooperative is given
+            solver.tabu_search_iter(iterations, num_processes=num_processes, neighborhood_size=200, cooperative=True)
+            self.assertTrue(solver.ts_cooperative)
+            with mock.patch.object(solver.worker_pool, 'run', wraps=solver.worker_pool.run) as run:
+                solver.continue_tabu_search(iterations=iterations)
+                solver.continue_tabu_search(iterations=iterations, cooperative=False)
+                solver.continue_tabu_search(iterations=iterations)
+            self.assertEqual([True, False, False], [call.args[2] for call in run.call_args_list])
+        finally:
+            solver.close_worker_pool()
+
+        with self.assertRaises(UserWarning):
+            solver.continue_tabu_search(runtime=1, iterations=iterations)
+
     def test_ts_multiple_solutions_per_process(self):
         iterations = 10
         tabu_list_size = 50
@@ -0,0 +1,102 @@
+import random
+import unittest
+
+import numpy as np
+
+from JSSP import checkpoint
+from tests.util import tmp_dir, rm_tree
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self) -> None:
+        if not tmp_dir.exists():
+            tmp_dir.mkdir()
+
+    def tearDown(self) -> None:
+        rm_tree(tmp_dir)
+
+    def test_save_load_state(self):
+        state = {'iterations': np.array(10), 'operations': np.arange(40, dtype=np.intc).reshape((10, 4))}
+        checkpoint.save_state(tmp_dir / 'state.npz', state)
+        loaded_state = checkpoint.load_state(tmp_dir / 'state.npz')
+
+        self.assertEqual(state.keys(), loaded_state.keys())
+        self.assertEqual(10, loaded_state['iterations'])
+        self.assertEqual(np.intc, loaded_state['operations'].dtype)
+        np.testing.assert_array_equal(state['operations'], loaded_state['operations'])
+        self.assertFalse((tmp_dir / 'state.npz.tmp').exists())
+
+    def test_checkpoint_writer(self):
+        writer = checkpoint.CheckpointWriter(tmp_dir / 'agent.npz', 60)
+        self.assertFalse(writer.is_due())
+
+        # only the last of the pending states has to be written
+        for i in range(5):
+            writer.write({'iterations': np.array(i)})
+        writer.flush()
+        self.assertFalse(writer.is_due())
+        self.assertEqual(4, checkpoint.load_state(tmp_dir / 'agent.npz')['iterations'])
+
+        writer = checkpoint.CheckpointWriter(tmp_dir / 'agent.npz', 0)
+        self.assertTrue(writer.is_due())
+
+    def test_checkpoint_writer_incremental(self):
+        path = tmp_dir / 'agent.npz'
+        operations = np.arange(40, dtype=np.intc).reshape((10, 4))
+        writer = checkpoint.CheckpointWriter(path, 60)
+
+        # only the nparrays that changed are written to a new segment
+        writer.write({'iterations': np.array(1), 'operations': operations})
+        writer.flush()
+        writer.write({'iterations': np.array(2), 'operations': operations.copy()})
+        writer.flush()
+        self.assertEqual(['agent.0.npz', 'agent.1.npz'], sorted(p.name for p in tmp_dir.glob('agent.*.npz')))
+        with np.load(tmp_dir / 'agent.1.npz') as npz_file:
+            self.assertEqual(['iterations'], npz_file.files)
+
+        loaded_state = checkpoint.load_state(path)
+        self.assertEqual({'iterations', 'operations'}, loaded_state.keys())
+        self.assertEqual(2, loaded_state['iterations'])
+        np.testing.assert_array_equal(operations, loaded_state['operations'])
+
+        # segments that are no longer used are removed
+        writer.write({'iterations': np.array(3), 'operations': operations + 1})
+        writer.flush()
+        self.assertEqual(['agent.2.npz'], sorted(p.name for p in tmp_dir.glob('agent.*.npz')))
+        np.testing.assert_array_equal(operations + 1, checkpoint.load_state(path)['operations'])
+
+        # a new writer does not overwrite the segments of the checkpoint it replaces
+        writer = checkpoint.CheckpointWriter(path, 60)
+        writer.write({'iterations': np.array(4)})
+        writer.flush()
+        self.assertEqual(['agent.3.npz'], sorted(p.name for p in tmp_dir.glob('agent.*.npz')))
+        self.assertEqual({'iterations': 4}, checkpoint.load_state(path))
+
+        checkpoint.remove_checkpoint(path)
+        self.assertEqual([], list(tmp_dir.iterdir()))
+
+    def test_random_states(self):
+        random.seed(1)
+        np.random.seed(1)
+        np.random.normal()  # numpy caches a gaussian
+        state = checkpoint.get_random_states()
+        expected = (random.random(), random.gauss(0, 1), np.random.random(), np.random.normal())
+
+        checkpoint.save_state(tmp_dir / 'random.npz', state)
+        random.seed(2)
+        np.random.seed(2)
+        checkpoint.set_random_states(checkpoint.load_state(tmp_dir / 'random.npz'))
+        self.assertEqual(expected, (random.random(), random.gauss(0, 1), np.random.random(), np.random.normal()))
+
+    def test_manifest(self):
+        with self.assertRaises(UserWarning):
+            checkpoint.read_manifest(tmp_dir)
+
+        manifest = {'algorithm': 'tabu_search', 'stopping_condition': 10.5, 'parameters': {'cooperative': True}}
+        checkpoint.write_manifest(tmp_dir / 'run', manifest)
+        self.assertEqual(manifest, checkpoint.read_manifest(tmp_dir / 'run'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,12 @@
+import pickle
 import unittest
 
 import numpy as np
 import pandas as pd
 
 from JSSP import data
-from tests.util import project_root, tmp_dir, get_files_with_suffix, rm_tree
+from JSSP.solution import SolutionFactory
+from tests.util import project_root, tmp_dir, get_files_with_suffix, rm_tree, csv_data
 
 
 class TestData(unittest.TestCase):
@@ -109,6 +111,95 @@ class TestData(unittest.TestCase):
             self.assertIsNotNone(fjs_data.total_number_of_machines)
             self.assertIsNotNone(fjs_data.max_tasks_for_a_job)
 
+    def test_makespan_lower_bound(self):
+        fjs_data = data.FJSData(project_root / 'data/fjs_data/Brandimarte/Brandimarte_Mk01.fjs')
+        self.assertLessEqual(fjs_data.get_makespan_lower_bound(), 40)  # optimal makespan of Mk01
+
+        for instance_data in (csv_data, fjs_data):
+            lower_bound = instance_data.get_makespan_lower_bound()
+            self.assertGreater(lower_bound, 0)
+            for solution in SolutionFactory(instance_data).get_n_solutions(20):
+                self.assertLessEqual(lower_bound, solution.makespan)
+
+    def test_fingerprint(self):
+        mk10_path = project_root / 'data/fjs_data/Brandimarte/Brandimarte_Mk10.fjs'
+        fjs_data = data.FJSData(mk10_path)
+
+        self.assertEqual(fjs_data.get_fingerprint(), data.FJSData(mk10_path).get_fingerprint())
+        self.assertEqual(fjs_data.get_fingerprint(), pickle.loads(pickle.dumps(fjs_data)).get_fingerprint())
+        self.assertNotEqual(fjs_data.get_fingerprint(), csv_data.get_fingerprint())
+        self.assertEqual(fjs_data.get_fingerprint(), data.find_data(fjs_data.get_fingerprint()).get_fingerprint())
+        self.assertIs(data.find_data(csv_data.get_fingerprint()), csv_data)
+        self.assertIsNone(data.find_data('unknown'))
+
+    def test_pickle_without_data(self):
+        solutions = SolutionFactory(csv_data).get_n_solutions(5)
+        pickled_solutions = data.dumps_without_data(solutions)
+
+        # the instance data is pickled as its fingerprint and bound to the data of this process
+        self.assertLess(len(pickled_solutions), len(pickle.dumps(csv_data)))
+        self.assertNotIn(b'sequence_dependency_matrix', pickled_solutions)
+        unpickled_solutions = data.loads_without_data(pickled_solutions)
+        self.assertEqual(solutions, unpickled_solutions)
+        for solution in unpickled_solutions:
+            self.assertIs(solution.data, csv_data)
+
+        fjs_data = data.FJSData(project_root / 'data/fjs_data/Brandimarte/Brandimarte_Mk10.fjs')
+        pickled_solution = data.dumps_without_data(SolutionFactory(fjs_data).get_solution())
+        del fjs_data
+        with self.assertRaises(UserWarning):
+            data.loads_without_data(pickled_solution)
+
+    def test_shared_memory(self):
+        fjs_data = data.FJSData(project_root / 'data/fjs_data/Brandimarte/Brandimarte_Mk10.fjs')
+        matrices = [np.copy(fjs_data.sequence_dependency_matrix), np.copy(fjs_data.task_processing_times_matrix)]
+        pickled_size = len(pickle.dumps(fjs_data))
+
+        self.assertIs(fjs_data, fjs_data.get_shared_reference())
+
+        fjs_data.share_memory()
+        try:
+            self.assertTrue(fjs_data.is_shared())
+            pickled_reference = pickle.dumps(fjs_data.get_shared_reference())
+            self.assertLess(len(pickled_reference), pickled_size - matrices[0].nbytes)
+
+            # the unpickled reference is a copy that attaches to the same memory
+            fjs_data_copy = pickle.loads(pickled_reference)
+            self.assertIsInstance(fjs_data_copy, data.FJSData)
+            self.assertTrue(fjs_data_copy.is_shared())
+            np.testing.assert_array_equal(matrices[0], fjs_data_copy.sequence_dependency_matrix)
+            np.testing.assert_array_equal(matrices[1], fjs_data_copy.task_processing_times_matrix)
+            fjs_data.sequence_dependency_matrix[0, 0] += 1
+            self.assertEqual(fjs_data.sequence_dependency_matrix[0, 0], fjs_data_copy.sequence_dependency_matrix[0, 0])
+            fjs_data.sequence_dependency_matrix[0, 0] -= 1
+
+            # ordinary pickles hold the matrices
+            pickled_data = pickle.dumps(fjs_data)
+            self.assertEqual(pickled_size, len(pickled_data))
+        finally:
+            fjs_data.release_shared_memory()
+
+        self.assertFalse(fjs_data.is_shared())
+        np.testing.assert_array_equal(matrices[0], fjs_data.sequence_dependency_matrix)
+        self.assertEqual(pickled_size, len(pickle.dumps(fjs_data)))
+
+        # the pickles can be unpickled after the shared memory is released
+        fjs_data_copy = pickle.loads(pickled_data)
+        self.assertFalse(fjs_data_copy.is_shared())
+        np.testing.assert_array_equal(matrices[0], fjs_data_copy.sequence_dependency_matrix)
+        with self.assertRaises(FileNotFoundError):
+            pickle.loads(pickled_reference)
+
+    def test_unpickle_without_shared_memory_attributes(self):
+        state = csv_data.__getstate__()
+        for name in ('_shared_memory', '_owns_shared_memory', '_shared_reference', '_fingerprint'):
+            del state[name]
+
+        csv_data_unpickled = data.SpreadsheetData.__new__(data.SpreadsheetData)
+        csv_data_unpickled.__setstate__(state)
+        self.assertFalse(csv_data_unpickled.is_shared())
+        self.assertEqual(csv_data.get_fingerprint(), csv_data_unpickled.get_fingerprint())
+
     def test_attempt_create_base_class_data(self):
         try:
             data.Data()
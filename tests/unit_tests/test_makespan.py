@@ -2,9 +2,15 @@ import pickle
 import unittest
 from pathlib import Path
 
-from JSSP.solution._makespan import compute_machine_makespans
+import numpy as np
 
-from tests.util import csv_data
+from JSSP.exception import InfeasibleSolutionException
+from JSSP.solution._makespan import compute_machine_makespans, compute_machine_makespans_batch, MakespanCheckpoints, \
+    MakespanWorkspace, INFEASIBLE_MAKESPAN, DOMINATED_MAKESPAN, compute_critical_path, compute_operation_times, \
+    compute_operation_hash, compute_move_hashes
+from JSSP.tabu_search._generate_neighbor import generate_neighbor, generate_neighbor_array, generate_neighbor_move, \
+    generate_critical_path_moves, apply_move, NeighborGenerator
+from tests.util import csv_data, csv_data_solution_factory
 
 
 class TestMakespan(unittest.TestCase):
@@ -72,5 +78,285 @@ class TestMakespan(unittest.TestCase):
                                                                            csv_data.job_task_index_matrix)))
 
 
+class TestMakespanWorkspace(unittest.TestCase):
+
+    def test_workspace_makespans(self):
+        workspace = MakespanWorkspace(csv_data.task_processing_times_matrix,
+                                      csv_data.sequence_dependency_matrix,
+                                      csv_data.job_task_index_matrix)
+        machine_makespans = np.empty(csv_data.total_number_of_machines)
+
+        # the same workspace is reused for every solution
+        for solution in csv_data_solution_factory.get_n_solutions(20):
+            expected = compute_machine_makespans(solution.operation_2d_array,
+                                                 csv_data.task_processing_times_matrix,
+                                                 csv_data.sequence_dependency_matrix,
+                                                 csv_data.job_task_index_matrix)
+
+            makespan = workspace.compute_makespan(solution.operation_2d_array, machine_makespans)
+            self.assertEqual(list(expected), list(machine_makespans))
+            self.assertEqual(max(expected), makespan)
+
+    def test_workspace_infeasible(self):
+        workspace = MakespanWorkspace(csv_data.task_processing_times_matrix,
+                                      csv_data.sequence_dependency_matrix,
+                                      csv_data.job_task_index_matrix)
+        operation_2d_array = np.copy(csv_data_solution_factory.get_solution().operation_2d_array)
+        operation_2d_array[[0, 200]] = operation_2d_array[[200, 0]]
+
+        self.assertEqual(INFEASIBLE_MAKESPAN,
+                         workspace.compute_makespan(operation_2d_array, np.empty(csv_data.total_number_of_machines)))
+
+    def test_workspace_cutoff(self):
+        workspace = MakespanWorkspace(csv_data.task_processing_times_matrix,
+                                      csv_data.sequence_dependency_matrix,
+                                      csv_data.job_task_index_matrix)
+        solution = csv_data_solution_factory.get_solution()
+        machine_makespans = np.empty(csv_data.total_number_of_machines)
+
+        self.assertEqual(solution.makespan,
+                         workspace.compute_makespan(solution.operation_2d_array, machine_makespans, solution.makespan))
+        self.assertEqual(DOMINATED_MAKESPAN,
+                         workspace.compute_makespan(solution.operation_2d_array, machine_makespans,
+                                                    solution.makespan - 1))
+
+    def test_workspace_machine_makespans_size(self):
+        workspace = MakespanWorkspace(csv_data.task_processing_times_matrix,
+                                      csv_data.sequence_dependency_matrix,
+                                      csv_data.job_task_index_matrix)
+        operation_2d_array = csv_data_solution_factory.get_solution().operation_2d_array
+
+        with self.assertRaises(ValueError):
+            workspace.compute_makespan(operation_2d_array, np.empty(csv_data.total_number_of_machines - 1))
+
+    def test_batch_cutoff(self):
+        solutions = csv_data_solution_factory.get_n_solutions(20)
+        cutoff = sorted(solution.makespan for solution in solutions)[10]
+
+        machine_makespans, admissible = compute_machine_makespans_batch(
+            np.stack([solution.operation_2d_array for solution in solutions]),
+            csv_data.task_processing_times_matrix,
+            csv_data.sequence_dependency_matrix,
+            csv_data.job_task_index_matrix,
+            cutoff=cutoff)
+
+        self.assertEqual([solution.makespan <= cutoff for solution in solutions], list(admissible))
+
+
+class TestMakespanCheckpoints(unittest.TestCase):
+
+    def test_checkpoints_integrity(self):
+        for interval in [0, 1, 7, 1000]:
+            solution = csv_data_solution_factory.get_solution()
+            checkpoints = MakespanCheckpoints(solution.operation_2d_array,
+                                              csv_data.task_processing_times_matrix,
+                                              csv_data.sequence_dependency_matrix,
+                                              csv_data.job_task_index_matrix,
+                                              interval)
+
+            for first_changed_row in [0, 1, solution.operation_2d_array.shape[0] // 2,
+                                      solution.operation_2d_array.shape[0] - 1]:
+                self.assertEqual(list(solution.machine_makespans),
+                                 list(checkpoints.compute_machine_makespans(solution.operation_2d_array,
+                                                                            first_changed_row)))
+
+    def test_checkpoints_machine_makespans_size(self):
+        solution = csv_data_solution_factory.get_solution()
+        checkpoints = MakespanCheckpoints(solution.operation_2d_array,
+                                          csv_data.task_processing_times_matrix,
+                                          csv_data.sequence_dependency_matrix,
+                                          csv_data.job_task_index_matrix)
+
+        with self.assertRaises(ValueError):
+            checkpoints.compute_makespan(solution.operation_2d_array, 0,
+                                         np.empty(csv_data.total_number_of_machines + 1))
+
+    def test_neighbor_makespans(self):
+        solution = csv_data_solution_factory.get_solution()
+        for _ in range(100):
+            try:
+                neighbor = generate_neighbor(solution, 0.8, csv_data.job_task_index_matrix,
+                                             csv_data.usable_machines_matrix)
+            except InfeasibleSolutionException:
+                continue
+
+            machine_makespans = compute_machine_makespans(neighbor.operation_2d_array,
+                                                          csv_data.task_processing_times_matrix,
+                                                          csv_data.sequence_dependency_matrix,
+                                                          csv_data.job_task_index_matrix)
+            np.testing.assert_allclose(machine_makespans, neighbor.machine_makespans)
+
+
+class TestMakespanBatch(unittest.TestCase):
+
+    def test_batch_makespans(self):
+        solutions = csv_data_solution_factory.get_n_solutions(20)
+        operation_3d_array = np.stack([solution.operation_2d_array for solution in solutions])
+
+        # make the last candidate infeasible
+        operation_3d_array[-1, [0, 200]] = operation_3d_array[-1, [200, 0]]
+
+        for num_threads in [1, 4]:
+            machine_makespans, feasible = compute_machine_makespans_batch(operation_3d_array,
+                                                                          csv_data.task_processing_times_matrix,
+                                                                          csv_data.sequence_dependency_matrix,
+                                                                          csv_data.job_task_index_matrix,
+                                                                          num_threads)
+
+            self.assertEqual((len(solutions), csv_data.total_number_of_machines), machine_makespans.shape)
+            self.assertEqual([True] * (len(solutions) - 1) + [False], list(feasible))
+            for i, solution in enumerate(solutions[:-1]):
+                self.assertEqual(list(solution.machine_makespans), list(machine_makespans[i]))
+
+    def test_checkpoints_batch_makespans(self):
+        solution = csv_data_solution_factory.get_solution()
+        neighbor_arrays = []
+        first_changed_rows = []
+        for _ in range(100):
+            neighbor_array, first_changed_row = generate_neighbor_array(solution, 0.8, csv_data.job_task_index_matrix,
+                                                                        csv_data.usable_machines_matrix)
+            neighbor_arrays.append(neighbor_array)
+            first_changed_rows.append(first_changed_row)
+
+        machine_makespans, feasible = solution.get_makespan_checkpoints().compute_machine_makespans_batch(
+            np.stack(neighbor_arrays), np.array(first_changed_rows, dtype=np.intp), 4)
+
+        for i, neighbor_array in enumerate(neighbor_arrays):
+            try:
+                expected = compute_machine_makespans(neighbor_array,
+                                                     csv_data.task_processing_times_matrix,
+                                                     csv_data.sequence_dependency_matrix,
+                                                     csv_data.job_task_index_matrix)
+                self.assertTrue(feasible[i])
+                self.assertEqual(list(expected), list(machine_makespans[i]))
+            except InfeasibleSolutionException:
+                self.assertFalse(feasible[i])
+
+
+class TestMakespanMoves(unittest.TestCase):
+
+    def test_apply_move(self):
+        solution = csv_data_solution_factory.get_solution()
+        for _ in range(100):
+            from_index, to_index, machine = generate_neighbor_move(solution, 0.8, csv_data.job_task_index_matrix,
+                                                                   csv_data.usable_machines_matrix)
+            operation = np.copy(solution.operation_2d_array[from_index])
+            operation[3] = machine
+            expected = np.insert(np.delete(solution.operation_2d_array, from_index, axis=0), to_index, operation, axis=0)
+            self.assertTrue(np.array_equal(expected, apply_move(solution.operation_2d_array, from_index, to_index, machine)))
+
+    def test_move_makespans(self):
+        solution = csv_data_solution_factory.get_solution()
+        moves = np.array([generate_neighbor_move(solution, 0.8, csv_data.job_task_index_matrix,
+                                                 csv_data.usable_machines_matrix) for _ in range(100)], dtype=np.intc)
+
+        for num_threads in [1, 4]:
+            machine_makespans, feasible = solution.get_makespan_checkpoints().compute_move_makespans_batch(moves,
+                                                                                                           num_threads)
+            self.assertEqual((len(moves), csv_data.total_number_of_machines), machine_makespans.shape)
+            for i, (from_index, to_index, machine) in enumerate(moves):
+                try:
+                    expected = compute_machine_makespans(apply_move(solution.operation_2d_array, from_index,
+                                                                    to_index, machine),
+                                                         csv_data.task_processing_times_matrix,
+                                                         csv_data.sequence_dependency_matrix,
+                                                         csv_data.job_task_index_matrix)
+                    self.assertTrue(feasible[i])
+                    self.assertEqual(list(expected), list(machine_makespans[i]))
+                except InfeasibleSolutionException:
+                    self.assertFalse(feasible[i])
+
+    def test_neighbor_generator_moves(self):
+        solution = csv_data_solution_factory.get_solution()
+        moves = NeighborGenerator(0).generate_moves(solution, 200, 0.8, csv_data.job_task_index_matrix,
+                                                    csv_data.usable_machines_matrix)
+
+        self.assertEqual((200, 3), moves.shape)
+        self.assertTrue((moves[:, 0] != moves[:, 1]).all(), "Moves should not put an operation back in its place")
+        self.assertTrue(np.array_equal(moves, NeighborGenerator(0).generate_moves(solution, 200, 0.8,
+                                                                                  csv_data.job_task_index_matrix,
+                                                                                  csv_data.usable_machines_matrix)))
+
+        machine_makespans, feasible = solution.get_makespan_checkpoints().compute_move_makespans_batch(moves)
+        for i, (from_index, to_index, machine) in enumerate(moves):
+            self.assertIn(machine, csv_data.usable_machines_matrix[csv_data.job_task_index_matrix[
+                solution.operation_2d_array[from_index, 0], solution.operation_2d_array[from_index, 1]]])
+            if feasible[i]:
+                neighbor = apply_move(solution.operation_2d_array, from_index, to_index, machine)
+                self.assertEqual(list(compute_machine_makespans(neighbor, csv_data.task_processing_times_matrix,
+                                                                csv_data.sequence_dependency_matrix,
+                                                                csv_data.job_task_index_matrix)),
+                                 list(machine_makespans[i]))
+
+    def test_move_hashes(self):
+        solution = csv_data_solution_factory.get_solution()
+        moves = NeighborGenerator(2).generate_moves(solution, 200, 0.8, csv_data.job_task_index_matrix,
+                                                    csv_data.usable_machines_matrix)
+        operation_hashes = compute_move_hashes(solution.operation_2d_array, solution.operation_hash, moves)
+
+        self.assertEqual(compute_operation_hash(solution.operation_2d_array), solution.operation_hash)
+        for i, (from_index, to_index, machine) in enumerate(moves):
+            neighbor = apply_move(solution.operation_2d_array, from_index, to_index, machine)
+            self.assertEqual(compute_operation_hash(neighbor), operation_hashes[i])
+
+    def test_pickle_neighbor_generator(self):
+        solution = csv_data_solution_factory.get_solution()
+        neighbor_generator = NeighborGenerator(1)
+        neighbor_generator.generate_moves(solution, 10, 0.8, csv_data.job_task_index_matrix,
+                                          csv_data.usable_machines_matrix)
+        neighbor_generator_pickled = pickle.loads(pickle.dumps(neighbor_generator))
+
+        self.assertTrue(np.array_equal(
+            neighbor_generator.generate_moves(solution, 10, 0.8, csv_data.job_task_index_matrix,
+                                              csv_data.usable_machines_matrix),
+            neighbor_generator_pickled.generate_moves(solution, 10, 0.8, csv_data.job_task_index_matrix,
+                                                      csv_data.usable_machines_matrix)))
+
+
+class TestCriticalPath(unittest.TestCase):
+
+    def test_critical_path(self):
+        solution = csv_data_solution_factory.get_solution()
+        critical_path = compute_critical_path(solution.operation_2d_array,
+                                              csv_data.task_processing_times_matrix,
+                                              csv_data.sequence_dependency_matrix,
+                                              csv_data.job_task_index_matrix)
+        operation_times = compute_operation_times(solution.operation_2d_array,
+                                                  csv_data.task_processing_times_matrix,
+                                                  csv_data.sequence_dependency_matrix,
+                                                  csv_data.job_task_index_matrix)
+
+        # the critical path starts at time 0, has no idle time, and ends with the makespan
+        self.assertEqual(0, operation_times['start'][critical_path[0]])
+        self.assertAlmostEqual(solution.makespan, operation_times['end'][critical_path[-1]])
+        for row, next_row in zip(critical_path[:-1], critical_path[1:]):
+            self.assertLess(row, next_row)
+            self.assertAlmostEqual(operation_times['end'][row], operation_times['start'][next_row])
+
+    def test_critical_path_moves(self):
+        solution = csv_data_solution_factory.get_solution()
+        moves = generate_critical_path_moves(solution, True, csv_data.job_task_index_matrix,
+                                             csv_data.usable_machines_matrix)
+        critical_path = compute_critical_path(solution.operation_2d_array,
+                                              csv_data.task_processing_times_matrix,
+                                              csv_data.sequence_dependency_matrix,
+                                              csv_data.job_task_index_matrix)
+
+        self.assertGreater(len(moves), 0)
+        self.assertTrue(np.isin(moves[:, 0], critical_path).all(), "Only critical operations should be moved")
+
+        # moves can still be infeasible because of the sequence dependencies, but never because of the job order
+        for from_index, to_index, machine in moves:
+            neighbor = apply_move(solution.operation_2d_array, from_index, to_index, machine)
+            for job_id in range(csv_data.total_number_of_jobs):
+                sequences = neighbor[neighbor[:, 0] == job_id, 2]
+                self.assertTrue((np.diff(sequences) >= 0).all(),
+                                "Critical path moves should keep the sequence order of the jobs")
+
+        moves = generate_critical_path_moves(solution, False, csv_data.job_task_index_matrix,
+                                             csv_data.usable_machines_matrix)
+        self.assertTrue((moves[:, 2] == solution.operation_2d_array[moves[:, 0], 3]).all())
+
+
 if __name__ == '__main__':
     unittest.main()
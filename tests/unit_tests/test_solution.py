@@ -1,3 +1,4 @@
+import datetime
 import pickle
 import unittest
 
@@ -24,25 +25,29 @@ class TestSolution(unittest.TestCase):
 
     def test_solution_less_than(self):
         solution_obj1 = csv_data_solution_factory.get_solution()
-        solution_obj2 = Solution(csv_data, solution_obj1.operation_2d_array)
-        solution_obj2.makespan -= 1
+        machine_makespans = np.asarray(solution_obj1.machine_makespans)
+        solution_obj2 = Solution(csv_data, solution_obj1.operation_2d_array, machine_makespans - 1)
 
         self.assertLess(solution_obj2, solution_obj1, "solution_obj2 should be less than solution_obj1")
 
-        solution_obj2.makespan += 1
-        solution_obj2.machine_makespans[0] -= 1
+        # same makespan, but a lower machine makespan on the least loaded machine
+        machine_makespans = machine_makespans.copy()
+        machine_makespans[np.argmin(machine_makespans)] -= 1
+        solution_obj2 = Solution(csv_data, solution_obj1.operation_2d_array, machine_makespans)
 
         self.assertLess(solution_obj2, solution_obj1, "solution_obj2 should be less than solution_obj1")
 
     def test_solution_greater_than(self):
         solution_obj1 = csv_data_solution_factory.get_solution()
-        solution_obj2 = Solution(csv_data, solution_obj1.operation_2d_array)
-        solution_obj2.makespan -= 1
+        machine_makespans = np.asarray(solution_obj1.machine_makespans)
+        solution_obj2 = Solution(csv_data, solution_obj1.operation_2d_array, machine_makespans - 1)
 
         self.assertGreater(solution_obj1, solution_obj2, "solution_obj2 should be greater than solution_obj1")
 
-        solution_obj2.makespan += 1
-        solution_obj2.machine_makespans[0] -= 1
+        # same makespan, but a lower machine makespan on the least loaded machine
+        machine_makespans = machine_makespans.copy()
+        machine_makespans[np.argmin(machine_makespans)] -= 1
+        solution_obj2 = Solution(csv_data, solution_obj1.operation_2d_array, machine_makespans)
 
         self.assertGreater(solution_obj1, solution_obj2, "solution_obj2 should be greater than solution_obj1")
 
@@ -51,12 +56,31 @@ class TestSolution(unittest.TestCase):
         for i in range(1, len(lst)):
             self.assertLess(lst[i - 1], lst[i], "lst should be in sorted order")
 
+    def test_solution_comparison_key(self):
+        solution_obj = csv_data_solution_factory.get_solution()
+        self.assertEqual((solution_obj.makespan,) + tuple(sorted(solution_obj.machine_makespans, reverse=True)),
+                         solution_obj.comparison_key)
+        self.assertEqual(solution_obj.makespan, solution_obj.comparison_key[1])
+
     def test_solution_in_list(self):
         sol1 = csv_data_solution_factory.get_solution()
         sol2 = Solution(csv_data, sol1.operation_2d_array)
         lst = [sol1]
         self.assertIn(sol2, lst)
 
+    def test_solution_hash(self):
+        sol1 = csv_data_solution_factory.get_solution()
+        sol2 = Solution(csv_data, np.copy(sol1.operation_2d_array))
+        self.assertEqual(hash(sol1), hash(sol2))
+        self.assertEqual(1, len({sol1, sol2}))
+
+        # swapping two operations of different jobs changes the hash
+        operation_2d_array = np.copy(sol1.operation_2d_array)
+        row = np.flatnonzero(operation_2d_array[:, 0] != operation_2d_array[0, 0])[0]
+        operation_2d_array[[0, row]] = operation_2d_array[[row, 0]]
+        self.assertNotEqual(sol1.operation_hash, Solution(csv_data, operation_2d_array,
+                                                          sol1.machine_makespans).operation_hash)
+
     def test_infeasible_solution(self):
         try:
             solution_obj = csv_data_solution_factory.get_solution()
@@ -79,6 +103,40 @@ class TestSolution(unittest.TestCase):
             pass
 
 
+class TestOperationTimes(unittest.TestCase):
+
+    def test_continuous_operation_times(self):
+        solution_obj = csv_data_solution_factory.get_solution()
+        start_date = datetime.date(2020, 1, 1)
+        start_time = datetime.time(hour=8)
+        operation_times = solution_obj.get_operation_times(start_date, start_time, continuous=True)
+
+        self.assertEqual(solution_obj.operation_2d_array.shape[0], operation_times.shape[0])
+        np.testing.assert_array_equal(solution_obj.operation_2d_array[:, [0, 1, 3]],
+                                      np.column_stack([operation_times['job_id'],
+                                                       operation_times['task_id'],
+                                                       operation_times['machine']]))
+
+        start_datetime = np.datetime64(datetime.datetime.combine(start_date, start_time), 'us')
+        for machine, machine_makespan in enumerate(solution_obj.machine_makespans):
+            runtime_ends = operation_times['runtime_end'][operation_times['machine'] == machine]
+            if len(runtime_ends) > 0:
+                self.assertAlmostEqual(machine_makespan, (runtime_ends[-1] - start_datetime) / np.timedelta64(1, 'm'),
+                                       places=4, msg="The last operation on a machine should end at its makespan")
+
+    def test_operation_list_for_machine(self):
+        solution_obj = csv_data_solution_factory.get_solution()
+        operation_times = solution_obj.get_operation_times(continuous=False)
+        operations = solution_obj.get_operation_list_for_machine(continuous=False, machines=[0, 2])
+
+        machine_operation_times = operation_times[np.isin(operation_times['machine'], [0, 2])]
+        self.assertEqual(len(machine_operation_times), len(operations))
+        for operation, times in zip(operations, machine_operation_times):
+            self.assertIn(operation.machine, [0, 2])
+            self.assertEqual(times['setup_start'].item(), operation.setup_start_time)
+            self.assertEqual(times['runtime_end'].item(), operation.runtime_end_time)
+
+
 class TestPicklingSolution(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -99,6 +157,19 @@ class TestPicklingSolution(unittest.TestCase):
             solution_obj_pickled = pickle.load(fin)
 
         self.assertEqual(solution_obj, solution_obj_pickled, "The pickled solution should be equal to solution_obj")
+        self.assertEqual(solution_obj.operation_hash, solution_obj_pickled.operation_hash)
+        self.assertEqual(solution_obj.comparison_key, solution_obj_pickled.comparison_key)
+        self.assertEqual(solution_obj.data.get_fingerprint(), solution_obj_pickled.data.get_fingerprint())
+
+    def test_unpickle_without_operation_hash(self):
+        solution_obj = csv_data_solution_factory.get_solution()
+        state = solution_obj.__getstate__()
+        del state['operation_hash']
+
+        solution_obj_unpickled = Solution.__new__(Solution)
+        solution_obj_unpickled.__setstate__(state)
+        self.assertEqual(solution_obj.operation_hash, solution_obj_unpickled.operation_hash)
+        self.assertEqual(solution_obj, solution_obj_unpickled)
 
 
 if __name__ == '__main__':
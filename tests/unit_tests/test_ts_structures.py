@@ -1,8 +1,17 @@
+import pickle
+import time
 import unittest
+from unittest import mock
 
-from JSSP.tabu_search.ts import _SolutionSet, _TabuList
-from JSSP.util import Heap
-from tests.util import csv_data_solution_factory
+import numpy as np
+
+from JSSP.solution import Solution
+from JSSP.tabu_search._generate_neighbor import apply_move
+from JSSP.tabu_search.path_relinking import relink, _get_relinking_moves
+from JSSP.tabu_search.ts import ElitePool, _SolutionSet, _TabuList, _AttributeTabuList, _MoveNeighborhood, \
+    _unique_moves
+from JSSP.util import Heap, EarlyStopping, TraceRecorder, get_stop_condition
+from tests.util import csv_data, csv_data_solution_factory
 
 
 class TestTSStructures(unittest.TestCase):
@@ -75,6 +84,124 @@ class TestTSStructures(unittest.TestCase):
             self.assertFalse(lst[i] in tabu_list)
             i += 1
 
+    def test_attribute_tabu_list(self):
+        solution = csv_data_solution_factory.get_solution()
+        tenure = 3
+        tabu_list = _AttributeTabuList(csv_data, tenure)
+
+        from_index, to_index = 10, 20
+        machine = solution.operation_2d_array[from_index, 3]
+        other_machine = next(m for m in csv_data.usable_machines_matrix[
+            csv_data.job_task_index_matrix[solution.operation_2d_array[from_index, 0],
+                                           solution.operation_2d_array[from_index, 1]]] if m != machine)
+        tabu_list.put_move(solution, np.array([from_index, to_index, other_machine]))
+        self.assertEqual(2, len(tabu_list))
+
+        # in the neighbor the moved operation is at to_index on other_machine
+        neighbor_operation_2d_array = np.insert(np.delete(solution.operation_2d_array, from_index, axis=0), to_index,
+                                                solution.operation_2d_array[from_index], axis=0)
+        neighbor_operation_2d_array[to_index, 3] = other_machine
+        neighbor = csv_data_solution_factory.get_solution()
+        neighbor.operation_2d_array = neighbor_operation_2d_array
+
+        moves = np.array([[to_index, from_index, other_machine],   # back to its previous position
+                          [to_index, to_index, machine],           # back to its previous machine
+                          [to_index, to_index + 1, other_machine],
+                          [from_index, to_index, neighbor_operation_2d_array[from_index, 3]]], dtype=np.intc)
+        self.assertEqual([True, True, False, False], list(tabu_list.tabu_mask(neighbor, moves)))
+
+        # the attributes expire after tenure moves
+        for _ in range(tenure):
+            tabu_list.put_move(neighbor, moves[3])
+        self.assertEqual([False, False], list(tabu_list.tabu_mask(neighbor, moves[:2])))
+
+    def test_move_neighborhood_order(self):
+        solution = csv_data_solution_factory.get_solution()
+        num_moves = 300
+
+        # few distinct values so that there are many ties in the makespans and machine makespans
+        machine_makespans = np.random.randint(0, 5, size=(num_moves, csv_data.total_number_of_machines)).astype(np.float64)
+        neighborhood = _MoveNeighborhood(solution, np.zeros((num_moves, 3), dtype=np.intc), machine_makespans,
+                                         np.zeros(num_moves, dtype=np.uint64))
+
+        expected = sorted(range(num_moves), key=lambda i: sorted(machine_makespans[i], reverse=True))
+        self.assertEqual(expected, list(neighborhood.iter_sorted_indices()))
+
+    def test_unique_moves(self):
+        solution = csv_data_solution_factory.get_solution()
+        num_operations = solution.operation_2d_array.shape[0]
+        moves = np.array([[0, 1, solution.operation_2d_array[0, 3]],  # swapping adjacent operations is the same
+                          [1, 0, solution.operation_2d_array[1, 3]],  # neighbor in both directions
+                          [2, 5, solution.operation_2d_array[2, 3]],
+                          [num_operations - 1, 3, solution.operation_2d_array[num_operations - 1, 3]]],
+                         dtype=np.intc)
+
+        unique_moves, operation_hashes = _unique_moves(solution, moves)
+        self.assertEqual([0, 2, 3], [moves.tolist().index(move) for move in unique_moves.tolist()])
+
+        # neighbors whose hashes collide are compared exactly instead of being removed
+        with mock.patch('JSSP.tabu_search.ts.compute_move_hashes',
+                        return_value=np.zeros(moves.shape[0], dtype=np.uint64)):
+            unique_moves, operation_hashes = _unique_moves(solution, moves)
+        self.assertEqual([0, 2, 3], [moves.tolist().index(move) for move in unique_moves.tolist()])
+        self.assertEqual([0, 0, 0], list(operation_hashes))
+
+    def test_elite_pool(self):
+        pool_size = 3
+        elite_pool = ElitePool(csv_data, pool_size)
+        self.assertEqual(0, len(elite_pool))
+        self.assertIsNone(elite_pool.get_solution())
+
+        solutions = sorted(csv_data_solution_factory.get_n_solutions(10))
+        for solution in reversed(solutions):
+            self.assertTrue(elite_pool.publish(solution))
+
+        # the pool keeps the best solutions and rejects duplicates
+        self.assertEqual(pool_size, len(elite_pool))
+        self.assertFalse(elite_pool.publish(solutions[0]))
+        self.assertEqual(solutions[:pool_size], elite_pool.get_solutions())
+
+        for _ in range(10):
+            solution = elite_pool.get_solution(exclude=solutions[0])
+            self.assertIn(solution, solutions[1:pool_size])
+            self.assertEqual(solution.makespan, solutions[solutions.index(solution)].makespan)
+
+    def test_relinking_moves(self):
+        initiating_solution, guiding_solution = csv_data_solution_factory.get_n_solutions(2)
+        guiding_operation_2d_array = guiding_solution.operation_2d_array
+        task_indices = csv_data.job_task_index_matrix[guiding_operation_2d_array[:, 0], guiding_operation_2d_array[:, 1]]
+        guiding_rows = np.empty(csv_data.total_number_of_tasks, dtype=np.intp)
+        guiding_rows[task_indices] = np.arange(csv_data.total_number_of_tasks)
+        guiding_machines = np.empty(csv_data.total_number_of_tasks, dtype=np.intc)
+        guiding_machines[task_indices] = guiding_operation_2d_array[:, 3]
+
+        # any of the moves takes a step closer to the guiding solution, so that the path reaches it
+        operation_2d_array = initiating_solution.operation_2d_array
+        for _ in range(2 * csv_data.total_number_of_tasks):
+            moves = _get_relinking_moves(operation_2d_array, csv_data.job_task_index_matrix, guiding_rows,
+                                         guiding_machines)
+            if moves.shape[0] == 0:
+                break
+            from_index, to_index, machine = moves[np.random.randint(moves.shape[0])]
+            operation_2d_array = apply_move(operation_2d_array, from_index, to_index, machine)
+
+        np.testing.assert_array_equal(guiding_operation_2d_array, operation_2d_array)
+
+    def test_relink(self):
+        initiating_solution, guiding_solution = csv_data_solution_factory.get_n_solutions(2)
+        relinked_solution = relink(initiating_solution, guiding_solution)
+
+        self.assertIsNotNone(relinked_solution)
+        self.assertNotEqual(initiating_solution, relinked_solution)
+        self.assertNotEqual(guiding_solution, relinked_solution)
+
+        # the machine makespans and hash computed from the moves match the ones computed from scratch
+        solution = Solution(csv_data, relinked_solution.operation_2d_array)
+        self.assertEqual(solution.operation_hash, relinked_solution.operation_hash)
+        np.testing.assert_allclose(solution.machine_makespans, relinked_solution.machine_makespans)
+
+        self.assertIsNone(relink(guiding_solution, guiding_solution))
+
     def test_max_heap(self):
 
         heap_size = 50
@@ -89,6 +216,107 @@ class TestTSStructures(unittest.TestCase):
             self.assertGreaterEqual(sol, heap[0],
                                     "The max heap solutions should be organized with the worst solutions (greatest) at the top")
 
+    def test_early_stopping_target_makespan(self):
+        early_stopping = EarlyStopping(target_makespan=100)
+        stop_condition = get_stop_condition(False, None, 10, early_stopping)
+
+        early_stopping.update(101)
+        self.assertFalse(stop_condition(0))
+        early_stopping.update(100)
+        self.assertTrue(stop_condition(1))
+
+        # every stop condition sharing the criteria stops
+        self.assertTrue(get_stop_condition(False, None, 10, early_stopping)(0))
+
+        early_stopping.reset()
+        self.assertFalse(stop_condition(1))
+
+    def test_early_stopping_lower_bound(self):
+        early_stopping = EarlyStopping(lower_bound=csv_data.get_makespan_lower_bound())
+        early_stopping.update(csv_data_solution_factory.get_solution().makespan)
+        self.assertFalse(early_stopping.is_stopped())
+        early_stopping.update(csv_data.get_makespan_lower_bound())
+        self.assertTrue(early_stopping.is_stopped())
+
+    def test_early_stopping_stall_iterations(self):
+        early_stopping = EarlyStopping(stall_iterations=5)
+        stop_condition = get_stop_condition(False, None, 100, early_stopping)
+
+        early_stopping.update(100)
+        self.assertFalse(stop_condition(0))
+        self.assertFalse(stop_condition(4))
+        early_stopping.update(99)
+        self.assertFalse(stop_condition(5))
+        self.assertFalse(stop_condition(9))
+        self.assertTrue(stop_condition(10))
+        self.assertTrue(early_stopping.is_stopped())
+
+    def test_early_stopping_stall_time(self):
+        early_stopping = EarlyStopping(stall_time=0.1)
+        stop_condition = get_stop_condition(False, None, 100, early_stopping)
+
+        early_stopping.update(100)
+        self.assertFalse(stop_condition(0))
+        time.sleep(0.2)
+        self.assertTrue(stop_condition(1))
+
+    def test_early_stopping_copy_state(self):
+        early_stopping = EarlyStopping(target_makespan=100)
+        stop_condition = get_stop_condition(False, None, 10, early_stopping)
+        copy = EarlyStopping(target_makespan=100)
+
+        copy.update(100)
+        early_stopping.copy_state(copy)
+        self.assertTrue(early_stopping.is_stopped())
+        self.assertTrue(stop_condition(0))
+
+        copy.reset()
+        early_stopping.copy_state(copy)
+        self.assertFalse(early_stopping.is_stopped())
+        self.assertFalse(stop_condition(0))
+
+    def test_trace_recorder_stride(self):
+        trace = TraceRecorder(('makespan', 'size'), stride=3)
+        start_time = time.time()
+        for iteration in range(10):
+            if trace.is_sampled(iteration):
+                trace.record(iteration, 100 - iteration, iteration * 2)
+
+        self.assertEqual(4, len(trace))
+        self.assertEqual([0, 3, 6, 9], list(trace.iterations))
+        self.assertEqual([100, 97, 94, 91], list(trace.get('makespan')))
+        self.assertEqual([0, 6, 12, 18], list(trace.get('size')))
+        self.assertTrue(all(start_time <= timestamp <= time.time() for timestamp in trace.timestamps))
+        self.assertTrue(all(trace.timestamps[:-1] <= trace.timestamps[1:]))
+
+        with self.assertRaises(UserWarning):
+            TraceRecorder(('makespan',), stride=0)
+
+        with self.assertRaises(UserWarning):
+            TraceRecorder(('makespan',), max_samples=0)
+
+    def test_trace_recorder_reservoir(self):
+        max_samples = 50
+        trace = TraceRecorder(('makespan',), max_samples=max_samples)
+        for iteration in range(1000):
+            trace.record(iteration, 2 * iteration)
+
+        # a sorted random subset of the iterations is kept
+        self.assertEqual(max_samples, len(trace))
+        self.assertEqual(sorted(set(trace.iterations)), list(trace.iterations))
+        self.assertGreater(trace.iterations[-1], max_samples)
+        self.assertEqual(list(2 * trace.iterations), list(trace.get('makespan')))
+
+        # only the samples are pickled, and the unpickled trace can keep recording
+        unpickled_trace = pickle.loads(pickle.dumps(trace))
+        self.assertEqual(list(trace.iterations), list(unpickled_trace.iterations))
+        self.assertLess(len(pickle.dumps(TraceRecorder(('makespan',)))), 1000)
+
+        unpickled_trace = pickle.loads(pickle.dumps(TraceRecorder(('makespan',), max_samples=max_samples)))
+        for iteration in range(100):
+            unpickled_trace.record(iteration, 2 * iteration)
+        self.assertEqual(max_samples, len(unpickled_trace))
+
 
 if __name__ == '__main__':
     unittest.main()